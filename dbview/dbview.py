@@ -1,15 +1,114 @@
+import bisect
+import sqlite3
 import sys
+import threading
+import time
+from collections import OrderedDict
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QTableView, QTextEdit,
     QPushButton, QVBoxLayout, QHBoxLayout, QWidget, QSplitter,
-    QFileDialog, QMessageBox, QHeaderView, QLabel
+    QFileDialog, QMessageBox, QHeaderView, QLabel, QCheckBox
 )
-from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QThread, QTimer, Signal
 from PySide6.QtSql import QSqlDatabase, QSqlQuery
+import numpy as np
 import pandas as pd
 
+# Role returning the native cell value, e.g. for QSortFilterProxyModel.setSortRole
+SORT_ROLE = Qt.UserRole
+
+CELL_ROLES = (Qt.DisplayRole, Qt.TextAlignmentRole, SORT_ROLE)
+
+# Formatted cells kept per model; a few screens full of the viewport
+FORMAT_CACHE_CELLS = 20_000
+
+NUMBER_ALIGNMENT = Qt.AlignRight | Qt.AlignVCenter
+TEXT_ALIGNMENT = Qt.AlignLeft | Qt.AlignVCenter
+
+
+def quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def column_array(values):
+    """Store one column as int64 or float64 when all values are ints or all floats, else as objects."""
+    # A column mixing ints with floats or NULLs keeps its Python values
+    types = set(map(type, values))
+    kind = {int: "i", float: "f"}.get(types.pop()) if len(types) == 1 else None
+    if kind is not None:
+        try:
+            array = np.array(values)
+        except OverflowError:
+            array = None
+        # Ints beyond int64 come back as uint64, float64 or objects
+        if array is not None and array.dtype.kind == kind:
+            return array
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def is_number(value):
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool)
+
+
+def format_cell(value):
+    if value is None or (isinstance(value, (float, np.floating)) and value != value):
+        return ""  # NULL, or NaN for NULL in a float column
+    return str(value)
+
+
+class CellRenderer:
+    """Formats the cells of a model lazily, keeping the recent ones.
+
+    Models store native values and ask :meth:`data` for a role; display
+    strings are only built for the cells that are painted, and the last
+    ``capacity`` of them are cached, so repaints of the viewport cost a
+    dictionary lookup. Numbers are right-aligned and ``SORT_ROLE`` returns
+    the value itself.
+    """
+    def __init__(self, capacity=FORMAT_CACHE_CELLS):
+        self.capacity = capacity
+        self._texts = OrderedDict()
+
+    def clear(self):
+        self._texts.clear()
+
+    def data(self, row, column, role, value_of):
+        """Return ``role`` of the cell; ``value_of(row, column)`` reads its value."""
+        if role == Qt.DisplayRole:
+            key = (row, column)
+            text = self._texts.get(key)
+            if text is not None:
+                self._texts.move_to_end(key)
+                return text
+            text = self._texts[key] = format_cell(value_of(row, column))
+            if len(self._texts) > self.capacity:
+                self._texts.popitem(last=False)
+            return text
+        value = value_of(row, column)
+        if role == Qt.TextAlignmentRole:
+            return NUMBER_ALIGNMENT if is_number(value) else TEXT_ALIGNMENT
+        if role == SORT_ROLE:
+            return value.item() if isinstance(value, np.generic) else value
+        return None
+
+
 class PaginatedSqlModel(QAbstractTableModel):
-    """Read-only paginated model for large SQLite tables (1000 rows/page)."""
+    """Read-only paginated model for large SQLite tables (1000 rows/page).
+
+    Pages are read with keyset (seek) pagination on the rowid, or on the
+    primary key of a WITHOUT ROWID table: each page starts after the key
+    of the last row of the previous one, so SQLite seeks straight to it
+    through the index instead of scanning and discarding ``OFFSET`` rows.
+    When the rowids are dense (1..n without gaps, the common case) the key
+    of any page is computed directly. Otherwise the boundary keys of the
+    last ``MAX_PAGE_KEYS`` pages visited are cached, and a page without a
+    known key is read with an ``OFFSET`` from the nearest known one or from
+    the end of the table. LIMIT/OFFSET is only used when no key is usable.
+    """
+    MAX_PAGE_KEYS = 10_000
+
     def __init__(self, table_name: str, db: QSqlDatabase, page_size: int = 1000):
         super().__init__()
         self.table_name = table_name
@@ -18,49 +117,164 @@ class PaginatedSqlModel(QAbstractTableModel):
         self.current_page = 0
         self.total_rows = 0
         self.columns = []
+        # The current page as one array per column
         self.cache = []
+        self.cells = CellRenderer()
+        # Columns ordering the pages, e.g. ["rowid"]; None falls back to OFFSET
+        self.key_columns = None
+        # Smallest rowid when the rowids have no gaps, else None
+        self._first_rowid = None
+        # page number -> key of the last row before it, least recently used first
+        self._page_keys = OrderedDict()
         self._load_metadata()
         self._load_page()
 
     def _load_metadata(self):
         query = QSqlQuery(self.db)
-        if not query.exec(f"PRAGMA table_info(\"{self.table_name}\")"):
+        if not query.exec(f"PRAGMA table_info({quote_identifier(self.table_name)})"):
             print(f"PRAGMA error: {query.lastError().text()}")
             return
+        primary_key = []
         while query.next():
             self.columns.append(query.value(1))
+            if query.value(5):
+                primary_key.append((int(query.value(5)), query.value(1)))
+        self.key_columns = self._find_key([name for _, name in sorted(primary_key)])
 
-        if not query.exec(f"SELECT COUNT(*) FROM \"{self.table_name}\""):
+        table = quote_identifier(self.table_name)
+        if not query.exec(f"SELECT COUNT(*) FROM {table}"):
             print(f"Count error: {query.lastError().text()}")
             return
         if query.next():
             self.total_rows = int(query.value(0))
 
-    def _load_page(self):
-        self.beginResetModel()
-        self.cache = []
+        if self.total_rows and self.key_columns in (["rowid"], ["_rowid_"], ["oid"]):
+            # min() and max() of the rowid read the two ends of the b-tree
+            key = self.key_columns[0]
+            if query.exec(f"SELECT min({key}), max({key}) FROM {table}") and query.next():
+                first, last = int(query.value(0)), int(query.value(1))
+                if last - first + 1 == self.total_rows:
+                    self._first_rowid = first
+
+    def _find_key(self, primary_key):
+        """Return the columns to seek on: a rowid alias, else the primary key."""
+        table = quote_identifier(self.table_name)
         query = QSqlQuery(self.db)
-        offset = self.current_page * self.page_size
-        sql = f"SELECT * FROM \"{self.table_name}\" LIMIT {self.page_size} OFFSET {offset}"
-        if not query.exec(sql):
-            print(f"Load error: {query.lastError().text()}")
-            self.endResetModel()
+        lowered = {name.lower() for name in self.columns}
+        for alias in ("rowid", "_rowid_", "oid"):
+            # A real column with that name hides the alias
+            if alias in lowered:
+                continue
+            # Fails for WITHOUT ROWID tables and views
+            if query.exec(f"SELECT {alias} FROM {table} LIMIT 0"):
+                return [alias]
+            break
+        if primary_key and query.exec(
+            f"SELECT 1 FROM {table} WHERE ({', '.join(map(quote_identifier, primary_key))}) > "
+            f"({', '.join('NULL' for _ in primary_key)}) LIMIT 0"
+        ):
+            # Row value comparisons (SQLite 3.15+) seek on composite keys
+            return primary_key
+        return None
+
+    def _known_key(self, page):
+        """Return ``(True, key before page)`` if it is known without a query."""
+        if page == 0:
+            return True, None
+        if self._first_rowid is not None:
+            return True, (self._first_rowid + page * self.page_size - 1,)
+        if page in self._page_keys:
+            self._page_keys.move_to_end(page)
+            return True, self._page_keys[page]
+        return False, None
+
+    def _remember_key(self, page, key):
+        if self._first_rowid is not None:
             return
+        self._page_keys[page] = key
+        self._page_keys.move_to_end(page)
+        while len(self._page_keys) > self.MAX_PAGE_KEYS:
+            self._page_keys.popitem(last=False)
+
+    def _page_sql(self, page):
+        """Return ``(sql, parameters, descending)`` reading the rows of ``page``.
+
+        Key columns come first in every row. Without a known key the page
+        is reached with an ``OFFSET`` counted from the nearest page whose
+        key is cached, or backwards from the end of the table, whichever
+        skips fewer rows; ``descending`` rows must then be reversed.
+        """
+        table = quote_identifier(self.table_name)
+        if self.key_columns is None:
+            offset = page * self.page_size
+            return f"SELECT * FROM {table} LIMIT {self.page_size} OFFSET {offset}", [], False
+
+        key = ", ".join(map(quote_identifier, self.key_columns))
+        known, after = self._known_key(page)
+        offset = 0
+        if not known:
+            start = max((cached for cached in self._page_keys if cached < page), default=0)
+            after = self._page_keys.get(start)
+            offset = (page - start) * self.page_size
+            rows = min(self.page_size, self.total_rows - page * self.page_size)
+            from_end = self.total_rows - page * self.page_size - rows
+            if rows > 0 and from_end < offset:
+                descending = ", ".join(f"{column} DESC" for column in map(quote_identifier, self.key_columns))
+                sql = f"SELECT {key}, * FROM {table} ORDER BY {descending} LIMIT {rows} OFFSET {from_end}"
+                return sql, [], True
+
+        where = ""
+        if after is not None:
+            where = f"WHERE ({key}) > ({', '.join('?' for _ in after)}) "
+        sql = f"SELECT {key}, * FROM {table} {where}ORDER BY {key} LIMIT {self.page_size}"
+        if offset:
+            sql += f" OFFSET {offset}"
+        return sql, list(after or ()), False
+
+    def _page_columns(self, page, rows, descending):
+        """Turn rows read by ``_page_sql`` into typed columns and cache the next key."""
+        if descending:
+            rows.reverse()
+        skip = len(self.key_columns) if self.key_columns else 0
+        if skip and rows:
+            self._remember_key(page + 1, tuple(rows[-1][:skip]))
+        return [column_array(values) for values in zip(*(row[skip:] for row in rows))]
+
+    def _fetch_page(self, page):
+        """Read ``page`` as typed columns."""
+        sql, parameters, descending = self._page_sql(page)
+        query = QSqlQuery(self.db)
+        query.prepare(sql)
+        for value in parameters:
+            query.addBindValue(value)
+        if not query.exec():
+            print(f"Load error: {query.lastError().text()}")
+            return []
+        width = (len(self.key_columns) if self.key_columns else 0) + len(self.columns)
+        rows = []
         while query.next():
-            row = ["" if query.value(i) is None else str(query.value(i)) for i in range(len(self.columns))]
-            self.cache.append(row)
+            rows.append(tuple(query.value(i) for i in range(width)))
+        return self._page_columns(page, rows, descending)
+
+    def _load_page(self):
+        self.beginResetModel()
+        self.cache = self._fetch_page(self.current_page)
+        self.cells.clear()
         self.endResetModel()
 
     def rowCount(self, parent=QModelIndex()):
-        return len(self.cache)
+        return len(self.cache[0]) if self.cache else 0
 
     def columnCount(self, parent=QModelIndex()):
         return len(self.columns)
 
+    def _value(self, row, column):
+        return self.cache[column][row]
+
     def data(self, index, role=Qt.DisplayRole):
-        if not index.isValid() or role != Qt.DisplayRole:
+        if not index.isValid() or role not in CELL_ROLES:
             return None
-        return self.cache[index.row()][index.column()]
+        return self.cells.data(index.row(), index.column(), role, self._value)
 
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         if role != Qt.DisplayRole:
@@ -86,47 +300,350 @@ class PaginatedSqlModel(QAbstractTableModel):
         return (self.current_page + 1, total_pages, self.total_rows)
 
 
+class BlockLoader(QThread):
+    """Reads blocks that need an ``OFFSET`` scan on a connection of its own.
+
+    Requests are served newest first, and only the last ``MAX_PENDING``
+    are kept, so dragging the scrollbar across a table only reads the
+    blocks it stops at.
+    """
+    MAX_PENDING = 4
+
+    # page, rows (key columns first), descending
+    loaded = Signal(int, object, bool)
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self._pending = OrderedDict()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._connection = None
+
+    def request(self, page, sql, parameters, descending):
+        """Queue a block; returns the pages dropped to make room for it."""
+        dropped = []
+        with self._condition:
+            self._pending[page] = (sql, parameters, descending)
+            self._pending.move_to_end(page)
+            while len(self._pending) > self.MAX_PENDING:
+                dropped.append(self._pending.popitem(last=False)[0])
+            self._condition.notify()
+        return dropped
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._pending.clear()
+            if self._connection is not None:
+                self._connection.interrupt()
+            self._condition.notify()
+        self.wait()
+
+    def run(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._condition:
+            self._connection = connection
+        try:
+            while True:
+                with self._condition:
+                    while not self._pending and not self._stopped:
+                        self._condition.wait()
+                    if self._stopped:
+                        return
+                    page, (sql, parameters, descending) = self._pending.popitem()
+                try:
+                    rows = connection.execute(sql, parameters).fetchall()
+                except sqlite3.Error as e:
+                    if not self._stopped:
+                        print(f"Load error: {e}")
+                    rows = []
+                self.loaded.emit(page, rows, descending)
+        finally:
+            with self._condition:
+                self._connection = None
+                connection.close()
+
+
+class VirtualSqlModel(PaginatedSqlModel):
+    """Read-only model over a whole SQLite table, scrolled without pages.
+
+    It reports every row of the table and reads blocks of 1,000-5,000 rows
+    on demand when the view paints them, using the keyset seeks of
+    PaginatedSqlModel. A block whose key is not known would need an
+    ``OFFSET`` scan, so it is read by a :class:`BlockLoader` instead and
+    shows ``PLACEHOLDER`` until it arrives; the GUI never waits on a scan.
+    Blocks are kept in an LRU cache of at most ``cache_cells`` cells, so
+    memory stays bounded however far one scrolls. Call :meth:`close`
+    before dropping the model.
+    """
+    # Cells per block; wide tables get shorter blocks
+    BLOCK_CELLS = 50_000
+    CACHE_CELLS = 2_000_000
+    PLACEHOLDER = "…"
+
+    def __init__(self, table_name: str, db: QSqlDatabase, cache_cells: int = CACHE_CELLS):
+        self.cache_cells = cache_cells
+        self._blocks = OrderedDict()
+        self._loading = set()
+        self._loader = None
+        super().__init__(table_name, db)
+
+    def _load_metadata(self):
+        super()._load_metadata()
+        columns = max(len(self.columns), 1)
+        self.page_size = min(max(self.BLOCK_CELLS // columns, 1000), 5000)
+        self.max_blocks = max(self.cache_cells // (self.page_size * columns), 2)
+
+    def _load_page(self):
+        self.beginResetModel()
+        self._blocks.clear()
+        self.cells.clear()
+        self.endResetModel()
+
+    def close(self):
+        if self._loader is not None:
+            self._loader.stop()
+            self._loader = None
+
+    def _add_block(self, number, block):
+        self._blocks[number] = block
+        while len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+
+    def _block(self, number):
+        """Return the block, or None while it is being read in the background."""
+        block = self._blocks.get(number)
+        if block is not None:
+            self._blocks.move_to_end(number)
+            return block
+        if number == 0 or (self.key_columns is not None and self._known_key(number)[0]):
+            block = self._fetch_page(number)
+            self._add_block(number, block)
+            return block
+        if number not in self._loading:
+            if self._loader is None:
+                self._loader = BlockLoader(self.db.databaseName(), self)
+                self._loader.loaded.connect(self._block_loaded)
+                self._loader.start()
+            self._loading.add(number)
+            self._loading.difference_update(self._loader.request(number, *self._page_sql(number)))
+        return None
+
+    def _block_loaded(self, number, rows, descending):
+        self._loading.discard(number)
+        if self._loader is None:
+            return
+        self._add_block(number, self._page_columns(number, rows, descending))
+        first = number * self.page_size
+        last = min(first + self.page_size, self.total_rows) - 1
+        if last >= first:
+            self.dataChanged.emit(self.index(first, 0), self.index(last, len(self.columns) - 1))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.total_rows
+
+    def _value(self, row, column):
+        block = self._block(row // self.page_size)
+        row %= self.page_size
+        # The table may have shrunk since it was counted
+        return block[column][row] if block and row < len(block[0]) else None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in CELL_ROLES:
+            return None
+        if self._block(index.row() // self.page_size) is None:
+            return self.PLACEHOLDER if role == Qt.DisplayRole else None
+        return self.cells.data(index.row(), index.column(), role, self._value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.columns[section] if section < len(self.columns) else ""
+        return str(section + 1)
+
+
+class ResultBuffer:
+    """Collects streamed query rows column by column.
+
+    Each batch is transposed into one typed array per column (see
+    :func:`column_array`), and the frame is built from them once, in
+    :meth:`frame`, instead of being grown per row or batch. Until then
+    cells are read from the chunks directly.
+    """
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self._chunks = [[] for _ in self.columns]
+        # First row of every chunk, for bisect
+        self._starts = []
+        self.rows = 0
+
+    def __len__(self):
+        return self.rows
+
+    def append(self, rows):
+        if not rows:
+            return
+        for chunks, values in zip(self._chunks, zip(*rows)):
+            chunks.append(column_array(values))
+        self._starts.append(self.rows)
+        self.rows += len(rows)
+
+    def value(self, row, column):
+        chunk = bisect.bisect_right(self._starts, row) - 1
+        return self._chunks[column][chunk][row - self._starts[chunk]]
+
+    def frame(self):
+        arrays = [self._join(chunks) for chunks in self._chunks]
+        # Keyed by position so duplicate names (e.g. from a join) survive
+        df = pd.DataFrame(dict(enumerate(arrays)), copy=False)
+        df.columns = self.columns
+        return df
+
+    @staticmethod
+    def _join(chunks):
+        # Batches typed differently (e.g. int64 then float64) are joined as
+        # objects; np.concatenate would upcast the ints to floats
+        if len({chunk.dtype for chunk in chunks}) == 1:
+            return np.concatenate(chunks)
+        return np.concatenate(chunks, dtype=object) if chunks else np.empty(0, dtype=object)
+
+
 class PandasModel(QAbstractTableModel):
-    """Paginated model for arbitrary query results using pandas."""
+    """Paginated model for arbitrary query results using pandas.
+
+    Rows of a running query are added with :meth:`appendRows` into a
+    :class:`ResultBuffer`; :meth:`finishRows` turns it into the frame. In
+    stream mode ``fetcher`` is called through ``fetchMore`` whenever the
+    view needs rows past the ones fetched so far.
+    """
     def __init__(self, df=None, page_size=1000):
         super().__init__()
         self._df = df if df is not None else pd.DataFrame()
+        self._columns = self._column_arrays()
+        self._buffer = None
+        self.cells = CellRenderer()
         self.page_size = page_size
         self.current_page = 0
+        self.fetcher = None
+        self._fetching = False
+
+    def _total_rows(self):
+        return len(self._buffer) if self._buffer is not None else len(self._df)
+
+    def _column_arrays(self):
+        # Native values per column; iat per cell goes through the indexers
+        return [self._df.iloc[:, i].to_numpy() for i in range(len(self._df.columns))]
 
     def setDataFrame(self, df):
         self.beginResetModel()
         self._df = df.reset_index(drop=True) if df is not None else pd.DataFrame()
+        self._columns = self._column_arrays()
+        self._buffer = None
+        self.fetcher = None
+        self.current_page = 0
+        self.cells.clear()
+        self.endResetModel()
+
+    def startRows(self, columns, fetcher=None):
+        """Start collecting the rows of a query with the given columns."""
+        self.beginResetModel()
+        self._df = pd.DataFrame()
+        self._columns = []
+        self._buffer = ResultBuffer(columns)
+        self.fetcher = fetcher
+        self._fetching = fetcher is not None  # the first batch is on its way
         self.current_page = 0
+        self.cells.clear()
         self.endResetModel()
 
+    def appendRows(self, rows):
+        """Add a batch of rows of a query that is still running."""
+        self._fetching = False
+        if not rows or self._buffer is None:
+            return
+        before = self.rowCount()
+        total = len(self._buffer) + len(rows)
+        after = min((self.current_page + 1) * self.page_size, total) - self.current_page * self.page_size
+        if after > before:
+            self.beginInsertRows(QModelIndex(), before, after - 1)
+        self._buffer.append(rows)
+        if after > before:
+            self.endInsertRows()
+
+    def finishRows(self, materialize=True):
+        """Stop fetching; build the frame unless the rows stay streamed."""
+        self.fetcher = None
+        self._fetching = False
+        if materialize and self._buffer is not None:
+            # Same values as the chunks, so the view needs no reset
+            self._df = self._buffer.frame()
+            self._columns = self._column_arrays()
+            self._buffer = None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.fetcher is None or self._fetching:
+            return False
+        # Keep one page ahead of the one shown
+        return (self.current_page + 2) * self.page_size > self._total_rows()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self._fetching = True
+            self.fetcher()
+
     def rowCount(self, parent=QModelIndex()):
-        if self._df.empty:
+        total = self._total_rows()
+        if total == 0:
             return 0
         start = self.current_page * self.page_size
-        end = min((self.current_page + 1) * self.page_size, len(self._df))
+        end = min((self.current_page + 1) * self.page_size, total)
         return end - start
 
     def columnCount(self, parent=QModelIndex()):
+        if self._buffer is not None:
+            return len(self._buffer.columns)
         return len(self._df.columns)
 
+    def _value(self, row, column):
+        if self._buffer is not None:
+            return self._buffer.value(row, column)
+        return self._columns[column][row]
+
     def data(self, index, role=Qt.DisplayRole):
-        if not index.isValid() or role != Qt.DisplayRole:
+        if not index.isValid() or role not in CELL_ROLES:
             return None
         row = index.row() + self.current_page * self.page_size
-        return str(self._df.iat[row, index.column()])
+        return self.cells.data(row, index.column(), role, self._value)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort the whole result; rows that are still streaming stay in query order."""
+        if column < 0 or self._buffer is not None or self._df.empty:
+            return
+        values = self._df.iloc[:, column]
+        ascending = order == Qt.AscendingOrder
+        try:
+            values = values.sort_values(ascending=ascending, kind="stable", na_position="last")
+        except TypeError:
+            # SQLite columns may mix types; fall back to their text
+            values = values.map(format_cell).sort_values(ascending=ascending, kind="stable")
+        self.setDataFrame(self._df.iloc[values.index])
 
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         if role != Qt.DisplayRole:
             return None
         if orientation == Qt.Horizontal:
+            if self._buffer is not None:
+                return str(self._buffer.columns[section])
             return str(self._df.columns[section])
         return str(section + 1 + self.current_page * self.page_size)
 
     def nextPage(self):
-        if (self.current_page + 1) * self.page_size < len(self._df):
+        if (self.current_page + 1) * self.page_size < self._total_rows():
             self.current_page += 1
             self.layoutChanged.emit()
+            self.fetchMore()
 
     def prevPage(self):
         if self.current_page > 0:
@@ -134,11 +651,94 @@ class PandasModel(QAbstractTableModel):
             self.layoutChanged.emit()
 
     def page_info(self):
-        if self._df.empty:
+        total_rows = self._total_rows()
+        if total_rows == 0:
             return "No results"
         page = self.current_page + 1
-        total = (len(self._df) - 1) // self.page_size + 1
-        return f"Page {page}/{total} – Rows: {len(self._df):,}"
+        total = (total_rows - 1) // self.page_size + 1
+        more = "+" if self.fetcher is not None else ""
+        return f"Page {page}/{total}{more} – Rows: {total_rows:,}{more}"
+
+
+class QueryWorker(QThread):
+    """Runs one SQL statement on its own connection and streams the rows.
+
+    Rows are sent in batches of ``BATCH_ROWS`` while the query is still
+    running. With ``stream`` set, the worker sends one batch and then
+    waits for :meth:`request_more` before fetching the next, so only the
+    rows that are looked at are ever read; it finishes as soon as the
+    last row is sent. :meth:`cancel` interrupts the
+    statement with ``sqlite3_interrupt``, which is safe to call from
+    another thread.
+    """
+    BATCH_ROWS = 5000
+
+    # Python lists are sent as plain objects; converting them to a
+    # QVariantList would copy every row
+    columns_ready = Signal(object)
+    rows_ready = Signal(object)
+    # Rows fetched for a SELECT, else rows affected
+    succeeded = Signal(bool, int)
+    failed = Signal(str)
+
+    def __init__(self, path, sql, stream=False, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.sql = sql
+        self.stream = stream
+        self.cancelled = False
+        self._connection = None
+        # Guards _connection so cancel() never interrupts a closed connection
+        self._lock = threading.Lock()
+        self._demand = threading.Semaphore(0)
+
+    def request_more(self):
+        self._demand.release()
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            if self._connection is not None:
+                self._connection.interrupt()
+        self._demand.release()
+
+    def run(self):
+        connection = None
+        try:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            with self._lock:
+                self._connection = connection
+            if self.cancelled:
+                raise sqlite3.OperationalError("interrupted")
+            cursor = connection.execute(self.sql)
+            if cursor.description is None:
+                connection.commit()
+                self.succeeded.emit(False, cursor.rowcount)
+                return
+            self.columns_ready.emit([column[0] for column in cursor.description])
+            fetched = 0
+            rows = cursor.fetchmany(self.BATCH_ROWS)
+            while rows:
+                # Reading one row ahead tells whether this batch is the
+                # last, so a finished stream never waits for demand
+                ahead = cursor.fetchone()
+                fetched += len(rows)
+                self.rows_ready.emit(rows)
+                if ahead is None:
+                    break
+                if self.stream:
+                    self._demand.acquire()
+                    if self.cancelled:
+                        raise sqlite3.OperationalError("interrupted")
+                rows = [ahead] + cursor.fetchmany(self.BATCH_ROWS - 1)
+            self.succeeded.emit(True, fetched)
+        except sqlite3.Error as e:
+            self.failed.emit("Query cancelled" if self.cancelled else str(e))
+        finally:
+            if connection is not None:
+                with self._lock:
+                    self._connection = None
+                    connection.close()
 
 
 class MainWindow(QMainWindow):
@@ -147,6 +747,8 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("SQLite Viewer")
         self.resize(1200, 800)
         self.db = None
+        self.worker = None
+        self.table_models = []
 
         # Menu
         self.menuBar().addAction("Open DB", self.open_db)
@@ -165,16 +767,31 @@ class MainWindow(QMainWindow):
         sql_bar = QHBoxLayout()
         self.sql_edit = QTextEdit()
         self.sql_edit.setMaximumHeight(120)
-        exec_btn = QPushButton("Execute")
-        exec_btn.clicked.connect(self.execute_sql)
+        self.exec_btn = QPushButton("Execute")
+        self.exec_btn.clicked.connect(self.execute_sql)
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_sql)
+        sql_buttons = QVBoxLayout()
+        sql_buttons.addWidget(self.exec_btn)
+        sql_buttons.addWidget(self.cancel_btn)
+        self.stream_check = QCheckBox("Stream")
+        self.stream_check.setToolTip(
+            "Fetch rows only as you page through them, without building a DataFrame"
+        )
+        sql_buttons.addWidget(self.stream_check)
+        sql_buttons.addStretch()
         sql_bar.addWidget(self.sql_edit)
-        sql_bar.addWidget(exec_btn)
+        sql_bar.addLayout(sql_buttons)
 
         self.result_view = QTableView()
         self.result_model = PandasModel()
         self.result_view.setModel(self.result_model)
         self.result_view.verticalHeader().setVisible(True)
         self.result_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # No column is sorted until a header is clicked
+        self.result_view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.result_view.setSortingEnabled(True)
 
         pag_bar = QHBoxLayout()
         self.page_label = QLabel("No results")
@@ -188,6 +805,12 @@ class MainWindow(QMainWindow):
         pag_bar.addWidget(prev_btn)
         pag_bar.addWidget(next_btn)
         pag_bar.addStretch()
+        self.progress_label = QLabel()
+        pag_bar.addWidget(self.progress_label)
+
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(200)
+        self.progress_timer.timeout.connect(self.update_progress)
 
         bottom_layout.addLayout(sql_bar)
         bottom_layout.addWidget(self.result_view)
@@ -201,6 +824,8 @@ class MainWindow(QMainWindow):
         path, _ = QFileDialog.getOpenFileName(self, "Open SQLite DB", "", "SQLite (*.db *.sqlite *.sqlite3)")
         if not path:
             return
+        self.stop_query()
+        self.close_tables()
         if self.db:
             self.db.close()
         self.db = QSqlDatabase.addDatabase("QSQLITE")
@@ -211,72 +836,141 @@ class MainWindow(QMainWindow):
         self.setWindowTitle(f"SQLite Viewer - {path}")
         self.load_tables()
 
+    def close_tables(self):
+        self.table_tabs.clear()
+        for model in self.table_models:
+            model.close()
+        self.table_models = []
+
     def load_tables(self):
         if not self.db or not self.db.isOpen():
             return
-        self.table_tabs.clear()
+        self.close_tables()
         tables = self.db.tables()
         for table in tables:
             if table.startswith("sqlite_"):
                 continue
-            model = PaginatedSqlModel(table, self.db)
+            model = VirtualSqlModel(table, self.db)
+            self.table_models.append(model)
 
             view = QTableView()
             view.setModel(model)
             view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
             view.verticalHeader().setVisible(True)
+            # Fixed row heights keep scrolling independent of the row count
+            view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
 
-            pag_layout = QHBoxLayout()
-            label = QLabel()
-            prev = QPushButton("Previous")
-            next_ = QPushButton("Next")
-
-            def update_label():
-                p, t, r = model.current_page_info()
-                label.setText(f"Page {p}/{t} – Total rows: {r:,}" if r else "Empty table")
-
-            prev.clicked.connect(lambda: (model.prev_page(), update_label()))
-            next_.clicked.connect(lambda: (model.next_page(), update_label()))
-            update_label()
-
-            pag_layout.addWidget(label)
-            pag_layout.addWidget(prev)
-            pag_layout.addWidget(next_)
-            pag_layout.addStretch()
+            rows = model.total_rows
+            label = QLabel(f"Total rows: {rows:,}" if rows else "Empty table")
 
             container = QWidget()
             lay = QVBoxLayout(container)
             lay.addWidget(view)
-            lay.addLayout(pag_layout)
+            lay.addWidget(label)
 
             self.table_tabs.addTab(container, table)
 
     def execute_sql(self):
         sql = self.sql_edit.toPlainText().strip()
-        if not sql:
+        if not sql or not self.db or not self.db.isOpen():
             return
-        query = QSqlQuery(self.db)
-        if not query.exec(sql):
-            QMessageBox.critical(self, "SQL Error", query.lastError().text())
+        if self.worker is not None:
+            if not self.worker.stream:
+                return
+            # A stream waiting for demand is dropped for the new query
+            self.stop_query()
+        self.result_model.setDataFrame(None)
+        self.result_view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.page_label.setText(self.result_model.page_info())
+
+        # The query gets its own connection so it can run (and be
+        # interrupted) off the GUI thread.
+        self.worker = QueryWorker(
+            self.db.databaseName(), sql, stream=self.stream_check.isChecked(), parent=self
+        )
+        self.worker.columns_ready.connect(self.on_query_columns)
+        self.worker.rows_ready.connect(self.on_query_rows)
+        self.worker.succeeded.connect(self.on_query_succeeded)
+        self.worker.failed.connect(self.on_query_failed)
+        self.worker.finished.connect(self.on_query_finished)
+        self.query_started = time.monotonic()
+        self.query_rows = 0
+        self.exec_btn.setEnabled(self.worker.stream)
+        self.cancel_btn.setEnabled(True)
+        self.update_progress()
+        self.progress_timer.start()
+        self.worker.start()
+
+    def cancel_sql(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def update_progress(self):
+        if self.worker is not None and self.worker.stream:
+            self.progress_label.setText(f"Streaming… {self.query_rows:,} rows fetched")
             return
-
-        if query.isSelect():
-            df = pd.DataFrame()
-            cols = []
-            while query.next():
-                if not cols:
-                    rec = query.record()
-                    cols = [rec.fieldName(i) for i in range(rec.count())]
-                row = [query.value(i) if not query.isNull(i) else None for i in range(len(cols))]
-                df = pd.concat([df, pd.DataFrame([row], columns=cols)], ignore_index=True)
-            self.result_model.setDataFrame(df)
+        elapsed = time.monotonic() - self.query_started
+        self.progress_label.setText(f"Running… {self.query_rows:,} rows, {elapsed:.1f} s")
+
+    def on_query_columns(self, columns):
+        if self.sender() is not self.worker:
+            return  # queued from a query that was replaced
+        fetcher = self.worker.request_more if self.worker.stream else None
+        self.result_model.startRows(columns, fetcher)
+
+    def on_query_rows(self, rows):
+        if self.sender() is not self.worker:
+            return  # queued from a query that was replaced
+        self.query_rows += len(rows)
+        self.result_model.appendRows(rows)
+        self.page_label.setText(self.result_model.page_info())
+
+    def on_query_succeeded(self, is_select, count):
+        if self.sender() is not self.worker:
+            return  # queued from a query that was replaced
+        elapsed = time.monotonic() - self.query_started
+        if is_select:
+            self.result_model.finishRows(materialize=not self.worker.stream)
             self.page_label.setText(self.result_model.page_info())
+            self.progress_label.setText(f"{count:,} rows in {elapsed:.2f} s")
         else:
-            affected = query.numRowsAffected()
-            self.db.commit()
-            QMessageBox.information(self, "Success", f"Affected rows: {affected}")
+            self.progress_label.setText("")
+            QMessageBox.information(self, "Success", f"Affected rows: {count}")
             self.load_tables()  # refresh tabs
 
+    def on_query_failed(self, message):
+        if self.sender() is not self.worker:
+            return  # queued from a query that was replaced
+        # Rows fetched before a cancel stay visible
+        self.result_model.finishRows(materialize=False)
+        self.page_label.setText(self.result_model.page_info())
+        if self.worker.cancelled and self.query_rows:
+            message = f"Stopped after {self.query_rows:,} rows"
+        self.progress_label.setText(message)
+        if not self.worker.cancelled:
+            QMessageBox.critical(self, "SQL Error", message)
+
+    def on_query_finished(self):
+        worker = self.sender()
+        worker.deleteLater()
+        if worker is not self.worker:
+            return
+        self.progress_timer.stop()
+        self.worker = None
+        self.exec_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+
+    def stop_query(self):
+        """Cancel the running query and wait until its connection is closed."""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.wait()
+
+    def closeEvent(self, event):
+        self.stop_query()
+        self.close_tables()
+        super().closeEvent(event)
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
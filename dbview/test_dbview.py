@@ -0,0 +1,27 @@
+"""Tests for collecting query results into column buffers."""
+
+from dbview import ResultBuffer, column_array
+
+
+def test_column_array_keeps_mixed_numbers():
+    values = column_array([1, 2.5, 3])
+    assert values.dtype == object
+    assert [type(value) for value in values] == [int, float, int]
+
+
+def test_frame_keeps_ints_of_an_int_batch_before_a_float_batch():
+    buffer = ResultBuffer(["v"])
+    buffer.append([(1,), (2**62 + 1,)])
+    buffer.append([(2.5,)])
+    assert buffer.value(0, 0) == 1
+    df = buffer.frame()
+    assert df["v"].dtype == object
+    assert list(df["v"]) == [1, 2**62 + 1, 2.5]
+    assert type(df["v"][1]) is int
+
+
+def test_frame_types_batches_of_one_type():
+    buffer = ResultBuffer(["v"])
+    buffer.append([(1,), (2,)])
+    buffer.append([(3,)])
+    assert buffer.frame()["v"].dtype == "int64"
@@ -0,0 +1,278 @@
+"""Threshold and rate-of-change alerts evaluated on the live metric stream."""
+
+from __future__ import annotations
+
+import collections
+import operator
+import re
+import time
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+# Alerts kept in DataCollector.alert_log
+ALERT_LOG_SIZE = 500
+
+# Window of a rate rule without "over"
+DEFAULT_RATE_WINDOW = 60.0
+
+_OPERATORS: Dict[str, Callable[[float, float], bool]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+_RULE_RE = re.compile(
+    r"""^(?P<target>system|selected|watched)\.(?P<metric>cpu|mem|memory)
+        (?:\s+(?P<rate>rate))?\s*
+        (?P<op>>=|<=|>|<)\s*(?P<threshold>-?\d+(?:\.\d+)?)\s*%?
+        (?:\s*/\s*(?P<per>s|sec|m|min))?
+        (?:\s+(?P<word>for|over)\s+(?P<duration>\d+(?:\.\d+)?)\s*(?P<unit>s|sec|m|min)?)?$""",
+    re.IGNORECASE | re.VERBOSE,
+)
+
+_SECONDS = {None: 1.0, "s": 1.0, "sec": 1.0, "m": 60.0, "min": 60.0}
+
+
+class AlertRule:
+    """One compiled rule; see :func:`parse_rule` for the syntax."""
+
+    __slots__ = ("text", "target", "metric", "rate", "op", "threshold", "duration")
+
+    def __init__(
+        self,
+        text: str,
+        target: str,
+        metric: str,
+        rate: bool,
+        op: str,
+        threshold: float,
+        duration: float,
+    ) -> None:
+        self.text = text
+        self.target = target
+        self.metric = metric
+        self.rate = rate
+        self.op = op
+        # Percent, or percent per second for rate rules
+        self.threshold = threshold
+        # Seconds the condition must hold, or the rate window
+        self.duration = duration
+
+    def evaluator(self):
+        return _RateEvaluator(self) if self.rate else _ThresholdEvaluator(self)
+
+
+def parse_rule(text: str) -> AlertRule:
+    """Compile one rule.
+
+    ``<target>.<metric> <op> <value>[%] [for <n>s|m]`` fires once the value
+    has stayed past the threshold for the given time, and
+    ``<target>.<metric> rate <op> <value>[%]/s|/min [over <n>s|m]`` once it
+    changed faster than that over the window (one minute by default).
+    Targets are ``system``, ``selected`` and ``watched`` (every watched
+    process on its own), metrics ``cpu`` and ``mem``; for example
+    ``watched.cpu > 80 for 30s`` or ``system.mem rate > 1%/min``.
+
+    Raises ``ValueError`` for anything else.
+    """
+    text = " ".join(text.split())
+    match = _RULE_RE.match(text)
+    if match is None:
+        raise ValueError(f"cannot parse alert rule {text!r}")
+
+    rate = match["rate"] is not None
+    word = (match["word"] or "").lower()
+    if rate and match["per"] is None:
+        raise ValueError(f"rate rule needs a unit such as %/min: {text!r}")
+    if not rate and match["per"] is not None:
+        raise ValueError(f"only rate rules take a /s or /min unit: {text!r}")
+    if rate and word == "for":
+        raise ValueError(f"rate rules take 'over', not 'for': {text!r}")
+    if not rate and word == "over":
+        raise ValueError(f"threshold rules take 'for', not 'over': {text!r}")
+
+    threshold = float(match["threshold"])
+    if rate:
+        threshold /= _SECONDS[match["per"].lower()]
+    if match["duration"] is None:
+        duration = DEFAULT_RATE_WINDOW if rate else 0.0
+    else:
+        duration = float(match["duration"]) * _SECONDS[(match["unit"] or "s").lower()]
+    if rate and duration <= 0:
+        raise ValueError(f"rate window must be positive: {text!r}")
+
+    metric = "cpu" if match["metric"].lower() == "cpu" else "mem"
+    return AlertRule(text, match["target"].lower(), metric, rate, match["op"], threshold, duration)
+
+
+def parse_rules(lines: Iterable[str]) -> List[AlertRule]:
+    """Compile one rule per non-blank line; ``#`` starts a comment."""
+    rules = []
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if line:
+            rules.append(parse_rule(line))
+    return rules
+
+
+class Alert:
+    """One firing of a rule."""
+
+    __slots__ = ("timestamp", "rule", "subject", "value")
+
+    def __init__(self, timestamp: float, rule: AlertRule, subject: str, value: float) -> None:
+        self.timestamp = timestamp
+        self.rule = rule
+        self.subject = subject
+        # The metric, or its rate per minute for rate rules
+        self.value = value
+
+    @property
+    def message(self) -> str:
+        metric = "CPU" if self.rule.metric == "cpu" else "memory"
+        if self.rule.rate:
+            return f"{self.subject} {metric} changing {self.value:+.2f}%/min ({self.rule.text})"
+        return f"{self.subject} {metric} at {self.value:.1f}% ({self.rule.text})"
+
+    def __str__(self) -> str:
+        return f"{time.strftime('%H:%M:%S', time.localtime(self.timestamp))} {self.message}"
+
+
+class _ThresholdEvaluator:
+    """Fires when the condition has held for ``duration`` seconds.
+
+    Only the time the condition started to hold is kept. The rule fires
+    once and re-arms when the condition stops holding.
+    """
+
+    __slots__ = ("compare", "threshold", "duration", "since", "fired")
+
+    def __init__(self, rule: AlertRule) -> None:
+        self.compare = _OPERATORS[rule.op]
+        self.threshold = rule.threshold
+        self.duration = rule.duration
+        self.since: Optional[float] = None
+        self.fired = False
+
+    def update(self, timestamp: float, value: float) -> Optional[float]:
+        if not self.compare(value, self.threshold):
+            self.since = None
+            self.fired = False
+            return None
+        if self.since is None:
+            self.since = timestamp
+        if self.fired or timestamp - self.since < self.duration:
+            return None
+        self.fired = True
+        return value
+
+
+class _RateEvaluator:
+    """Fires when the value changed faster than the threshold over the window.
+
+    Samples older than the window are dropped as new ones arrive, so each
+    sample is appended and removed once; the rate compares the newest
+    sample with the oldest one still covering the window. Nothing fires
+    until the samples span the whole window.
+    """
+
+    __slots__ = ("compare", "threshold", "window", "samples", "fired")
+
+    def __init__(self, rule: AlertRule) -> None:
+        self.compare = _OPERATORS[rule.op]
+        self.threshold = rule.threshold
+        self.window = rule.duration
+        self.samples: Deque[Tuple[float, float]] = collections.deque()
+        self.fired = False
+
+    def update(self, timestamp: float, value: float) -> Optional[float]:
+        samples = self.samples
+        samples.append((timestamp, value))
+        while len(samples) > 1 and timestamp - samples[1][0] >= self.window:
+            samples.popleft()
+        first_time, first_value = samples[0]
+        span = timestamp - first_time
+        if span < self.window:
+            return None
+
+        rate = (value - first_value) / span
+        if not self.compare(rate, self.threshold):
+            self.fired = False
+            return None
+        if self.fired:
+            return None
+        self.fired = True
+        return rate * 60.0
+
+
+class AlertEngine:
+    """Evaluates compiled rules against each metrics sample.
+
+    Every rule keeps one evaluator per subject (the system, the selected
+    process or each watched process), and each evaluator does constant
+    work per sample. Evaluators of processes that are no longer selected
+    or watched are dropped. Not thread-safe; the metrics worker owns it.
+    """
+
+    def __init__(self, rules: Iterable[AlertRule] = ()) -> None:
+        self.set_rules(rules)
+
+    def set_rules(self, rules: Iterable[AlertRule]) -> None:
+        self.rules: Tuple[AlertRule, ...] = tuple(rules)
+        # One evaluator per rule and subject; None is the system
+        self._evaluators: List[Dict[Optional[int], object]] = [{} for _ in self.rules]
+
+    def evaluate(
+        self,
+        timestamp: float,
+        system_cpu: float,
+        system_mem: float,
+        selected: Optional[Tuple[int, float, float]],
+        watched: Dict[int, Tuple[float, float]],
+        alerts: List[Alert],
+    ) -> None:
+        """Append the alerts fired by this sample to ``alerts``.
+
+        ``selected`` is ``(pid, cpu, mem)`` of the selected process, if any,
+        and ``watched`` maps watched PIDs to their ``(cpu, mem)``.
+        """
+        for rule, evaluators in zip(self.rules, self._evaluators):
+            metric = 0 if rule.metric == "cpu" else 1
+            if rule.target == "system":
+                value = system_cpu if metric == 0 else system_mem
+                self._update(rule, evaluators, None, "System", timestamp, value, alerts)
+            elif rule.target == "selected":
+                if selected is None:
+                    evaluators.clear()
+                    continue
+                pid = selected[0]
+                if pid not in evaluators:
+                    evaluators.clear()  # a different process was selected
+                self._update(
+                    rule, evaluators, pid, f"PID {pid}", timestamp, selected[1 + metric], alerts
+                )
+            else:
+                for pid, usage in watched.items():
+                    self._update(
+                        rule, evaluators, pid, f"PID {pid}", timestamp, usage[metric], alerts
+                    )
+                if len(evaluators) > len(watched):
+                    for pid in [pid for pid in evaluators if pid not in watched]:
+                        del evaluators[pid]
+
+    @staticmethod
+    def _update(
+        rule: AlertRule,
+        evaluators: Dict[Optional[int], object],
+        key: Optional[int],
+        subject: str,
+        timestamp: float,
+        value: float,
+        alerts: List[Alert],
+    ) -> None:
+        evaluator = evaluators.get(key)
+        if evaluator is None:
+            evaluator = evaluators[key] = rule.evaluator()
+        fired = evaluator.update(timestamp, value)
+        if fired is not None:
+            alerts.append(Alert(timestamp, rule, subject, fired))
@@ -0,0 +1,501 @@
+"""Benchmarks for the Process Monitor data paths.
+
+Run ``python benchmark.py --help`` for the available benchmarks.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List, Optional, Tuple
+
+import psutil
+from PyQt6 import QtCore
+
+from data_collector import DataCollector, ProcessSnapshot, _SnapshotEngine
+from metric_log import MetricLogReader, MetricLogWriter
+from proc_reader import ProcfsSnapshotEngine
+from process_model import CPU_COLUMN, TREE_CPU_COLUMN, ProcessTableModel, ProcessTreeModel
+from process_search import SearchIndex, parse_query
+from tick_profiler import TickProfiler
+
+
+def _time_calls(fn: Callable[[], object], repeat: int) -> List[float]:
+    """Return the wall time in milliseconds of ``repeat`` calls to ``fn``."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return timings
+
+
+def _percentile(timings: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of ``timings``."""
+    ordered = sorted(timings)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def _allocations(fn: Callable[[], object], repeat: int) -> Tuple[float, int]:
+    """Median peak KiB allocated and blocks left allocated per call to ``fn``.
+
+    Runs separately from the timed calls, since tracing slows every
+    allocation down.
+    """
+    peaks, blocks = [], []
+    tracemalloc.start()
+    try:
+        for _ in range(repeat):
+            tracemalloc.reset_peak()
+            before, _peak = tracemalloc.get_traced_memory()
+            blocks_before = sys.getallocatedblocks()
+            fn()
+            blocks.append(sys.getallocatedblocks() - blocks_before)
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    return statistics.median(peaks) / 1024.0, int(statistics.median(blocks))
+
+
+# ----------------------------------------------------------------------
+# Process list backends
+# ----------------------------------------------------------------------
+def build_synthetic_procfs(root: str, count: int) -> None:
+    """Populate ``root`` with ``count`` fake PIDs readable by both backends."""
+    with open(os.path.join(root, "stat"), "w") as fh:
+        fh.write("cpu  1 0 1 100 0 0 0 0 0 0\nbtime 1700000000\n")
+    with open(os.path.join(root, "meminfo"), "w") as fh:
+        fh.write(
+            "MemTotal:       16384000 kB\nMemFree:         8192000 kB\n"
+            "MemAvailable:   12288000 kB\nBuffers:          102400 kB\n"
+            "Cached:          2048000 kB\nShmem:             51200 kB\n"
+            "Active:          4096000 kB\nInactive:        2048000 kB\n"
+            "SReclaimable:     204800 kB\n"
+        )
+
+    for pid in range(1000, 1000 + count):
+        pid_dir = os.path.join(root, str(pid))
+        os.mkdir(pid_dir)
+        name = f"worker{pid % 97}"
+        threads = 1 + pid % 8
+        with open(os.path.join(pid_dir, "stat"), "w") as fh:
+            fh.write(
+                f"{pid} ({name}) S 1 {pid} {pid} 0 -1 4194560 100 0 0 0 "
+                f"{pid % 500} {pid % 50} 0 0 20 0 {threads} 0 {1000 + pid} "
+                f"10000000 {200 + pid % 300} 18446744073709551615 0 0 0 0 0 0 0 0 0 "
+                "0 0 0 17 0 0 0 0 0 0 0 0 0 0 0 0 0 0\n"
+            )
+        with open(os.path.join(pid_dir, "statm"), "w") as fh:
+            fh.write(f"2441 {200 + pid % 300} 150 10 0 300 0\n")
+        with open(os.path.join(pid_dir, "status"), "w") as fh:
+            fh.write(f"Name:\t{name}\nState:\tS (sleeping)\nPid:\t{pid}\nThreads:\t{threads}\n")
+
+
+def bench_backends(sizes: List[int], repeat: int) -> None:
+    print(f"{'PIDs':>8} {'backend':>8} {'mean ms':>10} {'p50 ms':>10} {'max ms':>10}")
+    default_procfs = psutil.PROCFS_PATH
+    for size in sizes:
+        root = tempfile.mkdtemp(prefix="procfs-bench-")
+        try:
+            build_synthetic_procfs(root, size)
+            psutil.PROCFS_PATH = root
+            engines = {
+                "psutil": _SnapshotEngine(),
+                "procfs": ProcfsSnapshotEngine(root),
+            }
+            for name, engine in engines.items():
+                engine.collect()  # first cycle only seeds the cpu_times deltas
+                timings = _time_calls(engine.collect, repeat)
+                print(
+                    f"{size:>8} {name:>8} {statistics.mean(timings):>10.1f} "
+                    f"{statistics.median(timings):>10.1f} {max(timings):>10.1f}"
+                )
+        finally:
+            psutil.PROCFS_PATH = default_procfs
+            shutil.rmtree(root, ignore_errors=True)
+
+
+# ----------------------------------------------------------------------
+# PID lookups in the process view
+# ----------------------------------------------------------------------
+def synthetic_snapshot(count: int, seed: int = 0) -> ProcessSnapshot:
+    """Return a snapshot of ``count`` fake processes with random metrics."""
+    rng = random.Random(seed)
+    snapshot = ProcessSnapshot(time.time())
+    for pid in rng.sample(range(1, count * 10), count):
+        snapshot.append(
+            pid,
+            f"worker{pid % 97}",
+            rng.random() * 100.0,
+            rng.random() * 10.0,
+            rng.randint(1, 64),
+            rng.choice(["running", "sleeping", "idle"]),
+        )
+    return snapshot
+
+
+def bench_pid_index(sizes: List[int], lookups: int) -> None:
+    _app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    print(f"{'rows':>8} {'index ns':>10} {'restore ns':>11} {'scan ns':>12}")
+    for size in sizes:
+        snapshot = synthetic_snapshot(size)
+        model = ProcessTableModel()
+        model.sort(CPU_COLUMN, QtCore.Qt.SortOrder.DescendingOrder)
+        model.apply_snapshot(snapshot)
+        targets = random.Random(1).choices(snapshot.pids, k=lookups)
+
+        def index_lookups():
+            for pid in targets:
+                model.process_row(pid)
+
+        def restore_lookups():
+            for pid in targets:
+                model.index_for_pid(pid)
+
+        def scan_lookups():
+            # The pre-index approach: walk every row until the PID matches.
+            for pid in targets[: max(lookups // 100, 1)]:
+                for row in range(model.rowCount()):
+                    if model.pid_at(row) == pid:
+                        break
+
+        per_lookup = 1e6 / lookups
+        index_ns = statistics.median(_time_calls(index_lookups, 5)) * per_lookup
+        restore_ns = statistics.median(_time_calls(restore_lookups, 5)) * per_lookup
+        scan_ns = statistics.median(_time_calls(scan_lookups, 3)) * 1e6 / max(lookups // 100, 1)
+        print(f"{size:>8} {index_ns:>10.0f} {restore_ns:>11.0f} {scan_ns:>12.0f}")
+
+
+# ----------------------------------------------------------------------
+# Metric log
+# ----------------------------------------------------------------------
+def bench_metric_log(processes: int, seconds: int, churn: float) -> None:
+    """Record ``seconds`` of 1 Hz snapshots in which ``churn`` of the rows change."""
+    rng = random.Random(2)
+    base = synthetic_snapshot(processes)
+    rows = [list(row) for row in base.rows()]
+    start = time.time()
+
+    directory = tempfile.mkdtemp(prefix="pmon-log-")
+    path = os.path.join(directory, "bench.pmlog")
+    try:
+        writer = MetricLogWriter(path)
+        write_times = []
+        for second in range(seconds):
+            for row in rng.sample(rows, int(len(rows) * churn)):
+                row[2] = rng.random() * 100.0
+            snapshot = ProcessSnapshot(start + second)
+            for row in rows:
+                snapshot.append(*row)
+            began = time.perf_counter()
+            writer.write_sample(start + second, rng.random() * 100.0, 50.0)
+            writer.write_snapshot(snapshot)
+            write_times.append((time.perf_counter() - began) * 1000.0)
+        writer.close()
+        size = os.path.getsize(path)
+
+        began = time.perf_counter()
+        reader = MetricLogReader(path)
+        open_ms = (time.perf_counter() - began) * 1000.0
+        targets = [start + rng.random() * seconds for _ in range(50)]
+        seek_ms = statistics.median(
+            _time_calls(lambda: reader.snapshot_at(targets.pop()), len(targets))
+        )
+        step_ms = statistics.median(
+            [
+                t
+                for second in range(seconds // 2, seconds // 2 + 30)
+                for t in _time_calls(lambda: reader.snapshot_at(start + second), 1)
+            ]
+        )
+        reader.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"{processes} processes, {seconds} s, {churn:.0%} of rows changing per second")
+    print(f"  write per tick   {statistics.median(write_times):8.2f} ms (median)")
+    print(f"  log size         {size / 1024:8.0f} KiB ({size / seconds / 1024:.1f} KiB/s, "
+          f"{size / seconds * 86400 / 2**30:.2f} GiB/day)")
+    print(f"  open             {open_ms:8.2f} ms")
+    print(f"  random seek      {seek_ms:8.2f} ms (median)")
+    print(f"  scrub one second {step_ms:8.2f} ms (median)")
+
+
+# ----------------------------------------------------------------------
+# Search
+# ----------------------------------------------------------------------
+SEARCH_QUERIES = ("w", "worker1", "worker42", "/worker[0-9]$/", "pid:1-5000", "123", "")
+
+
+def bench_search(sizes: List[int], repeat: int) -> None:
+    """Time matching (worker thread) and applying the result (GUI thread)."""
+    _app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    print(f"{'rows':>8} {'query':<16} {'matches':>8} {'index ms':>9} {'match ms':>9} {'apply ms':>9}")
+    for size in sizes:
+        snapshot = synthetic_snapshot(size)
+        model = ProcessTableModel()
+        model.sort(CPU_COLUMN, QtCore.Qt.SortOrder.DescendingOrder)
+        model.apply_snapshot(snapshot)
+        index_ms = statistics.median(_time_calls(lambda: SearchIndex(snapshot), repeat))
+        index = SearchIndex(snapshot)
+        for text in SEARCH_QUERIES:
+            query = parse_query(text)
+            if query is None:
+                matches = None
+                match_ms = 0.0
+            else:
+                matches = index.match(query)
+                match_ms = statistics.median(_time_calls(lambda: index.match(query), repeat))
+
+            def apply():
+                # Alternate with the unfiltered list so every call changes rows
+                model.set_filter(None)
+                began = time.perf_counter()
+                model.set_filter(matches)
+                return time.perf_counter() - began
+
+            apply_ms = statistics.median(apply() for _ in range(repeat)) * 1000.0
+            count = size if matches is None else len(matches)
+            print(
+                f"{size:>8} {text or '(clear)':<16} {count:>8} {index_ms:>9.2f} "
+                f"{match_ms:>9.2f} {apply_ms:>9.2f}"
+            )
+
+
+# ----------------------------------------------------------------------
+# Process tree
+# ----------------------------------------------------------------------
+def synthetic_tree(count: int, seed: int = 0) -> ProcessSnapshot:
+    """Like :func:`synthetic_snapshot`, with each process parented to an earlier one."""
+    snapshot = synthetic_snapshot(count, seed)
+    rng = random.Random(seed)
+    pids = snapshot.pids
+    snapshot.ppids = [0] + [pids[rng.randrange(index)] for index in range(1, count)]
+    return snapshot
+
+
+def bench_tree(sizes: List[int], updates: int, churn: float) -> None:
+    """Incremental tree updates against building the tree from scratch."""
+    _app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    print(f"{'rows':>8} {'update ms':>10} {'rebuild ms':>11} {'shown rows':>11}")
+    for size in sizes:
+        rng = random.Random(3)
+        snapshot = synthetic_tree(size)
+        model = ProcessTreeModel()
+        model.sort(TREE_CPU_COLUMN, QtCore.Qt.SortOrder.DescendingOrder)
+        model.apply_snapshot(snapshot)
+
+        def rebuild():
+            # What a model reset does on every refresh
+            ProcessTreeModel().apply_snapshot(snapshot)
+
+        update_times, rebuild_times = [], []
+        for _ in range(updates):
+            for index in rng.sample(range(size), int(size * churn)):
+                snapshot.cpu[index] = rng.random() * 100.0
+            update_times.extend(_time_calls(lambda: model.apply_snapshot(snapshot), 1))
+            rebuild_times.extend(_time_calls(rebuild, 1))
+        print(
+            f"{size:>8} {statistics.median(update_times):>10.2f} "
+            f"{statistics.median(rebuild_times):>11.2f} {model.rowCount():>11}"
+        )
+
+
+# ----------------------------------------------------------------------
+# GUI refresh path
+# ----------------------------------------------------------------------
+def bench_refresh(
+    sizes: List[int],
+    ticks: int,
+    churn: float,
+    profile_ticks: int = 0,
+    profile_path: Optional[str] = None,
+) -> None:
+    """Time the three stages of a refresh in a real, offscreen window.
+
+    ``collect_process_list`` reads a synthetic /proc with each backend,
+    ``_apply_process_filter`` applies synthetic snapshots to the table and
+    tree views, and ``ChartManager.update_charts`` redraws after one new
+    sample per tick. With ``profile_ticks`` the first ticks of every stage
+    are also profiled and the merged cProfile stats written out.
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6 import QtWidgets
+
+    from process_monitor_gui import ProcessMonitor
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(["benchmark"])
+    window = ProcessMonitor()
+    # Only the calls below should run; stop the live collection.
+    window.running = False
+    window.data_collector.stop()
+    window.thread_pool.waitForDone()
+    window.show()
+    app.processEvents()
+
+    profiler = TickProfiler()
+    if profile_ticks:
+        profiler.start(profile_ticks, profile_path)
+
+    def run(size: int, stage: str, fn: Callable[[], object], prepare=lambda: None) -> None:
+        def tick() -> float:
+            prepare()
+            began = time.perf_counter()
+            fn()
+            elapsed = (time.perf_counter() - began) * 1000.0
+            summary = profiler.tick()
+            if summary is not None:
+                print(f"cProfile stats of {profile_ticks} ticks written to {profiler.path}")
+            return elapsed
+
+        fn()  # warm up caches and lazily created state
+        timings = [tick() for _ in range(ticks)]
+
+        def traced() -> None:
+            prepare()
+            fn()
+
+        peak_kib, blocks = _allocations(traced, min(ticks, 10))
+        print(
+            f"{size:>8} {stage:<24} {_percentile(timings, 0.5):>8.2f} "
+            f"{_percentile(timings, 0.99):>8.2f} {max(timings):>8.2f} "
+            f"{peak_kib:>9.0f} {blocks:>8}"
+        )
+
+    print(
+        f"{'rows':>8} {'stage':<24} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+        f"{'peak KiB':>9} {'blocks':>8}"
+    )
+    default_procfs = psutil.PROCFS_PATH
+    try:
+        for size in sizes:
+            rng = random.Random(4)
+            root = tempfile.mkdtemp(prefix="procfs-bench-")
+            try:
+                build_synthetic_procfs(root, size)
+                psutil.PROCFS_PATH = root
+                collector = DataCollector("psutil")
+                run(size, "collect (psutil)", collector.collect_process_list)
+                if sys.platform.startswith("linux"):
+                    collector._snapshot_engine = ProcfsSnapshotEngine(root)
+                    run(size, "collect (procfs)", collector.collect_process_list)
+            finally:
+                psutil.PROCFS_PATH = default_procfs
+                shutil.rmtree(root, ignore_errors=True)
+
+            snapshot = synthetic_tree(size)
+
+            def churn_snapshot() -> None:
+                for index in rng.sample(range(size), int(size * churn)):
+                    snapshot.cpu[index] = rng.random() * 100.0
+                window.all_processes = snapshot
+
+            for tree in (False, True):
+                window.tree_check.setChecked(tree)
+                run(
+                    size,
+                    "filter (tree)" if tree else "filter (table)",
+                    window._apply_process_filter,
+                    churn_snapshot,
+                )
+            window.tree_check.setChecked(False)
+
+            chart_manager = window.chart_manager
+            cores = psutil.cpu_count() or 1
+            clock = [time.time()]
+
+            def add_sample() -> None:
+                clock[0] += 1.0
+                chart_manager.add_data_point(
+                    rng.random() * 100.0, 50.0, rng.random() * 10.0, 5.0, clock[0]
+                )
+                chart_manager.add_watch_samples(
+                    {pid: (rng.random() * 10.0, 1.0) for pid in (1, 2, 3)}, clock[0]
+                )
+                chart_manager.add_core_sample([rng.random() * 100.0 for _ in range(cores)])
+
+            run(size, "update_charts", lambda: chart_manager.update_charts(1), add_sample)
+    finally:
+        window.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    backends = subparsers.add_parser(
+        "backends", help="compare the psutil and procfs process list backends"
+    )
+    backends.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    backends.add_argument("--repeat", type=int, default=5)
+
+    pid_index = subparsers.add_parser(
+        "pid-index", help="PID to row lookups used by selection restore and jump to PID"
+    )
+    pid_index.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    pid_index.add_argument("--lookups", type=int, default=10000)
+
+    search = subparsers.add_parser(
+        "search", help="search box matching and filtered row application"
+    )
+    search.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    search.add_argument("--repeat", type=int, default=5)
+
+    tree = subparsers.add_parser(
+        "tree", help="incremental process tree updates with subtree totals"
+    )
+    tree.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    tree.add_argument("--updates", type=int, default=20)
+    tree.add_argument("--churn", type=float, default=0.05)
+
+    metric_log = subparsers.add_parser(
+        "metric-log", help="recording size, write cost and playback seek times"
+    )
+    metric_log.add_argument("--processes", type=int, default=5000)
+    metric_log.add_argument("--seconds", type=int, default=600)
+    metric_log.add_argument("--churn", type=float, default=0.05)
+
+    refresh = subparsers.add_parser(
+        "refresh",
+        help="collect_process_list, _apply_process_filter and update_charts in an "
+        "offscreen window",
+    )
+    refresh.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000])
+    refresh.add_argument("--ticks", type=int, default=50)
+    refresh.add_argument("--churn", type=float, default=0.05)
+    refresh.add_argument(
+        "--profile-ticks",
+        type=int,
+        default=0,
+        metavar="N",
+        help="also profile the first N ticks with cProfile",
+    )
+    refresh.add_argument("--profile-out", metavar="FILE", help="where to write the stats")
+
+    args = parser.parse_args(argv)
+    if args.benchmark == "backends":
+        if not sys.platform.startswith("linux"):
+            parser.error("the backends benchmark requires Linux")
+        bench_backends(args.sizes, args.repeat)
+    elif args.benchmark == "pid-index":
+        bench_pid_index(args.sizes, args.lookups)
+    elif args.benchmark == "search":
+        bench_search(args.sizes, args.repeat)
+    elif args.benchmark == "tree":
+        bench_tree(args.sizes, args.updates, args.churn)
+    elif args.benchmark == "refresh":
+        bench_refresh(args.sizes, args.ticks, args.churn, args.profile_ticks, args.profile_out)
+    elif args.benchmark == "metric-log":
+        bench_metric_log(args.processes, args.seconds, args.churn)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,154 @@
-from collections import deque
+import math
+import time
+
+import numpy as np
+
+from series_store import HistoryStore, SeriesStore, minmax_decimate
+
+HISTORY_LENGTH = 60
+DEFAULT_RETENTION = 3600
+SERIES_NAMES = ("cpu", "mem", "process_cpu", "process_mem")
+
+# Selectable chart windows in seconds and their menu labels
+WINDOWS = {
+    "1 min": 60,
+    "10 min": 600,
+    "1 hour": 3600,
+    "6 hours": 6 * 3600,
+    "24 hours": 24 * 3600,
+}
+
+# (largest window in seconds, seconds per axis unit, unit label)
+_TIME_UNITS = ((120, 1, "s"), (2 * 3600, 60, "min"), (float("inf"), 3600, "h"))
+
+# Points plotted per pixel of axes width at most
+POINTS_PER_PIXEL = 2
+
+# Seconds of 1 Hz history kept per watched process
+WATCH_RETENTION = 600
+WATCH_SERIES = ("cpu", "mem")
+
+# Samples (columns) shown in the per-core CPU heatmap
+CORE_HISTORY = 60
+
+
+class _ChartCanvas:
+    """One figure canvas whose persistent artists are redrawn by blitting.
+
+    The axes, title, labels and grid are rendered once into a cached
+    background; each frame restores that background and draws only the
+    lines on top. A full draw happens only when something in the
+    background itself changes (title, limits, resize).
+    """
+
+    def __init__(self, canvas, ax, blit=True):
+        self.canvas = canvas
+        self.ax = ax
+        self.artists = []
+        self.blit = blit and canvas.supports_blit
+        self.dirty = True
+        self.needs_full_draw = True
+        self._background = None
+
+        # Frame-time counters
+        self.frames = 0
+        self.blits = 0
+        self.full_draws = 0
+        self.skipped = 0
+        self.total_time = 0.0
+        self.last_time = 0.0
+
+        canvas.mpl_connect("draw_event", self._on_draw)
+
+    def add_line(self, *args, **kwargs):
+        line, = self.ax.plot(*args, animated=self.blit, **kwargs)
+        self.artists.append(line)
+        return line
+
+    def add_image(self, data, **kwargs):
+        image = self.ax.imshow(data, animated=self.blit, **kwargs)
+        self.artists.append(image)
+        return image
+
+    def add_text(self, x, y, text, **kwargs):
+        artist = self.ax.text(x, y, text, animated=self.blit, transform=self.ax.transAxes, **kwargs)
+        self.artists.append(artist)
+        return artist
+
+    def remove_artist(self, artist):
+        self.artists.remove(artist)
+        artist.remove()
+
+    def _on_draw(self, _event):
+        if not self.blit:
+            return
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            self.ax.draw_artist(artist)
+
+    def render(self):
+        """Redraw the canvas if its data or background changed."""
+        if not (self.dirty or self.needs_full_draw):
+            self.skipped += 1
+            return
+
+        start = time.perf_counter()
+        if not self.blit:
+            self.canvas.draw_idle()
+            self.full_draws += 1
+        elif self.needs_full_draw or self._background is None:
+            # draw() fires draw_event, which caches the background and
+            # paints the artists on top of it.
+            self.canvas.draw()
+            self.full_draws += 1
+        else:
+            self.canvas.restore_region(self._background)
+            self._draw_artists()
+            self.canvas.blit(self.ax.bbox)
+            self.blits += 1
+
+        self.last_time = time.perf_counter() - start
+        self.total_time += self.last_time
+        self.frames += 1
+        self.dirty = False
+        self.needs_full_draw = False
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "blits": self.blits,
+            "full_draws": self.full_draws,
+            "skipped": self.skipped,
+            "last_ms": self.last_time * 1000.0,
+            "mean_ms": self.total_time * 1000.0 / self.frames if self.frames else 0.0,
+        }
+
+    def reset_stats(self):
+        self.frames = self.blits = self.full_draws = self.skipped = 0
+        self.total_time = self.last_time = 0.0
 
 
 class ChartManager:
     """Manages chart rendering and updates"""
 
-    def __init__(self, canvas_cpu, canvas_mem, canvas_process, ax_cpu, ax_mem, ax_process):
+    def __init__(
+        self,
+        canvas_cpu,
+        canvas_mem,
+        canvas_process,
+        ax_cpu,
+        ax_mem,
+        ax_process,
+        blit=True,
+        retention=DEFAULT_RETENTION,
+        canvas_watch=None,
+        ax_watch=None,
+        canvas_cores=None,
+        ax_cores=None,
+    ):
         self.canvas_cpu = canvas_cpu
         self.canvas_mem = canvas_mem
         self.canvas_process = canvas_process
@@ -12,77 +156,336 @@ class ChartManager:
         self.ax_mem = ax_mem
         self.ax_process = ax_process
 
-        self.time_data = deque(maxlen=60)
-        self.cpu_data = deque(maxlen=60)
-        self.mem_data = deque(maxlen=60)
-        self.process_cpu_data = deque(maxlen=60)
-        self.process_mem_data = deque(maxlen=60)
-
-        # Initialize with zeros
-        for i in range(60):
-            self.time_data.append(-60 + i)
-            self.cpu_data.append(0)
-            self.mem_data.append(0)
-            self.process_cpu_data.append(0)
-            self.process_mem_data.append(0)
-
-    def add_data_point(self, system_cpu, system_mem, process_cpu, process_mem):
+        # The newest ``retention`` raw samples are kept, however far apart the
+        # scheduler takes them, plus min/max rollups for longer windows.
+        self.store = HistoryStore(SERIES_NAMES, max(retention, HISTORY_LENGTH))
+        self.window_seconds = HISTORY_LENGTH
+        self._tier = 0
+
+        # Number of trailing samples equal to the newest one per series; once
+        # it covers the whole window a new sample leaves the plot unchanged.
+        self._unchanged = dict.fromkeys(SERIES_NAMES, 0)
+
+        self.cpu_chart = _ChartCanvas(canvas_cpu, ax_cpu, blit)
+        self.mem_chart = _ChartCanvas(canvas_mem, ax_mem, blit)
+        self.process_chart = _ChartCanvas(canvas_process, ax_process, blit)
+        self.charts = (self.cpu_chart, self.mem_chart, self.process_chart)
+
+        # Watched processes: one ring buffer store per PID plus the group total
+        self.watch_history = {}
+        self.watch_totals = SeriesStore(WATCH_SERIES, WATCH_RETENTION)
+        self.watch_chart = None
+        self._watch_lines = {}
+        self._watch_ylim = 10
+        if canvas_watch is not None:
+            self.watch_chart = _ChartCanvas(canvas_watch, ax_watch, blit)
+            self.charts += (self.watch_chart,)
+            self._setup_axes(ax_watch, "Watched processes", 10)
+            self.watch_total_line = self.watch_chart.add_line([], [], 'k-', linewidth=2)
+            self.watch_label = self.watch_chart.add_text(0.01, 0.95, "", va="top")
+
+        # Per-core CPU heatmap: one row per core, one column per sample. It
+        # counts samples rather than seconds, so it is not in self.charts and
+        # ignores the history window.
+        self.cores_chart = None
+        self.core_history = np.full((0, CORE_HISTORY), np.nan, dtype=np.float32)
+        self._core_image = None
+        if canvas_cores is not None:
+            self.cores_chart = _ChartCanvas(canvas_cores, ax_cores, blit)
+            ax_cores.set_title("CPU Usage per Core")
+            ax_cores.set_xlabel("Samples")
+            ax_cores.set_ylabel("Core")
+
+        self._setup_axes(ax_cpu, "CPU Usage", 100)
+        self._setup_axes(ax_mem, "Memory Usage", 100)
+        self._setup_axes(ax_process, "Select a process to view resource usage", 10)
+        self.cpu_line = self.cpu_chart.add_line([], [], 'b-')
+        self.mem_line = self.mem_chart.add_line([], [], 'r-')
+        self.process_cpu_line = self.process_chart.add_line([], [], 'b-', label='CPU')
+        self.process_mem_line = self.process_chart.add_line([], [], 'r-', label='Memory')
+        # The legend copies line styles, so build it before hiding the lines
+        self.process_legend = ax_process.legend(loc="upper left")
+        for artist in (self.process_cpu_line, self.process_mem_line, self.process_legend):
+            artist.set_visible(False)
+
+        self._shown_pid = None
+        self._process_ylim = 10
+        # (timestamps, cpu, mem, end time) of a recording shown instead of
+        # the live system charts, see show_recording()
+        self._recording = None
+
+    def _setup_axes(self, ax, title, ymax):
+        ax.set_title(title)
+        ax.set_ylim(0, ymax)
+        ax.set_ylabel("Usage (%)")
+        ax.grid(True)
+        self._set_time_axis(ax)
+
+    def _time_unit(self):
+        for limit, scale, label in _TIME_UNITS:
+            if self.window_seconds <= limit:
+                return scale, label
+        return _TIME_UNITS[-1][1:]
+
+    def _set_time_axis(self, ax):
+        # Samples are plotted against "time ago", so the x axis never
+        # scrolls and the cached backgrounds stay valid.
+        scale, label = self._time_unit()
+        ax.set_xlim(-self.window_seconds / scale, 0)
+        ax.set_xlabel(f"Time ({label})")
+
+    def set_window(self, seconds):
+        """Show the last ``seconds`` of history in every chart."""
+        if seconds == self.window_seconds:
+            return
+        self.window_seconds = seconds
+        for chart in self.charts:
+            self._set_time_axis(chart.ax)
+            chart.dirty = chart.needs_full_draw = True
+
+    def _window_changed(self, name, value):
+        """Track ``value`` before it is appended; True if the plotted raw window changes."""
+        if len(self.store) and self.store.raw.series(name).last() == value:
+            self._unchanged[name] = min(self._unchanged[name] + 1, self.store.raw.retention + 1)
+        else:
+            self._unchanged[name] = 1
+        return (
+            self._unchanged[name] <= self.window_seconds
+            or len(self.store) < self.window_seconds
+        )
+
+    def add_data_point(self, system_cpu, system_mem, process_cpu, process_mem, timestamp=None):
         """Add new data point to chart data"""
-        self.time_data.append(self.time_data[-1] + 1)
-        self.cpu_data.append(system_cpu)
-        self.mem_data.append(system_mem)
-        self.process_cpu_data.append(process_cpu)
-        self.process_mem_data.append(process_mem)
+        values = {
+            "cpu": system_cpu,
+            "mem": system_mem,
+            "process_cpu": process_cpu,
+            "process_mem": process_mem,
+        }
+        changed = {name: self._window_changed(name, value) for name, value in values.items()}
+        completed_tiers = self.store.append(time.time() if timestamp is None else timestamp, values)
+
+        system_live = self._recording is None
+        if self._tier:
+            # Rollup views only change when their tier completes a bucket
+            if self._tier in completed_tiers:
+                self.process_chart.dirty = True
+                if system_live:
+                    self.cpu_chart.dirty = self.mem_chart.dirty = True
+            return
+
+        if changed["cpu"] and system_live:
+            self.cpu_chart.dirty = True
+        if changed["mem"] and system_live:
+            self.mem_chart.dirty = True
+        if changed["process_cpu"] or changed["process_mem"]:
+            self.process_chart.dirty = True
 
     def reset_process_data(self):
         """Reset process-specific chart data"""
-        self.process_cpu_data.clear()
-        self.process_mem_data.clear()
-        for i in range(60):
-            self.process_cpu_data.append(0)
-            self.process_mem_data.append(0)
+        self.store.reset(("process_cpu", "process_mem"))
+        self._unchanged["process_cpu"] = self._unchanged["process_mem"] = self.store.raw.retention
+        self.process_chart.dirty = True
 
-    def update_charts(self, selected_pid=None):
-        """Update all charts with current data"""
-        # Update CPU chart
-        self.ax_cpu.clear()
-        self.ax_cpu.set_title("CPU Usage")
-        self.ax_cpu.set_ylim(0, 100)
-        self.ax_cpu.set_xlabel("Time (s)")
-        self.ax_cpu.set_ylabel("Usage (%)")
-        self.ax_cpu.grid(True)
-        self.ax_cpu.plot(list(self.time_data), list(self.cpu_data), 'b-')
-        self.canvas_cpu.draw_idle()
-
-        # Update Memory chart
-        self.ax_mem.clear()
-        self.ax_mem.set_title("Memory Usage")
-        self.ax_mem.set_ylim(0, 100)
-        self.ax_mem.set_xlabel("Time (s)")
-        self.ax_mem.set_ylabel("Usage (%)")
-        self.ax_mem.grid(True)
-        self.ax_mem.plot(list(self.time_data), list(self.mem_data), 'r-')
-        self.canvas_mem.draw_idle()
-
-        # Update process chart
-        self.ax_process.clear()
+    def _configure_process_axes(self, selected_pid):
         if selected_pid is not None:
             self.ax_process.set_title(f"Process {selected_pid} Resource Usage")
-            max_val = max(
-                max(self.process_cpu_data, default=0),
-                max(self.process_mem_data, default=0)
-            )
-            self.ax_process.set_ylim(0, max(max_val + 10, 10))
-            self.ax_process.set_xlabel("Time (s)")
-            self.ax_process.set_ylabel("Usage (%)")
-            self.ax_process.grid(True)
-            self.ax_process.plot(list(self.time_data), list(self.process_cpu_data), 'b-', label='CPU')
-            self.ax_process.plot(list(self.time_data), list(self.process_mem_data), 'r-', label='Memory')
-            self.ax_process.legend()
         else:
             self.ax_process.set_title("Select a process to view resource usage")
-            self.ax_process.set_ylim(0, 10)
-            self.ax_process.set_xlabel("Time (s)")
-            self.ax_process.set_ylabel("Usage (%)")
-            self.ax_process.grid(True)
-        self.canvas_process.draw_idle()
+            self._set_process_ylim(10)
+        visible = selected_pid is not None
+        self.process_cpu_line.set_visible(visible)
+        self.process_mem_line.set_visible(visible)
+        self.process_legend.set_visible(visible)
+        self._shown_pid = selected_pid
+        self.process_chart.needs_full_draw = True
+
+    def _set_process_ylim(self, ymax):
+        if ymax != self._process_ylim:
+            self._process_ylim = ymax
+            self.ax_process.set_ylim(0, ymax)
+            self.process_chart.needs_full_draw = True
+
+    def add_watch_samples(self, watched, timestamp=None):
+        """Record ``{pid: (cpu, mem)}`` for the watched processes."""
+        timestamp = time.time() if timestamp is None else timestamp
+        exited = [pid for pid in self.watch_history if pid not in watched]
+        for pid in exited:
+            del self.watch_history[pid]
+            line = self._watch_lines.pop(pid, None)
+            if line is not None:
+                self.watch_chart.remove_artist(line)
+
+        total_cpu = total_mem = 0.0
+        for pid, (cpu, mem) in watched.items():
+            history = self.watch_history.get(pid)
+            if history is None:
+                history = self.watch_history[pid] = SeriesStore(WATCH_SERIES, WATCH_RETENTION)
+            history.append(timestamp, {"cpu": cpu, "mem": mem})
+            total_cpu += cpu
+            total_mem += mem
+        self.watch_totals.append(timestamp, {"cpu": total_cpu, "mem": total_mem})
+
+        if self.watch_chart is not None and (watched or exited):
+            self.watch_chart.dirty = True
+
+    def add_core_sample(self, per_cpu):
+        """Append one sample of per-core CPU % to the heatmap history."""
+        history = self.core_history
+        if len(per_cpu) != len(history):
+            # First sample, or CPUs went on- or offline
+            history = self.core_history = np.full(
+                (len(per_cpu), CORE_HISTORY), np.nan, dtype=np.float32
+            )
+            self._reset_core_image()
+        # Shift in place; at one column per sample this is a small memmove
+        history[:, :-1] = history[:, 1:]
+        history[:, -1] = per_cpu
+        if self.cores_chart is not None:
+            self.cores_chart.dirty = True
+
+    def _reset_core_image(self):
+        chart = self.cores_chart
+        if chart is None:
+            return
+        if self._core_image is not None:
+            chart.remove_artist(self._core_image)
+        cores = len(self.core_history)
+        self._core_image = chart.add_image(
+            self.core_history,
+            aspect="auto",
+            origin="lower",
+            cmap="inferno",
+            vmin=0,
+            vmax=100,
+            interpolation="nearest",
+            extent=(-CORE_HISTORY, 0, -0.5, cores - 0.5),
+        )
+        chart.ax.set_xlim(-CORE_HISTORY, 0)
+        chart.ax.set_ylim(-0.5, cores - 0.5)
+        chart.needs_full_draw = True
+
+    def _watch_plot_data(self, store, name, max_points):
+        timestamps = store.latest_timestamps(len(store))
+        first = int(np.searchsorted(timestamps, self.store.latest_timestamp - self.window_seconds))
+        timestamps = timestamps[first:]
+        values = store.latest(name, len(store))[first:]
+        if len(timestamps) > max_points:
+            timestamps, values = minmax_decimate(timestamps, values, values, max_points // 2)
+        scale, _label = self._time_unit()
+        return (timestamps - self.store.latest_timestamp) / scale, values
+
+    def _update_watch_chart(self, max_points):
+        chart = self.watch_chart
+        for pid, history in self.watch_history.items():
+            line = self._watch_lines.get(pid)
+            if line is None:
+                line = self._watch_lines[pid] = chart.add_line([], [], linewidth=1, alpha=0.7)
+            line.set_data(*self._watch_plot_data(history, "cpu", max_points))
+
+        x_data, totals = self._watch_plot_data(self.watch_totals, "cpu", max_points)
+        self.watch_total_line.set_data(x_data, totals)
+        latest = totals[-1] if len(totals) else 0.0
+        self.watch_label.set_text(
+            f"{len(self.watch_history)} processes, {latest:.1f}% CPU total"
+        )
+
+        ymax = max(math.ceil((totals.max(initial=0) + 10) / 10) * 10, 10)
+        if ymax != self._watch_ylim:
+            self._watch_ylim = ymax
+            chart.ax.set_ylim(0, ymax)
+            chart.needs_full_draw = True
+
+    def _plot_data(self, name, max_points):
+        timestamps, values = self.store.window(name, self.window_seconds, max_points, self._tier)
+        scale, _label = self._time_unit()
+        return (timestamps - self.store.latest_timestamp) / scale, values
+
+    def _max_points(self):
+        # Plot at most POINTS_PER_PIXEL points per pixel of axes width
+        return max(int(self.ax_cpu.bbox.width) * POINTS_PER_PIXEL, 2)
+
+    def show_recording(self, timestamps, cpu, mem, end_time):
+        """Show recorded system samples in the window ending at ``end_time``.
+
+        Live samples keep being stored and reappear after :meth:`show_live`.
+        """
+        self._recording = (timestamps, cpu, mem, end_time)
+        self.cpu_chart.dirty = self.mem_chart.dirty = True
+        self._plot_recording(self._max_points())
+        self.cpu_chart.render()
+        self.mem_chart.render()
+
+    def show_live(self):
+        self._recording = None
+        self.cpu_chart.dirty = self.mem_chart.dirty = True
+
+    def _plot_recording(self, max_points):
+        timestamps, cpu, mem, end_time = self._recording
+        first = int(np.searchsorted(timestamps, end_time - self.window_seconds))
+        last = int(np.searchsorted(timestamps, end_time, "right"))
+        scale, _label = self._time_unit()
+        for line, values in ((self.cpu_line, cpu), (self.mem_line, mem)):
+            x_data, y_data = timestamps[first:last], values[first:last]
+            if len(x_data) > max_points:
+                x_data, y_data = minmax_decimate(x_data, y_data, y_data, max_points // 2)
+            line.set_data((x_data - end_time) / scale, y_data)
+
+    def update_charts(self, selected_pid=None):
+        """Update all charts with current data"""
+        if selected_pid != self._shown_pid:
+            self._configure_process_axes(selected_pid)
+
+        # Plot from the finest history tier that fits the point budget
+        max_points = self._max_points()
+        tier = self.store.select_tier(self.window_seconds, max_points)
+        if tier != self._tier:
+            self._tier = tier
+            for chart in self.charts:
+                chart.dirty = True
+
+        if self._recording is not None:
+            if self.cpu_chart.dirty or self.mem_chart.dirty:
+                self._plot_recording(max_points)
+        else:
+            if self.cpu_chart.dirty:
+                self.cpu_line.set_data(*self._plot_data("cpu", max_points))
+            if self.mem_chart.dirty:
+                self.mem_line.set_data(*self._plot_data("mem", max_points))
+        if self.process_chart.dirty and selected_pid is not None and len(self.store):
+            x_data, process_cpu = self._plot_data("process_cpu", max_points)
+            self.process_cpu_line.set_data(x_data, process_cpu)
+            x_data, process_mem = self._plot_data("process_mem", max_points)
+            self.process_mem_line.set_data(x_data, process_mem)
+            max_val = max(process_cpu.max(initial=0), process_mem.max(initial=0))
+            # Round the limit up to a multiple of 10 so it (and with it the
+            # cached background) only changes when the data crosses a step.
+            self._set_process_ylim(max(math.ceil((max_val + 10) / 10) * 10, 10))
+        if self.watch_chart is not None and self.watch_chart.dirty:
+            self._update_watch_chart(max_points)
+        if self.cores_chart is not None and self._core_image is not None:
+            if self.cores_chart.dirty:
+                self._core_image.set_data(self.core_history)
+            self.cores_chart.render()
+
+        for chart in self.charts:
+            chart.render()
+
+    def frame_stats(self):
+        """Return frame-time counters per chart."""
+        stats = {
+            "cpu": self.cpu_chart.stats(),
+            "memory": self.mem_chart.stats(),
+            "process": self.process_chart.stats(),
+        }
+        if self.watch_chart is not None:
+            stats["watch"] = self.watch_chart.stats()
+        if self.cores_chart is not None:
+            stats["cores"] = self.cores_chart.stats()
+        return stats
+
+    def reset_frame_stats(self):
+        for chart in self.charts:
+            chart.reset_stats()
+        if self.cores_chart is not None:
+            self.cores_chart.reset_stats()
@@ -1,39 +1,61 @@
 from __future__ import annotations
 
-from typing import Dict, Iterable, List, Optional, Tuple
+import collections
+import re
+from array import array
+from typing import Deque, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 
 import psutil
 import time
 from PyQt6 import QtCore
 
+from alerts import ALERT_LOG_SIZE, Alert, AlertEngine, AlertRule, parse_rules
+from process_actions import ActionResult, run_action
+from process_info import ProcessInfo, ProcessInfoCache
+from metrics_payload import MetricsPayload, PayloadBuffer
+from scheduler import AdaptiveScheduler
+from system_metrics import SystemSampler
+from top_consumers import TopConsumers
+
 
 class _MetricsWorker(QtCore.QObject):
     """Worker object that collects metrics inside a dedicated QThread."""
 
-    data_ready = QtCore.pyqtSignal(dict)
+    data_ready = QtCore.pyqtSignal(object)
 
-    def __init__(self) -> None:
+    def __init__(self, payloads: PayloadBuffer, adaptive: bool = True) -> None:
         super().__init__()
+        self._payloads = payloads
         self._timer: Optional[QtCore.QTimer] = None
+        self.scheduler = AdaptiveScheduler(adaptive=adaptive)
         self.selected_pid: Optional[int] = None
+        self.watch_pids: FrozenSet[int] = frozenset()
+        # Replaced wholesale by DataCollector.update_process_cache; a plain
+        # reference swap, so the GUI thread never sends the mapping over.
         self.processes: Dict[int, psutil.Process] = {}
+        self._sampler = _UsageSampler()
+        self._system_sampler = SystemSampler()
+        self.alert_engine = AlertEngine()
         self.system_cpu = 0.0
         self.system_mem = 0.0
         self.process_cpu = 0.0
         self.process_mem = 0.0
 
-        # Initialize CPU percent tracking (first call returns 0.0)
-        psutil.cpu_percent(interval=None)
+        # Initialize the CPU and I/O counters (the first sample reports zeros)
+        self._system_sampler.sample()
 
     @QtCore.pyqtSlot()
     def start(self) -> None:
         if self._timer is not None:
             return
 
+        # One single-shot timer re-armed after every tick, aligned to the
+        # scheduler's current interval on the wall clock.
         self._timer = QtCore.QTimer(self)
-        self._timer.setInterval(1000)
-        self._timer.timeout.connect(self._collect_metrics)
-        self._timer.start()
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+        self._timer.start(self.scheduler.next_delay_ms(time.time()))
 
     @QtCore.pyqtSlot()
     def stop(self) -> None:
@@ -49,63 +71,204 @@ class _MetricsWorker(QtCore.QObject):
         self.selected_pid = pid if pid else None
 
     @QtCore.pyqtSlot(object)
-    def update_process_cache(self, processes: Optional[Dict[int, psutil.Process]]) -> None:
-        self.processes = processes or {}
+    def set_watch_pids(self, pids: Optional[FrozenSet[int]]) -> None:
+        self.watch_pids = pids or frozenset()
+
+    @QtCore.pyqtSlot(object)
+    def set_alert_rules(self, rules: Tuple[AlertRule, ...]) -> None:
+        self.alert_engine.set_rules(rules)
+
+    @QtCore.pyqtSlot(bool)
+    def set_visible(self, visible: bool) -> None:
+        self.scheduler.visible = visible
+        if visible and self._timer is not None:
+            # Leave the slow hidden schedule right away
+            self.scheduler.request_refresh()
+            self._timer.start(0)
+
+    @QtCore.pyqtSlot()
+    def request_process_refresh(self) -> None:
+        self.scheduler.request_refresh()
+
+    @QtCore.pyqtSlot(float, float)
+    def add_cost(self, finished: float, seconds: float) -> None:
+        self.scheduler.add_cost(finished, seconds)
+
+    def _tick(self) -> None:
+        started = time.perf_counter()
+        try:
+            self._collect_metrics()
+        finally:
+            now = time.time()
+            self.scheduler.add_cost(now, time.perf_counter() - started)
+            if self._timer is not None:
+                self._timer.start(self.scheduler.next_delay_ms(now))
 
     def _collect_metrics(self) -> None:
-        self.system_cpu = psutil.cpu_percent(interval=None)
-        self.system_mem = psutil.virtual_memory().percent
+        now = time.time()
+        payload = self._payloads.acquire()
+        # CPU (per core), memory, disk and network are read once here, into
+        # the recycled payload; the GUI formats it without further calls.
+        system = self._system_sampler.sample(now, payload.system)
+        self.system_cpu = system.cpu
+        self.system_mem = system.memory_percent
+
+        # The selected process and the watch set are sampled in one pass
+        pids = set(self.watch_pids)
+        if self.selected_pid:
+            pids.add(self.selected_pid)
+        usage = self._sampler.sample(pids, system.memory_total, self.processes) if pids else {}
+
+        self.process_cpu, self.process_mem = usage.get(self.selected_pid, (0.0, 0.0))
+
+        scheduler = self.scheduler
+        scheduler.observe(now, self.system_cpu, ((pid, cpu) for pid, (cpu, _mem) in usage.items()))
+
+        payload.timestamp = now
+        payload.system_cpu = self.system_cpu
+        payload.system_mem = self.system_mem
+        payload.process_cpu = self.process_cpu
+        payload.process_mem = self.process_mem
+        watched = payload.watched
+        watched.clear()
+        for pid in self.watch_pids:
+            if pid in usage:
+                watched[pid] = usage[pid]
+        payload.alerts.clear()
+        if self.alert_engine.rules:
+            selected = None
+            if self.selected_pid in usage:
+                selected = (self.selected_pid, self.process_cpu, self.process_mem)
+            self.alert_engine.evaluate(
+                now, self.system_cpu, self.system_mem, selected, watched, payload.alerts
+            )
+        payload.refresh_processes = scheduler.process_refresh_due(now)
+        payload.mode = scheduler.mode
+        payload.interval_ms = scheduler.interval_ms
+        payload.process_period_ms = scheduler.process_period_ms
+        payload.overhead = scheduler.overhead(now)
+        payload.budget = scheduler.budget
+        self.data_ready.emit(payload)
+
+
+class _UsageSampler:
+    """Samples CPU and memory for a set of PIDs in one batched pass.
+
+    On Linux the stat/statm files are read directly with a shared buffer;
+    elsewhere psutil is used with ``oneshot`` so each process costs a single
+    round of system calls. CPU % comes from cpu_times deltas between calls.
+    """
 
-        if self.selected_pid and self.selected_pid in self.processes:
-            try:
-                proc = self.processes[self.selected_pid]
-                if proc.is_running():
-                    self.process_cpu = proc.cpu_percent(interval=None)
-                    self.process_mem = proc.memory_percent()
-                else:
-                    self.process_cpu = 0.0
-                    self.process_mem = 0.0
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                self.process_cpu = 0.0
-                self.process_mem = 0.0
-        else:
-            self.process_cpu = 0.0
-            self.process_mem = 0.0
-
-        self.data_ready.emit(
-            {
-                "system_cpu": self.system_cpu,
-                "system_mem": self.system_mem,
-                "process_cpu": self.process_cpu,
-                "process_mem": self.process_mem,
-                "timestamp": time.time(),
-            }
-        )
+    def __init__(self) -> None:
+        from proc_reader import ProcfsSnapshotEngine
+
+        self._reader = ProcfsSnapshotEngine() if ProcfsSnapshotEngine.is_available() else None
+        self._processes: Dict[int, psutil.Process] = {}
+        # pid -> (start time, total cpu seconds, monotonic timestamp)
+        self._previous: Dict[int, Tuple[float, float, float]] = {}
+
+    def _read(
+        self, pid: int, processes: Dict[int, psutil.Process]
+    ) -> Optional[Tuple[float, float, int]]:
+        if self._reader is not None:
+            return self._reader.read_usage(pid)
+
+        proc = self._processes.get(pid) or processes.get(pid)
+        try:
+            if proc is None:
+                proc = psutil.Process(pid)
+            with proc.oneshot():
+                times = proc.cpu_times()
+                usage = (proc.create_time(), times.user + times.system, proc.memory_info().rss)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+        self._processes[pid] = proc
+        return usage
+
+    def sample(
+        self,
+        pids: Iterable[int],
+        total_memory: float,
+        processes: Optional[Dict[int, psutil.Process]] = None,
+    ) -> Dict[int, Tuple[float, float]]:
+        """Return ``{pid: (cpu %, memory %)}`` for the PIDs that could be read."""
+        processes = processes or {}
+        total_memory = float(total_memory) or 1.0
+        previous = self._previous
+        current: Dict[int, Tuple[float, float, float]] = {}
+        result: Dict[int, Tuple[float, float]] = {}
+
+        for pid in pids:
+            usage = self._read(pid, processes)
+            if usage is None:
+                continue
+            start_time, cpu_total, rss = usage
+            now = time.monotonic()
+            current[pid] = (start_time, cpu_total, now)
+            cpu = 0.0
+            last = previous.get(pid)
+            if last is not None and last[0] == start_time and now > last[2]:
+                cpu = max(cpu_total - last[1], 0.0) / (now - last[2]) * 100.0
+            result[pid] = (cpu, rss / total_memory * 100.0)
+
+        self._previous = current
+        for pid in set(self._processes) - set(current):
+            del self._processes[pid]
+        return result
 
 
 class DataCollector(QtCore.QObject):
     """Coordinates background data collection using Qt threads/signals."""
 
-    data_ready = QtCore.pyqtSignal(dict)
+    # Carries a recycled MetricsPayload that is only valid during delivery
+    data_ready = QtCore.pyqtSignal(object)
+    # Emitted with each Alert before the payload that fired it
+    alert_raised = QtCore.pyqtSignal(object)
     _selected_pid_changed = QtCore.pyqtSignal(object)
-    _process_cache_changed = QtCore.pyqtSignal(object)
+    _watch_pids_changed = QtCore.pyqtSignal(object)
+    _alert_rules_changed = QtCore.pyqtSignal(object)
+    _visibility_changed = QtCore.pyqtSignal(bool)
+    _refresh_requested = QtCore.pyqtSignal()
+    _cost_reported = QtCore.pyqtSignal(float, float)
     _stop_requested = QtCore.pyqtSignal()
 
-    def __init__(self) -> None:
+    def __init__(self, backend: str = "psutil", adaptive: bool = True) -> None:
         super().__init__()
         self._thread = QtCore.QThread(self)
-        self._worker = _MetricsWorker()
+        self._payloads = PayloadBuffer()
+        self._worker = _MetricsWorker(self._payloads, adaptive)
         self._worker.moveToThread(self._thread)
         self._thread.started.connect(self._worker.start)
         self._thread.finished.connect(self._worker.deleteLater)
-        self._worker.data_ready.connect(self.data_ready)
+        self._worker.data_ready.connect(self._deliver)
 
         self._selected_pid_changed.connect(self._worker.set_selected_pid)
-        self._process_cache_changed.connect(self._worker.update_process_cache)
+        self._watch_pids_changed.connect(self._worker.set_watch_pids)
+        self._alert_rules_changed.connect(self._worker.set_alert_rules)
+        self._visibility_changed.connect(self._worker.set_visible)
+        self._refresh_requested.connect(self._worker.request_process_refresh)
+        self._cost_reported.connect(self._worker.add_cost)
         self._stop_requested.connect(self._worker.stop)
 
         self.process_cache: Dict[int, psutil.Process] = {}
         self.selected_pid: Optional[int] = None
+        self._snapshot_engine = _create_snapshot_engine(backend)
+
+        # Watch set: explicit PIDs plus processes whose name or command line
+        # matches ``watch_pattern``, resolved on every process list refresh.
+        self.watch_pids: Set[int] = set()
+        self.watch_pattern: Optional[re.Pattern] = None
+        self.watched: FrozenSet[int] = frozenset()
+        # Command lines, paths and start times never change, so they are read
+        # once per process; the cache is pruned to the live processes on every
+        # process list refresh.
+        self.process_info = ProcessInfoCache()
+        self._create_times: Dict[int, float] = {}
+        # Heaviest processes over the last 1, 5 and 15 minutes
+        self.top_consumers = TopConsumers()
+        # Rules are evaluated by the metrics worker on every sample
+        self.alert_rules: Tuple[AlertRule, ...] = ()
+        self.alert_log: Deque[Alert] = collections.deque(maxlen=ALERT_LOG_SIZE)
 
     def start(self) -> None:
         if self._thread.isRunning():
@@ -124,57 +287,252 @@ class DataCollector(QtCore.QObject):
         self.selected_pid = pid if pid else None
         self._selected_pid_changed.emit(self.selected_pid)
 
+    def _deliver(self, payload: MetricsPayload) -> None:
+        # Receivers live in this thread and run synchronously, so the payload
+        # can go back to the worker as soon as emit() returns.
+        try:
+            for alert in payload.alerts:
+                self.alert_log.append(alert)
+                self.alert_raised.emit(alert)
+            self.data_ready.emit(payload)
+        finally:
+            self._payloads.release(payload)
+
     def update_process_cache(self, processes: Dict[int, psutil.Process]) -> None:
         self.process_cache = processes
-        self._process_cache_changed.emit(self.process_cache)
+        self._worker.processes = processes
 
     def get_process(self, pid: int) -> Optional[psutil.Process]:
         return self.process_cache.get(pid)
 
-    @staticmethod
-    def collect_process_list() -> Tuple[List[dict], Dict[int, psutil.Process]]:
-        """Collect process information returning both list and process objects."""
-        process_list: List[dict] = []
-        process_objects: Dict[int, psutil.Process] = {}
+    def set_visible(self, visible: bool) -> None:
+        """Tell the scheduler whether anyone is looking at the data."""
+        self._visibility_changed.emit(visible)
+
+    def request_process_refresh(self) -> None:
+        """Refresh the process list on the next tick instead of waiting a period."""
+        self._refresh_requested.emit()
+
+    def set_watch(self, pids: Iterable[int], pattern: Optional[str] = None) -> None:
+        """Watch ``pids`` and every process matching the regular expression ``pattern``.
+
+        Pattern matches are picked up by the next ``collect_process_list``.
+        Raises ``re.error`` for an invalid pattern.
+        """
+        self.watch_pattern = re.compile(pattern, re.IGNORECASE) if pattern else None
+        self.watch_pids = set(pids)
+        self._publish_watch_set(self.watch_pids)
+
+    def _publish_watch_set(self, pids: Iterable[int]) -> None:
+        self.watched = frozenset(pids)
+        self._watch_pids_changed.emit(self.watched)
+
+    def set_alert_rules(self, lines: Iterable[str]) -> Tuple[AlertRule, ...]:
+        """Replace the alert rules with one rule per line of ``lines``.
+
+        Raises ``ValueError`` for an invalid rule, keeping the current rules.
+        """
+        self.alert_rules = tuple(parse_rules(lines))
+        self._alert_rules_changed.emit(self.alert_rules)
+        return self.alert_rules
+
+    def cmdline(self, pid: int, processes: Optional[Dict[int, psutil.Process]] = None) -> str:
+        """Return the command line of ``pid``, or "" if it cannot be read."""
+        return self.process_info.cmdline(
+            pid, self._create_times.get(pid, 0.0), (processes or self.process_cache).get(pid)
+        )
 
-        # Pre-call cpu_percent to prepare for the next interval
-        for proc in _safe_process_iter(["pid"]):
-            try:
-                proc.cpu_percent(interval=None)
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
+    def cached_process_info(self, pid: int) -> Optional[ProcessInfo]:
+        """Return what is already known about ``pid`` without blocking."""
+        return self.process_info.get(pid, self._create_times.get(pid, 0.0))
 
-        # Small delay to let CPU measurements accumulate
-        time.sleep(0.1)
+    def fetch_process_info(self, pid: int) -> ProcessInfo:
+        """Read the static attributes of ``pid``; blocks, so call it from a worker."""
+        return self.process_info.fetch(
+            pid, self._create_times.get(pid, 0.0), self.process_cache.get(pid)
+        )
+
+    def run_process_action(
+        self, action: str, pids: Iterable[int], nice: Optional[int] = None
+    ) -> ActionResult:
+        """Terminate, kill, suspend, resume or renice ``pids``; blocks, so call it from a worker.
+
+        Processes are matched by start time as of the last process list, so a
+        PID reused since then is left alone.
+        """
+        create_times = self._create_times
+        processes = self.process_cache
+        return run_action(
+            action,
+            [(pid, create_times.get(pid, 0.0), processes.get(pid)) for pid in pids],
+            nice,
+        )
 
-        for proc in _safe_process_iter(
-            ["pid", "name", "cpu_percent", "memory_percent", "num_threads", "status"]
+    def _match_watch_pattern(
+        self, snapshot: ProcessSnapshot, processes: Dict[int, psutil.Process]
+    ) -> Set[int]:
+        pattern = self.watch_pattern
+        if pattern is None:
+            return set()
+
+        matched = set()
+        for pid, name in zip(snapshot.pids, snapshot.names):
+            if pattern.search(name):
+                matched.add(pid)
+                continue
+            cmdline = self.cmdline(pid, processes)
+            if cmdline and pattern.search(cmdline):
+                matched.add(pid)
+        return matched
+
+    def collect_process_list(self) -> Tuple[ProcessSnapshot, Dict[int, psutil.Process]]:
+        """Collect process information returning a snapshot and process objects."""
+        started = time.perf_counter()
+        snapshot, processes = self._snapshot_engine.collect()
+        self._create_times = dict(zip(snapshot.pids, snapshot.create_times))
+        self.process_info.prune(self._create_times.items())
+        self.top_consumers.add_snapshot(snapshot)
+        if self.watch_pattern is not None:
+            self._publish_watch_set(self.watch_pids | self._match_watch_pattern(snapshot, processes))
+        # Counted against the scheduler's overhead budget
+        self._cost_reported.emit(time.time(), time.perf_counter() - started)
+        return snapshot, processes
+
+
+class ProcessSnapshot:
+    """Columnar process table produced by a single collection cycle.
+
+    Numeric columns are typed arrays rather than lists, so a 10k row
+    snapshot holds its numbers unboxed in a handful of buffers instead of
+    tens of thousands of int and float objects.
+    """
+
+    __slots__ = (
+        "timestamp", "pids", "names", "cpu", "memory", "threads", "status", "ppids", "create_times"
+    )
+
+    def __init__(self, timestamp: float = 0.0) -> None:
+        self.timestamp = timestamp
+        self.pids = array("q")
+        self.names: List[str] = []
+        self.cpu = array("d")
+        self.memory = array("d")
+        self.threads = array("l")
+        self.status: List[str] = []
+        # Parent PIDs and start times; 0 when unknown (e.g. snapshots read
+        # from a recording)
+        self.ppids = array("q")
+        self.create_times = array("d")
+
+    def __len__(self) -> int:
+        return len(self.pids)
+
+    def append(
+        self,
+        pid: int,
+        name: str,
+        cpu: float,
+        memory: float,
+        threads: int,
+        status: str,
+        ppid: int = 0,
+        create_time: float = 0.0,
+    ) -> None:
+        self.pids.append(pid)
+        self.names.append(name)
+        self.cpu.append(cpu)
+        self.memory.append(memory)
+        self.threads.append(threads)
+        self.status.append(status)
+        self.ppids.append(ppid)
+        self.create_times.append(create_time)
+
+    def rows(self) -> Iterable[Tuple[int, str, float, float, int, str]]:
+        """Iterate over ``(pid, name, cpu, memory, threads, status)`` tuples."""
+        return zip(self.pids, self.names, self.cpu, self.memory, self.threads, self.status)
+
+    def without(self, pids: Iterable[int]) -> ProcessSnapshot:
+        """Return a copy without the rows of ``pids``."""
+        pids = set(pids)
+        copy = ProcessSnapshot(self.timestamp)
+        for row in zip(
+            self.pids, self.names, self.cpu, self.memory, self.threads, self.status,
+            self.ppids, self.create_times,
         ):
+            if row[0] not in pids:
+                copy.append(*row)
+        return copy
+
+
+class _SnapshotEngine:
+    """Reads every process once per cycle and derives CPU % from cpu_times deltas.
+
+    Attributes are read inside ``oneshot()`` straight into the snapshot
+    columns; ``process_iter(attrs)`` would build an info dict per process.
+    """
+
+    def __init__(self) -> None:
+        # pid -> (create_time, total cpu seconds, monotonic timestamp)
+        self._previous: Dict[int, Tuple[float, float, float]] = {}
+
+    def collect(self) -> Tuple[ProcessSnapshot, Dict[int, psutil.Process]]:
+        snapshot = ProcessSnapshot(time.time())
+        process_objects: Dict[int, psutil.Process] = {}
+        current: Dict[int, Tuple[float, float, float]] = {}
+        previous = self._previous
+        total_memory = float(psutil.virtual_memory().total) or 1.0
+
+        for proc in psutil.process_iter():
             try:
-                info = proc.info
-                pid = info["pid"]
-                process_list.append(
-                    {
-                        "pid": pid,
-                        "name": info["name"],
-                        "cpu": info["cpu_percent"],
-                        "memory": info["memory_percent"],
-                        "threads": info["num_threads"],
-                        "status": info["status"],
-                    }
-                )
-                process_objects[pid] = proc
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                with proc.oneshot():
+                    pid = proc.pid
+                    create_time = _read_attr(proc.create_time, 0.0)
+                    times = _read_attr(proc.cpu_times, None)
+                    mem_info = _read_attr(proc.memory_info, None)
+                    name = _read_attr(proc.name, "")
+                    threads = _read_attr(proc.num_threads, 0)
+                    status = _read_attr(proc.status, "?")
+                    ppid = _read_attr(proc.ppid, 0)
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
                 continue
 
-        return process_list, process_objects
+            now = time.monotonic()
+            cpu = 0.0
+            if times is not None:
+                cpu_total = times.user + times.system
+                current[pid] = (create_time, cpu_total, now)
+                last = previous.get(pid)
+                if last is not None and last[0] == create_time and now > last[2]:
+                    cpu = max(cpu_total - last[1], 0.0) / (now - last[2]) * 100.0
 
+            memory = mem_info.rss / total_memory * 100.0 if mem_info is not None else 0.0
 
-def _safe_process_iter(attrs: Iterable[str]) -> Iterable[psutil.Process]:
-    """Yield processes while gracefully ignoring access-related exceptions."""
+            snapshot.append(pid, name, cpu, memory, threads, status, ppid, create_time)
+            process_objects[pid] = proc
 
-    for proc in psutil.process_iter(attrs):
-        try:
-            yield proc
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            continue
+        self._previous = current
+        return snapshot, process_objects
+
+
+def _create_snapshot_engine(backend: str):
+    """Return the snapshot engine for ``backend`` ("psutil", "procfs" or "auto")."""
+    if backend == "psutil":
+        return _SnapshotEngine()
+    if backend not in ("procfs", "auto"):
+        raise ValueError(f"Unknown process backend: {backend}")
+
+    from proc_reader import ProcfsSnapshotEngine
+
+    if ProcfsSnapshotEngine.is_available():
+        return ProcfsSnapshotEngine()
+    if backend == "auto":
+        return _SnapshotEngine()
+    raise RuntimeError("The procfs backend requires a readable /proc filesystem")
+
+
+def _read_attr(getter, default):
+    """Call a psutil.Process getter, returning ``default`` if access is denied."""
+    try:
+        return getter()
+    except psutil.AccessDenied:
+        return default
@@ -0,0 +1,197 @@
+"""Streaming CSV and Parquet export of metric history and process snapshots.
+
+Rows are written in chunks of :data:`CHUNK_ROWS`, so memory use depends on
+the chunk size and not on how much history is exported. The format follows
+the file name: ``.csv``, ``.csv.gz`` or ``.parquet`` (which needs pyarrow).
+Exports go to a ``.part`` file that is renamed once complete, so an
+interrupted export never leaves a truncated file behind.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from data_collector import ProcessSnapshot
+from metric_log import MetricLogError, MetricLogReader
+from series_store import SeriesStore
+
+# Rows per written chunk (and per Parquet row group)
+CHUNK_ROWS = 65536
+
+PROCESS_COLUMNS = ("timestamp", "pid", "name", "cpu", "memory", "threads", "status")
+
+# File dialog filter per supported format
+FILE_FILTERS = "CSV (*.csv);;Compressed CSV (*.csv.gz);;Parquet (*.parquet)"
+
+
+class ExportError(Exception):
+    """Raised when an export cannot be written."""
+
+
+class _CsvTable:
+    def __init__(self, path: str, columns: Sequence[str], compressed: bool = False) -> None:
+        if compressed:
+            self._file = gzip.open(path, "wt", newline="", encoding="utf-8")
+        else:
+            self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, columns: Sequence[list]) -> None:
+        self._writer.writerows(zip(*columns))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetTable:
+    def __init__(self, path: str, columns: Sequence[str]) -> None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as exc:
+            raise ExportError("Parquet export needs pyarrow (pip install pyarrow)") from exc
+        self._pa = pyarrow
+        self._parquet = pyarrow.parquet
+        self._path = path
+        self._columns = tuple(columns)
+        self._writer = None
+
+    def write(self, columns: Sequence[list]) -> None:
+        table = self._pa.table(dict(zip(self._columns, columns)))
+        if self._writer is None:
+            self._writer = self._parquet.ParquetWriter(self._path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is None:
+            # Nothing was written; still leave a valid, empty file
+            self.write([[] for _ in self._columns])
+        self._writer.close()
+
+
+class _Export:
+    """Writes chunks to ``path + ".part"`` and moves it into place on success."""
+
+    def __init__(self, path: str, columns: Sequence[str]) -> None:
+        self.path = path
+        self.rows = 0
+        self._part = path + ".part"
+        try:
+            if path.endswith(".parquet"):
+                self._table = _ParquetTable(self._part, columns)
+            else:
+                self._table = _CsvTable(self._part, columns, compressed=path.endswith(".gz"))
+        except OSError as exc:
+            raise ExportError(f"Cannot write {path}: {exc}") from exc
+
+    def __enter__(self) -> _Export:
+        return self
+
+    def write(self, columns: Sequence[list]) -> None:
+        if columns and len(columns[0]):
+            self._table.write(columns)
+            self.rows += len(columns[0])
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        try:
+            self._table.close()
+        finally:
+            if exc_type is None:
+                os.replace(self._part, self.path)
+            else:
+                try:
+                    os.remove(self._part)
+                except OSError:
+                    pass
+
+
+def copy_history(store: SeriesStore) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Copy the raw series out of ``store``; call it on the thread that appends to it.
+
+    The store is a fixed-size ring, so the copy is bounded by its retention.
+    """
+    count = len(store)
+    timestamps = np.array(store.latest_timestamps(count))
+    return timestamps, {name: np.array(store.latest(name, count)) for name in store.names}
+
+
+def export_series(
+    path: str,
+    timestamps: np.ndarray,
+    series: Dict[str, np.ndarray],
+    chunk_rows: int = CHUNK_ROWS,
+) -> int:
+    """Write ``timestamp`` plus one column per series; returns the row count."""
+    names = list(series)
+    with _Export(path, ["timestamp"] + names) as export:
+        for start in range(0, len(timestamps), chunk_rows):
+            end = start + chunk_rows
+            export.write(
+                [timestamps[start:end].tolist()]
+                + [np.round(series[name][start:end], 2).tolist() for name in names]
+            )
+    return export.rows
+
+
+def export_snapshots(
+    path: str,
+    snapshots: Iterable[ProcessSnapshot],
+    chunk_rows: int = CHUNK_ROWS,
+    cancelled: Optional[Callable[[], bool]] = None,
+) -> int:
+    """Write one row per process and snapshot; returns the row count.
+
+    ``snapshots`` is consumed lazily, so a generator keeps only one
+    snapshot and one chunk of rows in memory. ``cancelled`` is polled
+    between snapshots; an export that is cancelled raises ExportError.
+    """
+    with _Export(path, PROCESS_COLUMNS) as export:
+        chunk: List[list] = [[] for _ in PROCESS_COLUMNS]
+        timestamps, pids, names, cpu, memory, threads, status = chunk
+        for snapshot in snapshots:
+            if cancelled is not None and cancelled():
+                raise ExportError("Export cancelled")
+            timestamps.extend([snapshot.timestamp] * len(snapshot))
+            pids.extend(snapshot.pids)
+            names.extend(snapshot.names)
+            cpu.extend(snapshot.cpu)
+            memory.extend(snapshot.memory)
+            threads.extend(snapshot.threads)
+            status.extend(snapshot.status)
+            if len(pids) >= chunk_rows:
+                export.write(chunk)
+                for column in chunk:
+                    column.clear()
+        export.write(chunk)
+    return export.rows
+
+
+def export_recording(
+    log_path: str,
+    path: str,
+    table: str = "processes",
+    cancelled: Optional[Callable[[], bool]] = None,
+) -> int:
+    """Export the ``samples`` or ``processes`` of a metric log; returns the row count."""
+    try:
+        reader = MetricLogReader(log_path)
+    except (OSError, MetricLogError) as exc:
+        raise ExportError(f"Cannot open recording: {exc}") from exc
+    try:
+        if table == "samples":
+            return export_series(
+                path,
+                reader.sample_times,
+                {"cpu": reader.sample_cpu, "mem": reader.sample_mem},
+            )
+        if table == "processes":
+            return export_snapshots(path, reader.snapshots(), cancelled=cancelled)
+        raise ExportError(f"Unknown table {table!r}; expected samples or processes")
+    finally:
+        reader.close()
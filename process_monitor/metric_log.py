@@ -0,0 +1,413 @@
+"""Append-only binary log of system metrics and process snapshots.
+
+A log is a sequence of blocks::
+
+    <u16 type> <u16 flags> <u32 payload length> payload <u32 block length>
+
+The trailing block length lets a reader walk the file backwards from its
+end. Block types:
+
+``HEADER``
+    Magic, format version and creation time. Always the first block.
+``STRINGS``
+    New entries of the string table (process names and states), written
+    just before the first snapshot that uses them.
+``SAMPLE``
+    One fixed-width system metrics sample.
+``KEYFRAME``
+    A full process snapshot as an array of fixed-width records.
+``DELTA``
+    Records that changed since the previous snapshot plus exited PIDs.
+``INDEX``
+    Directory of every block written since the previous index, plus the
+    offset of that index, so a reader can find all blocks without
+    touching their payloads.
+
+Snapshots are written as deltas between periodic keyframes, which keeps a
+recording of thousands of mostly idle processes small, and lets a reader
+reconstruct any point in time by replaying at most one keyframe interval.
+"""
+
+from __future__ import annotations
+
+import bisect
+import mmap
+import struct
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from data_collector import ProcessSnapshot
+
+MAGIC = b"PMONLOG\0"
+VERSION = 1
+
+HEADER, STRINGS, SAMPLE, KEYFRAME, DELTA, INDEX = range(1, 7)
+
+_BLOCK_HEADER = struct.Struct("<HHI")
+_BLOCK_TRAILER = struct.Struct("<I")
+_FILE_HEADER = struct.Struct("<8sId")
+_SAMPLE = struct.Struct("<dff")
+_SNAPSHOT_HEADER = struct.Struct("<dII")
+_INDEX_HEADER = struct.Struct("<qI")
+_STRING_ENTRY = struct.Struct("<IH")
+_BLOCK_OVERHEAD = _BLOCK_HEADER.size + _BLOCK_TRAILER.size
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("pid", "<u4"),
+        ("name", "<u4"),
+        ("cpu", "<f4"),
+        ("memory", "<f4"),
+        ("threads", "<u2"),
+        ("status", "<u2"),
+    ]
+)
+INDEX_DTYPE = np.dtype(
+    [("timestamp", "<f8"), ("offset", "<u8"), ("type", "u1"), ("_pad", "V7")]
+)
+
+
+class MetricLogError(Exception):
+    """Raised when a metric log cannot be read."""
+
+
+class MetricLogWriter:
+    """Writes samples and process snapshots to a new metric log."""
+
+    def __init__(
+        self, path: str, keyframe_interval: int = 120, index_interval: float = 60.0
+    ) -> None:
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.index_interval = index_interval
+        self._file = open(path, "wb")
+        self._offset = 0
+        self._directory: List[Tuple[float, int, int]] = []
+        self._last_index_offset = -1
+        self._last_index_time: Optional[float] = None
+        self._strings: Dict[str, int] = {}
+        self._previous: Dict[int, tuple] = {}
+        self._since_keyframe = 0
+        created = time.time()
+        self._write_block(HEADER, _FILE_HEADER.pack(MAGIC, VERSION, created), created)
+
+    def _write_block(self, block_type: int, payload: bytes, timestamp: float) -> None:
+        offset = self._offset
+        self._file.write(_BLOCK_HEADER.pack(block_type, 0, len(payload)))
+        self._file.write(payload)
+        self._file.write(_BLOCK_TRAILER.pack(len(payload) + _BLOCK_OVERHEAD))
+        self._offset += len(payload) + _BLOCK_OVERHEAD
+        if block_type not in (HEADER, INDEX):
+            self._directory.append((timestamp, offset, block_type))
+
+    def _string_id(self, value: str, new_strings: List[Tuple[int, bytes]]) -> int:
+        string_id = self._strings.get(value)
+        if string_id is None:
+            string_id = self._strings[value] = len(self._strings)
+            new_strings.append((string_id, value.encode("utf-8")[:0xFFFF]))
+        return string_id
+
+    def write_sample(self, timestamp: float, system_cpu: float, system_mem: float) -> None:
+        self._write_block(SAMPLE, _SAMPLE.pack(timestamp, system_cpu, system_mem), timestamp)
+        self._maybe_write_index(timestamp)
+
+    def write_snapshot(self, snapshot: ProcessSnapshot) -> None:
+        """Append ``snapshot`` as a keyframe or as a delta to the previous one."""
+        new_strings: List[Tuple[int, bytes]] = []
+        current: Dict[int, tuple] = {}
+        for pid, name, cpu, memory, threads, status in snapshot.rows():
+            current[pid] = (
+                pid,
+                self._string_id(name, new_strings),
+                round(cpu, 1),
+                round(memory, 1),
+                min(threads, 0xFFFF),
+                self._string_id(status, new_strings),
+            )
+
+        if new_strings:
+            payload = bytearray(struct.pack("<I", len(new_strings)))
+            for string_id, encoded in new_strings:
+                payload += _STRING_ENTRY.pack(string_id, len(encoded)) + encoded
+            self._write_block(STRINGS, bytes(payload), snapshot.timestamp)
+
+        keyframe = self._since_keyframe == 0
+        if keyframe:
+            changed = list(current.values())
+            removed: List[int] = []
+        else:
+            previous = self._previous
+            changed = [row for pid, row in current.items() if previous.get(pid) != row]
+            removed = [pid for pid in previous if pid not in current]
+
+        records = np.array(changed, dtype=RECORD_DTYPE) if changed else np.empty(0, RECORD_DTYPE)
+        payload = (
+            _SNAPSHOT_HEADER.pack(snapshot.timestamp, len(changed), len(removed))
+            + records.tobytes()
+            + np.asarray(removed, dtype="<u4").tobytes()
+        )
+        self._write_block(KEYFRAME if keyframe else DELTA, payload, snapshot.timestamp)
+
+        self._previous = current
+        self._since_keyframe = (self._since_keyframe + 1) % self.keyframe_interval
+        self._maybe_write_index(snapshot.timestamp)
+        self._file.flush()
+
+    def _maybe_write_index(self, timestamp: float) -> None:
+        if self._last_index_time is None:
+            self._last_index_time = timestamp
+        elif timestamp - self._last_index_time >= self.index_interval:
+            self.write_index()
+            self._last_index_time = timestamp
+
+    def write_index(self) -> None:
+        """Write an index block covering every block since the previous one."""
+        if not self._directory:
+            return
+        entries = np.zeros(len(self._directory), dtype=INDEX_DTYPE)
+        timestamps, offsets, types = zip(*self._directory)
+        entries["timestamp"] = timestamps
+        entries["offset"] = offsets
+        entries["type"] = types
+        offset = self._offset
+        payload = _INDEX_HEADER.pack(self._last_index_offset, len(entries)) + entries.tobytes()
+        self._write_block(INDEX, payload, timestamps[-1])
+        self._last_index_offset = offset
+        self._directory = []
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.write_index()
+        self._file.close()
+
+
+class MetricLogReader:
+    """Memory-maps a metric log for random access to samples and snapshots."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:  # empty file
+            self._file.close()
+            raise MetricLogError(f"{path} is not a metric log") from exc
+
+        try:
+            block_type, _flags, length = _BLOCK_HEADER.unpack_from(self._map, 0)
+            magic, version, _created = _FILE_HEADER.unpack_from(self._map, _BLOCK_HEADER.size)
+        except struct.error:
+            block_type, magic = None, None
+        if block_type != HEADER or magic != MAGIC:
+            self.close()
+            raise MetricLogError(f"{path} is not a metric log")
+        if version != VERSION:
+            self.close()
+            raise MetricLogError(f"Unsupported metric log version {version}")
+        self._data_start = length + _BLOCK_OVERHEAD
+
+        self._directory = self._read_directory()
+        self.strings: List[str] = []
+        for offset in self._offsets(STRINGS):
+            self._read_strings(int(offset))
+
+        sample_offsets = self._offsets(SAMPLE)
+        samples = np.empty(len(sample_offsets), dtype=[("t", "<f8"), ("cpu", "<f4"), ("mem", "<f4")])
+        for i, offset in enumerate(sample_offsets):
+            samples[i] = _SAMPLE.unpack_from(self._map, int(offset) + _BLOCK_HEADER.size)
+        self.sample_times = samples["t"]
+        self.sample_cpu = samples["cpu"].astype(np.float64)
+        self.sample_mem = samples["mem"].astype(np.float64)
+
+        snapshots = self._directory[np.isin(self._directory["type"], (KEYFRAME, DELTA))]
+        self._snapshot_times = snapshots["timestamp"]
+        self._snapshot_offsets = snapshots["offset"]
+        self._snapshot_types = snapshots["type"]
+        self._keyframes = np.flatnonzero(self._snapshot_types == KEYFRAME)
+        self._cursor: Optional[Tuple[int, Dict[int, tuple]]] = None
+
+    # ------------------------------------------------------------------
+    # Directory
+    # ------------------------------------------------------------------
+    def _read_directory(self) -> np.ndarray:
+        try:
+            return self._read_directory_from_index()
+        except (MetricLogError, struct.error):
+            # Missing or damaged index (e.g. the recorder was killed while
+            # writing one); fall back to walking every block header.
+            return self._scan_directory()
+
+    def _block_at(self, offset: int) -> Tuple[int, int]:
+        """Return ``(type, payload length)`` of the block at ``offset`` after validating it."""
+        block_type, _flags, length = _BLOCK_HEADER.unpack_from(self._map, offset)
+        end = offset + length + _BLOCK_OVERHEAD
+        if end > len(self._map) or _BLOCK_TRAILER.unpack_from(self._map, end - 4)[0] != end - offset:
+            raise MetricLogError(f"Corrupt block at offset {offset}")
+        return block_type, length
+
+    def _read_directory_from_index(self) -> np.ndarray:
+        # Walk back from the end to the newest index, collecting the blocks
+        # written after it.
+        tail: List[Tuple[float, int, int]] = []
+        position = len(self._map)
+        index_offset = -1
+        while position > self._data_start:
+            size = _BLOCK_TRAILER.unpack_from(self._map, position - 4)[0]
+            offset = position - size
+            if offset < self._data_start:
+                raise MetricLogError("Corrupt block trailer")
+            block_type, _length = self._block_at(offset)
+            if block_type == INDEX:
+                index_offset = offset
+                break
+            tail.append((self._block_time(offset, block_type), offset, block_type))
+            position = offset
+
+        parts = []
+        while index_offset >= 0:
+            block_type, _length = self._block_at(index_offset)
+            if block_type != INDEX:
+                raise MetricLogError(f"Expected an index block at {index_offset}")
+            payload = index_offset + _BLOCK_HEADER.size
+            previous, count = _INDEX_HEADER.unpack_from(self._map, payload)
+            parts.append(
+                np.frombuffer(
+                    self._map, INDEX_DTYPE, count, payload + _INDEX_HEADER.size
+                )
+            )
+            index_offset = previous
+
+        parts.reverse()
+        tail_entries = np.zeros(len(tail), dtype=INDEX_DTYPE)
+        if tail:
+            tail.reverse()
+            tail_entries["timestamp"], tail_entries["offset"], tail_entries["type"] = zip(*tail)
+        parts.append(tail_entries)
+        return np.concatenate(parts)
+
+    def _scan_directory(self) -> np.ndarray:
+        entries = []
+        offset = self._data_start
+        while offset + _BLOCK_OVERHEAD <= len(self._map):
+            try:
+                block_type, length = self._block_at(offset)
+            except MetricLogError:
+                break  # truncated final block
+            if block_type != INDEX:
+                entries.append((self._block_time(offset, block_type), offset, block_type))
+            offset += length + _BLOCK_OVERHEAD
+
+        directory = np.zeros(len(entries), dtype=INDEX_DTYPE)
+        if entries:
+            directory["timestamp"], directory["offset"], directory["type"] = zip(*entries)
+        return directory
+
+    def _block_time(self, offset: int, block_type: int) -> float:
+        if block_type in (SAMPLE, KEYFRAME, DELTA):
+            return struct.unpack_from("<d", self._map, offset + _BLOCK_HEADER.size)[0]
+        return 0.0
+
+    def _offsets(self, block_type: int) -> np.ndarray:
+        return self._directory["offset"][self._directory["type"] == block_type]
+
+    def _read_strings(self, offset: int) -> None:
+        position = offset + _BLOCK_HEADER.size
+        (count,) = struct.unpack_from("<I", self._map, position)
+        position += 4
+        for _ in range(count):
+            string_id, length = _STRING_ENTRY.unpack_from(self._map, position)
+            position += _STRING_ENTRY.size
+            value = self._map[position:position + length].decode("utf-8", "replace")
+            position += length
+            if string_id >= len(self.strings):
+                self.strings.extend([""] * (string_id + 1 - len(self.strings)))
+            self.strings[string_id] = value
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    @property
+    def start_time(self) -> float:
+        times = [t[0] for t in (self.sample_times, self._snapshot_times) if len(t)]
+        return min(times) if times else 0.0
+
+    @property
+    def end_time(self) -> float:
+        times = [t[-1] for t in (self.sample_times, self._snapshot_times) if len(t)]
+        return max(times) if times else 0.0
+
+    @property
+    def snapshot_count(self) -> int:
+        return len(self._snapshot_times)
+
+    def _apply(self, index: int, rows: Dict[int, tuple]) -> None:
+        offset = int(self._snapshot_offsets[index]) + _BLOCK_HEADER.size
+        _timestamp, changed, removed = _SNAPSHOT_HEADER.unpack_from(self._map, offset)
+        offset += _SNAPSHOT_HEADER.size
+        records = np.frombuffer(self._map, RECORD_DTYPE, changed, offset)
+        if self._snapshot_types[index] == KEYFRAME:
+            rows.clear()
+        rows.update(zip(records["pid"].tolist(), records.tolist()))
+        if removed:
+            offset += changed * RECORD_DTYPE.itemsize
+            for pid in np.frombuffer(self._map, "<u4", removed, offset).tolist():
+                rows.pop(pid, None)
+
+    def snapshot_at(self, timestamp: float) -> Optional[ProcessSnapshot]:
+        """Return the process table as recorded at or before ``timestamp``."""
+        index = bisect.bisect_right(self._snapshot_times, timestamp) - 1
+        if index < 0:
+            return None
+
+        # Continue from the previous position when scrubbing forward within
+        # the same keyframe interval; otherwise replay from the keyframe.
+        keyframe = int(self._keyframes[np.searchsorted(self._keyframes, index, "right") - 1])
+        if self._cursor is not None and keyframe <= self._cursor[0] <= index:
+            position, rows = self._cursor
+            start = position + 1
+        else:
+            rows = {}
+            start = keyframe
+        for position in range(start, index + 1):
+            self._apply(position, rows)
+        self._cursor = (index, rows)
+
+        return self._snapshot(index, rows)
+
+    def _snapshot(self, index: int, rows: Dict[int, tuple]) -> ProcessSnapshot:
+        snapshot = ProcessSnapshot(float(self._snapshot_times[index]))
+        strings = self.strings
+        for pid, name, cpu, memory, threads, status in rows.values():
+            snapshot.append(pid, strings[name], round(cpu, 1), round(memory, 1), threads, strings[status])
+        return snapshot
+
+    def snapshots(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Iterator[ProcessSnapshot]:
+        """Yield every snapshot recorded between ``start`` and ``end`` in order.
+
+        Deltas are replayed one after another, so only the current process
+        table is held however long the recording is. Independent of the
+        :meth:`snapshot_at` cursor.
+        """
+        times = self._snapshot_times
+        first = 0 if start is None else bisect.bisect_left(times, start)
+        last = len(times) if end is None else bisect.bisect_right(times, end)
+        if first >= last:
+            return
+        keyframe = int(self._keyframes[np.searchsorted(self._keyframes, first, "right") - 1])
+        rows: Dict[int, tuple] = {}
+        for index in range(keyframe, last):
+            self._apply(index, rows)
+            if index >= first:
+                yield self._snapshot(index, rows)
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
@@ -0,0 +1,81 @@
+"""Reusable payloads handed from the metrics worker thread to the GUI thread."""
+
+from __future__ import annotations
+
+import collections
+from typing import Deque, Dict, List, Tuple
+
+from alerts import Alert
+from system_metrics import SystemSample
+
+
+class MetricsPayload:
+    """Everything one metrics tick produced.
+
+    Payloads are recycled: one is only valid while the ``data_ready``
+    signal carrying it is being delivered, so receivers copy what they keep.
+    """
+
+    __slots__ = (
+        "timestamp",
+        "system_cpu",
+        "system_mem",
+        "process_cpu",
+        "process_mem",
+        "watched",
+        "system",
+        "alerts",
+        "refresh_processes",
+        "mode",
+        "interval_ms",
+        "process_period_ms",
+        "overhead",
+        "budget",
+    )
+
+    def __init__(self) -> None:
+        self.timestamp = 0.0
+        self.system_cpu = 0.0
+        self.system_mem = 0.0
+        self.process_cpu = 0.0
+        self.process_mem = 0.0
+        # pid -> (cpu %, memory %) of the watched processes
+        self.watched: Dict[int, Tuple[float, float]] = {}
+        self.system = SystemSample()
+        # Alerts fired by this tick; the Alert objects themselves are new
+        self.alerts: List[Alert] = []
+        self.refresh_processes = False
+        # Scheduler state, see AdaptiveScheduler
+        self.mode = "normal"
+        self.interval_ms = 0
+        self.process_period_ms = 0
+        self.overhead = 0.0
+        self.budget = 0.0
+
+
+class PayloadBuffer:
+    """Double buffer of payloads between one writer and one reader thread.
+
+    The writer fills the payload returned by :meth:`acquire` and sends it
+    to the reader, which hands it back with :meth:`release` once delivered.
+    Two payloads alternate in the steady state; should the reader fall
+    behind, an extra payload is allocated rather than overwriting one that
+    is still queued. The free list is a deque, whose ``append`` and
+    ``popleft`` are atomic, so neither side takes a lock.
+    """
+
+    def __init__(self, size: int = 2) -> None:
+        self._free: Deque[MetricsPayload] = collections.deque(
+            MetricsPayload() for _ in range(size)
+        )
+        self.allocated = size
+
+    def acquire(self) -> MetricsPayload:
+        try:
+            return self._free.popleft()
+        except IndexError:
+            self.allocated += 1
+            return MetricsPayload()
+
+    def release(self, payload: MetricsPayload) -> None:
+        self._free.append(payload)
@@ -0,0 +1,158 @@
+"""Direct /proc reader used as an optional Linux backend for DataCollector."""
+
+from __future__ import annotations
+
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from data_collector import ProcessSnapshot
+
+# Single-letter states from /proc/[pid]/stat mapped to psutil status names.
+_STATUS_NAMES = {
+    "R": "running",
+    "S": "sleeping",
+    "D": "disk-sleep",
+    "T": "stopped",
+    "t": "tracing-stop",
+    "Z": "zombie",
+    "X": "dead",
+    "x": "dead",
+    "K": "wake-kill",
+    "W": "waking",
+    "I": "idle",
+    "P": "parked",
+}
+
+# Offsets into the whitespace separated fields that follow the ")" of comm.
+_STATE, _PPID, _UTIME, _STIME, _NUM_THREADS, _STARTTIME = 0, 1, 11, 12, 17, 19
+
+
+class ProcfsSnapshotEngine:
+    """Builds process snapshots by parsing /proc/[pid]/stat and statm directly.
+
+    Each file is read with ``os.readv`` into a buffer that is reused for every
+    process, so a collection cycle costs two small reads per PID and no
+    psutil objects. Process names come from ``comm`` and are therefore
+    truncated to 15 characters by the kernel.
+    """
+
+    def __init__(self, proc_root: str = "/proc") -> None:
+        self.proc_root = proc_root
+        self._buffer = bytearray(4096)
+        self._buffers = [self._buffer]
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+        self._clock_ticks = float(os.sysconf("SC_CLK_TCK"))
+        # pid -> (start time in ticks, total cpu seconds, monotonic timestamp)
+        self._previous: Dict[int, Tuple[int, float, float]] = {}
+        self._boot_time: Optional[float] = None
+
+    @staticmethod
+    def is_available(proc_root: str = "/proc") -> bool:
+        return os.path.isfile(os.path.join(proc_root, "self", "stat"))
+
+    def _read(self, path: str) -> int:
+        """Read ``path`` into the shared buffer and return the byte count.
+
+        A file that fills the buffer doubles it and is read on, so long files
+        such as /proc/stat on many-core hosts are always read to the end.
+        """
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            size = os.readv(fd, self._buffers)
+            while size == len(self._buffer):
+                self._buffer.extend(bytes(size))
+                with memoryview(self._buffer) as view:
+                    size += os.readv(fd, [view[size:]])
+            return size
+        finally:
+            os.close(fd)
+
+    def _total_memory(self) -> float:
+        size = self._read(os.path.join(self.proc_root, "meminfo"))
+        for line in bytes(self._buffer[:size]).splitlines():
+            if line.startswith(b"MemTotal:"):
+                return float(line.split()[1]) * 1024.0
+        return 1.0
+
+    def _read_boot_time(self) -> float:
+        size = self._read(os.path.join(self.proc_root, "stat"))
+        for line in bytes(self._buffer[:size]).splitlines():
+            if line.startswith(b"btime "):
+                return float(line.split()[1])
+        return 0.0
+
+    def _read_process(self, pid: int) -> Optional[Tuple[str, List[bytearray], int]]:
+        """Return ``(name, stat fields after comm, resident pages)`` for ``pid``."""
+        buffer = self._buffer
+        base = f"{self.proc_root}/{pid}/"
+        try:
+            size = self._read(base + "stat")
+            open_paren = buffer.find(b"(", 0, size)
+            close_paren = buffer.rfind(b")", 0, size)
+            name = buffer[open_paren + 1:close_paren].decode("utf-8", "replace")
+            fields = buffer[close_paren + 2:size].split()
+
+            size = self._read(base + "statm")
+            resident = int(buffer[:size].split()[1])
+        except (FileNotFoundError, ProcessLookupError, PermissionError, IndexError, ValueError):
+            return None
+        return name, fields, resident
+
+    def read_usage(self, pid: int) -> Optional[Tuple[int, float, int]]:
+        """Return ``(start time in ticks, cpu seconds, rss bytes)`` for ``pid``."""
+        process = self._read_process(pid)
+        if process is None:
+            return None
+        _name, fields, resident = process
+        return (
+            int(fields[_STARTTIME]),
+            (int(fields[_UTIME]) + int(fields[_STIME])) / self._clock_ticks,
+            resident * self._page_size,
+        )
+
+    def collect(self) -> Tuple[ProcessSnapshot, Dict]:
+        snapshot = ProcessSnapshot(time.time())
+        current: Dict[int, Tuple[int, float, float]] = {}
+        previous = self._previous
+        root = self.proc_root
+        page_size = self._page_size
+        clock_ticks = self._clock_ticks
+        total_memory = self._total_memory() or 1.0
+        if self._boot_time is None:
+            # Start times are converted the way psutil's create_time() does
+            self._boot_time = self._read_boot_time()
+        boot_time = self._boot_time
+
+        with os.scandir(root) as entries:
+            pids = [int(entry.name) for entry in entries if entry.name.isdigit()]
+
+        for pid in pids:
+            process = self._read_process(pid)
+            if process is None:
+                continue
+
+            name, fields, resident = process
+            now = time.monotonic()
+            start_time = int(fields[_STARTTIME])
+            cpu_total = (int(fields[_UTIME]) + int(fields[_STIME])) / clock_ticks
+            current[pid] = (start_time, cpu_total, now)
+            cpu = 0.0
+            last = previous.get(pid)
+            if last is not None and last[0] == start_time and now > last[2]:
+                cpu = max(cpu_total - last[1], 0.0) / (now - last[2]) * 100.0
+
+            state = fields[_STATE].decode("ascii", "replace")
+            snapshot.append(
+                pid,
+                name,
+                cpu,
+                resident * page_size / total_memory * 100.0,
+                int(fields[_NUM_THREADS]),
+                _STATUS_NAMES.get(state, state),
+                int(fields[_PPID]),
+                boot_time + start_time / clock_ticks,
+            )
+
+        self._previous = current
+        return snapshot, {}
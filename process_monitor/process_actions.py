@@ -0,0 +1,125 @@
+"""Signals and priority changes applied to a batch of processes."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import psutil
+
+from process_info import open_process
+
+TERMINATE, KILL, SUSPEND, RESUME, RENICE = "terminate", "kill", "suspend", "resume", "renice"
+
+# Actions after which the processes are waited for
+_ENDING = (TERMINATE, KILL)
+
+# Seconds to wait for terminated or killed processes to exit
+WAIT_TIMEOUT = 3.0
+
+_PAST_TENSE = {
+    TERMINATE: "Terminated",
+    KILL: "Killed",
+    SUSPEND: "Suspended",
+    RESUME: "Resumed",
+    RENICE: "Reniced",
+}
+
+
+class ActionResult:
+    """Outcome of :func:`run_action` per PID.
+
+    ``gone`` lists the processes that exited (or were already gone),
+    ``alive`` those that outlived the wait and ``failed`` maps a PID to why
+    the action was refused, usually AccessDenied.
+    """
+
+    __slots__ = ("action", "done", "gone", "alive", "failed")
+
+    def __init__(self, action: str) -> None:
+        self.action = action
+        self.done: List[int] = []
+        self.gone: List[int] = []
+        self.alive: List[int] = []
+        self.failed: Dict[int, str] = {}
+
+    def summary(self) -> str:
+        if self.action in _ENDING:
+            parts = [f"{_PAST_TENSE[self.action]} {len(self.gone)} process(es)"]
+            if self.alive:
+                pids = ", ".join(map(str, self.alive))
+                parts.append(f"{len(self.alive)} still running after {WAIT_TIMEOUT:g} s ({pids})")
+        else:
+            parts = [f"{_PAST_TENSE[self.action]} {len(self.done)} process(es)"]
+        if self.failed:
+            failures = ", ".join(f"{pid}: {reason}" for pid, reason in self.failed.items())
+            parts.append(f"{len(self.failed)} failed ({failures})")
+        return "; ".join(parts)
+
+
+def _reason(exc: psutil.Error) -> str:
+    if isinstance(exc, psutil.AccessDenied):
+        return "access denied"
+    return exc.__class__.__name__
+
+
+def run_action(
+    action: str,
+    targets: Iterable[Tuple[int, float, Optional[psutil.Process]]],
+    nice: Optional[int] = None,
+    timeout: float = WAIT_TIMEOUT,
+) -> ActionResult:
+    """Apply ``action`` to ``(pid, create_time, process or None)`` targets.
+
+    Every process is signalled first and the terminated or killed ones
+    are then waited for together with ``psutil.wait_procs``, so the batch
+    takes at most ``timeout`` seconds however many processes it holds. A
+    PID that now belongs to a different process (matched by start time)
+    counts as gone and is never signalled. Blocks; run it in a worker.
+    """
+    if action not in _PAST_TENSE:
+        raise ValueError(f"unknown process action {action!r}")
+    if action == RENICE and nice is None:
+        raise ValueError("renice needs a nice value")
+
+    result = ActionResult(action)
+    signalled: List[psutil.Process] = []
+    for pid, create_time, proc in targets:
+        try:
+            proc = open_process(pid, create_time, proc)
+        except psutil.Error as exc:
+            result.failed[pid] = _reason(exc)
+            continue
+        if proc is None:
+            if action in _ENDING:
+                result.gone.append(pid)
+            else:
+                result.failed[pid] = "no such process"
+            continue
+        try:
+            if action == TERMINATE:
+                proc.terminate()
+            elif action == KILL:
+                proc.kill()
+            elif action == SUSPEND:
+                proc.suspend()
+            elif action == RESUME:
+                proc.resume()
+            else:
+                proc.nice(nice)
+        except psutil.NoSuchProcess:
+            if action in _ENDING:
+                result.gone.append(pid)
+            else:
+                result.failed[pid] = "no such process"
+            continue
+        except psutil.Error as exc:
+            result.failed[pid] = _reason(exc)
+            continue
+        result.done.append(pid)
+        signalled.append(proc)
+
+    if action in _ENDING and signalled:
+        gone, alive = psutil.wait_procs(signalled, timeout=timeout)
+        result.gone.extend(proc.pid for proc in gone)
+        result.alive.extend(proc.pid for proc in alive)
+    return result
@@ -0,0 +1,158 @@
+"""Static process attributes cached per process instance."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional, Tuple
+
+import psutil
+
+# Start times derived from /proc and from psutil agree to the clock tick
+_CREATE_TIME_TOLERANCE = 0.05
+
+_PROCESS_ERRORS = (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess)
+
+
+class ProcessInfo:
+    """Attributes of one process that do not change while it runs.
+
+    ``None`` means not read yet and "" means unreadable (usually
+    AccessDenied). ``running`` is False once the process turned out to be
+    gone or replaced by another process with the same PID.
+    """
+
+    __slots__ = ("pid", "create_time", "name", "exe", "cmdline", "running")
+
+    def __init__(
+        self,
+        pid: int,
+        create_time: float,
+        name: Optional[str] = None,
+        exe: Optional[str] = None,
+        cmdline: Optional[str] = None,
+        running: bool = True,
+    ) -> None:
+        self.pid = pid
+        self.create_time = create_time
+        self.name = name
+        self.exe = exe
+        self.cmdline = cmdline
+        self.running = running
+
+    @property
+    def complete(self) -> bool:
+        return not self.running or None not in (self.name, self.exe, self.cmdline)
+
+
+def open_process(
+    pid: int, create_time: float, proc: Optional[psutil.Process] = None
+) -> Optional[psutil.Process]:
+    """Return a handle on ``pid`` if it is still the process started at ``create_time``.
+
+    A ``create_time`` of 0 (unknown) accepts whatever process has the PID.
+    Returns None only when the process is gone; AccessDenied and
+    ZombieProcess propagate, as the process still exists.
+    """
+    try:
+        proc = proc or psutil.Process(pid)
+        started = proc.create_time()
+    except psutil.ZombieProcess:
+        raise
+    except psutil.NoSuchProcess:
+        return None
+    if create_time and abs(started - create_time) > _CREATE_TIME_TOLERANCE:
+        return None  # the PID now belongs to a newer process
+    return proc
+
+
+def _open_readable(
+    pid: int, create_time: float, proc: Optional[psutil.Process]
+) -> Optional[psutil.Process]:
+    # For reading attributes an uninspectable process is as good as gone
+    try:
+        return open_process(pid, create_time, proc)
+    except _PROCESS_ERRORS:
+        return None
+
+
+def _read(getter) -> str:
+    try:
+        return getter() or ""
+    except _PROCESS_ERRORS:
+        return ""
+
+
+class ProcessInfoCache:
+    """:class:`ProcessInfo` per ``(pid, create_time)``, read once per process.
+
+    Keying on the start time as well as the PID means a reused PID never
+    shows the attributes of the process that had it before. Reads are slow
+    (several /proc files, AccessDenied handling), so they happen on whichever
+    worker thread asks; entries are replaced rather than modified, so other
+    threads always see a consistent entry.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[int, float], ProcessInfo] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, pid: int, create_time: float) -> Optional[ProcessInfo]:
+        """Return the cached entry without reading anything."""
+        return self._entries.get((pid, create_time))
+
+    def cmdline(
+        self, pid: int, create_time: float, proc: Optional[psutil.Process] = None
+    ) -> str:
+        """Return the command line of the process, or "" if it cannot be read."""
+        key = (pid, create_time)
+        info = self._entries.get(key)
+        if info is not None and info.cmdline is not None:
+            return info.cmdline
+
+        cmdline = ""
+        proc = _open_readable(pid, create_time, proc)
+        if proc is not None:
+            cmdline = _read(lambda: " ".join(proc.cmdline()))
+        if info is None:
+            info = ProcessInfo(pid, create_time, cmdline=cmdline, running=proc is not None)
+        else:
+            info = ProcessInfo(pid, create_time, info.name, info.exe, cmdline, info.running)
+        self._entries[key] = info
+        return cmdline
+
+    def fetch(
+        self, pid: int, create_time: float, proc: Optional[psutil.Process] = None
+    ) -> ProcessInfo:
+        """Return the complete entry, reading whatever is still missing."""
+        key = (pid, create_time)
+        info = self._entries.get(key)
+        if info is not None and info.complete:
+            return info
+
+        proc = _open_readable(pid, create_time, proc)
+        if proc is None:
+            info = ProcessInfo(pid, create_time, running=False)
+        else:
+            if not create_time:
+                create_time = _read(proc.create_time) or 0.0
+            with proc.oneshot():
+                known = info or ProcessInfo(pid, create_time)
+                info = ProcessInfo(
+                    pid,
+                    create_time,
+                    known.name if known.name is not None else _read(proc.name),
+                    known.exe if known.exe is not None else _read(proc.exe),
+                    known.cmdline
+                    if known.cmdline is not None
+                    else _read(lambda: " ".join(proc.cmdline())),
+                )
+        self._entries[key] = info
+        return info
+
+    def prune(self, live: Iterable[Tuple[int, float]]) -> None:
+        """Drop the entries of processes not in ``live`` ``(pid, create_time)`` pairs."""
+        live = set(live)
+        # copy() is atomic; a worker may be adding entries concurrently
+        entries = self._entries.copy()
+        self._entries = {key: info for key, info in entries.items() if key in live}
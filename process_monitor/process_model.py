@@ -0,0 +1,686 @@
+"""Qt item models backing the process list view."""
+
+from __future__ import annotations
+
+from operator import itemgetter
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from PyQt6 import QtCore
+
+from data_collector import ProcessSnapshot
+
+# (pid, name, cpu, memory, threads, status) with CPU/memory rounded to the
+# displayed precision so that invisible jitter does not count as a change.
+ProcessRow = Tuple[int, str, float, float, int, str]
+
+PID_COLUMN, NAME_COLUMN, CPU_COLUMN, MEMORY_COLUMN, THREADS_COLUMN, STATUS_COLUMN = range(6)
+
+_SORT_HINT = QtCore.QAbstractItemModel.LayoutChangeHint.VerticalSortHint
+
+
+def _contiguous_ranges(rows: Iterable[int]) -> List[Tuple[int, int]]:
+    """Group sorted row numbers into inclusive ``(first, last)`` ranges."""
+    ranges: List[Tuple[int, int]] = []
+    for row in rows:
+        if ranges and ranges[-1][1] == row - 1:
+            ranges[-1] = (ranges[-1][0], row)
+        else:
+            ranges.append((row, row))
+    return ranges
+
+
+def _sort_key(column: int):
+    if column == NAME_COLUMN:
+        return lambda row: (row[NAME_COLUMN].lower(), row[PID_COLUMN])
+    return itemgetter(column, PID_COLUMN)
+
+
+class ProcessTableModel(QtCore.QAbstractTableModel):
+    """Flat process table updated with per-PID diffs instead of full resets.
+
+    The model sorts and filters itself: rows are kept in display order with
+    ``list.sort`` and only PIDs accepted by :meth:`set_filter` are held, so
+    the view is never handed rows it would hide and sorting costs no
+    per-comparison callbacks into Python.
+    """
+
+    COLUMNS = ["PID", "Name", "CPU %", "Memory %", "Threads", "Status"]
+
+    _CENTERED = {PID_COLUMN, CPU_COLUMN, MEMORY_COLUMN, THREADS_COLUMN}
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent)
+        self._pids: List[int] = []
+        self._rows: List[ProcessRow] = []
+        self._row_of_pid: Dict[int, int] = {}
+        self._snapshot_rows: Dict[int, ProcessRow] = {}
+        self._accepted: Optional[FrozenSet[int]] = None
+        self._sort_column = CPU_COLUMN
+        self._sort_order = QtCore.Qt.SortOrder.DescendingOrder
+
+    # ------------------------------------------------------------------
+    # Qt model interface
+    # ------------------------------------------------------------------
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        value = self._rows[index.row()][index.column()]
+        column = index.column()
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            if column in (CPU_COLUMN, MEMORY_COLUMN):
+                return f"{value:.1f}"
+            return str(value)
+        if role == QtCore.Qt.ItemDataRole.TextAlignmentRole and column in self._CENTERED:
+            return QtCore.Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(
+        self,
+        section: int,
+        orientation: QtCore.Qt.Orientation,
+        role: int = QtCore.Qt.ItemDataRole.DisplayRole,
+    ):
+        if (
+            role == QtCore.Qt.ItemDataRole.DisplayRole
+            and orientation == QtCore.Qt.Orientation.Horizontal
+        ):
+            return self.COLUMNS[section]
+        return None
+
+    def sort(
+        self, column: int, order: QtCore.Qt.SortOrder = QtCore.Qt.SortOrder.AscendingOrder
+    ) -> None:
+        if not 0 <= column < len(self.COLUMNS):
+            return
+        self._sort_column = column
+        self._sort_order = order
+        self._resort()
+
+    def _resort(self) -> None:
+        """Reorder the rows for the current sort, keeping persistent indexes."""
+        rows = self._rows
+        key = _sort_key(self._sort_column)
+        order = sorted(
+            range(len(rows)),
+            key=lambda row: key(rows[row]),
+            reverse=self._sort_order == QtCore.Qt.SortOrder.DescendingOrder,
+        )
+        if all(old == new for new, old in enumerate(order)):
+            return
+
+        self.layoutAboutToBeChanged.emit([], _SORT_HINT)
+        self._rows = [rows[row] for row in order]
+        self._pids = [row[PID_COLUMN] for row in self._rows]
+        self._row_of_pid = {pid: row for row, pid in enumerate(self._pids)}
+        new_row = [0] * len(order)
+        for new, old in enumerate(order):
+            new_row[old] = new
+        persistent = self.persistentIndexList()
+        self.changePersistentIndexList(
+            persistent,
+            [self.index(new_row[index.row()], index.column()) for index in persistent],
+        )
+        self.layoutChanged.emit([], _SORT_HINT)
+
+    # ------------------------------------------------------------------
+    # Snapshot updates
+    # ------------------------------------------------------------------
+    def pid_at(self, row: int) -> int:
+        return self._pids[row]
+
+    def pid_for_index(self, index: QtCore.QModelIndex) -> Optional[int]:
+        return self._pids[index.row()] if index.isValid() else None
+
+    def row_for_pid(self, pid: int) -> Optional[int]:
+        return self._row_of_pid.get(pid)
+
+    def index_for_pid(self, pid: int, column: int = PID_COLUMN) -> QtCore.QModelIndex:
+        row = self._row_of_pid.get(pid)
+        if row is None:
+            return QtCore.QModelIndex()
+        return self.index(row, column)
+
+    def process_row(self, pid: int) -> Optional[ProcessRow]:
+        row = self._row_of_pid.get(pid)
+        return None if row is None else self._rows[row]
+
+    @property
+    def total_count(self) -> int:
+        """Number of processes in the snapshot, including filtered ones."""
+        return len(self._snapshot_rows)
+
+    @property
+    def shown_count(self) -> int:
+        return len(self._rows)
+
+    def set_filter(self, pids: Optional[FrozenSet[int]]) -> None:
+        """Show only ``pids`` from the current snapshot; None shows all."""
+        self._accepted = pids
+        self._apply_rows()
+
+    def apply_snapshot(self, snapshot: Optional[ProcessSnapshot]) -> None:
+        """Bring the model in line with ``snapshot`` using minimal change signals."""
+        rows: Dict[int, ProcessRow] = {}
+        if snapshot is not None:
+            for pid, name, cpu, memory, threads, status in snapshot.rows():
+                rows[pid] = (pid, name, round(cpu, 1), round(memory, 1), threads, status)
+        self._snapshot_rows = rows
+        self._apply_rows()
+
+    def remove_pids(self, pids: Iterable[int]) -> None:
+        """Drop ``pids`` (processes known to have exited) until the next snapshot."""
+        rows = []
+        for pid in pids:
+            self._snapshot_rows.pop(pid, None)
+            row = self._row_of_pid.get(pid)
+            if row is not None:
+                rows.append(row)
+        self._remove_rows(sorted(rows))
+
+    def _remove_rows(self, removed: List[int]) -> None:
+        """Remove the sorted row numbers ``removed``, bottom up so earlier rows stay valid."""
+        root = QtCore.QModelIndex()
+        for first, last in reversed(_contiguous_ranges(removed)):
+            self.beginRemoveRows(root, first, last)
+            for pid in self._pids[first:last + 1]:
+                del self._row_of_pid[pid]
+            del self._pids[first:last + 1]
+            del self._rows[first:last + 1]
+            self.endRemoveRows()
+
+        # Only rows below the first removal shifted up.
+        if removed:
+            for row in range(removed[0], len(self._pids)):
+                self._row_of_pid[self._pids[row]] = row
+
+    def _apply_rows(self) -> None:
+        accepted = self._accepted
+        if accepted is None:
+            incoming = dict(self._snapshot_rows)
+        else:
+            incoming = {pid: row for pid, row in self._snapshot_rows.items() if pid in accepted}
+
+        # Rows for processes that exited
+        self._remove_rows([row for row, pid in enumerate(self._pids) if pid not in incoming])
+
+        # Cells whose displayed value changed.
+        for row, pid in enumerate(self._pids):
+            new_row = incoming.pop(pid)
+            old_row = self._rows[row]
+            if new_row == old_row:
+                continue
+            changed = [col for col, (old, new) in enumerate(zip(old_row, new_row)) if old != new]
+            self._rows[row] = new_row
+            self.dataChanged.emit(self.index(row, changed[0]), self.index(row, changed[-1]))
+
+        # Whatever is left are processes that appeared since the last update.
+        if incoming:
+            first = len(self._rows)
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + len(incoming) - 1)
+            for row, pid in enumerate(incoming, first):
+                self._row_of_pid[pid] = row
+            self._pids.extend(incoming)
+            self._rows.extend(incoming.values())
+            self.endInsertRows()
+
+        self._resort()
+
+
+TREE_CPU_COLUMN, TREE_MEMORY_COLUMN = 6, 7
+
+
+class _Node:
+    """One process in the tree with running totals over its subtree."""
+
+    __slots__ = ("pid", "row", "parent", "kids", "children", "position", "cpu_total", "mem_total")
+
+    def __init__(self, pid: int, row: Optional[ProcessRow] = None) -> None:
+        self.pid = pid
+        self.row = row
+        self.parent: Optional[_Node] = None
+        # Every child process, used for the totals
+        self.kids: Dict[int, _Node] = {}
+        # Children shown in the view in display order, or None while the
+        # view has not asked for them (collapsed and never expanded).
+        self.children: Optional[List[_Node]] = None
+        # Row within parent.children
+        self.position = 0
+        self.cpu_total = row[CPU_COLUMN] if row else 0.0
+        self.mem_total = row[MEMORY_COLUMN] if row else 0.0
+
+
+def _tree_sort_key(column: int):
+    if column == NAME_COLUMN:
+        return lambda node: (node.row[NAME_COLUMN].lower(), node.pid)
+    if column == TREE_CPU_COLUMN:
+        return lambda node: (round(node.cpu_total, 1), node.pid)
+    if column == TREE_MEMORY_COLUMN:
+        return lambda node: (round(node.mem_total, 1), node.pid)
+    return lambda node: (node.row[column], node.pid)
+
+
+class ProcessTreeModel(QtCore.QAbstractItemModel):
+    """Parent/child process tree with incrementally maintained subtree totals.
+
+    Every snapshot is applied as a diff: a changed CPU or memory value adds
+    its delta to the totals of the process's ancestors, and processes that
+    appear, exit or are reparented add or subtract their subtree totals
+    along the old and new ancestor chains, so totals are never recomputed
+    from scratch. Children are handed to the view through
+    ``canFetchMore``/``fetchMore`` only when their parent is expanded, and
+    :meth:`release` drops them again on collapse, so collapsed subtrees
+    cost no rows, indexes or change signals.
+
+    The public interface matches :class:`ProcessTableModel` so the window
+    can switch between the two.
+    """
+
+    COLUMNS = ProcessTableModel.COLUMNS + ["Tree CPU %", "Tree Mem %"]
+
+    _CENTERED = ProcessTableModel._CENTERED | {TREE_CPU_COLUMN, TREE_MEMORY_COLUMN}
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent)
+        self._root = _Node(-1)
+        self._root.children = []
+        self._nodes: Dict[int, _Node] = {}
+        self._accepted: Optional[FrozenSet[int]] = None
+        self._visible: Optional[set] = None
+        self._sort_column = TREE_CPU_COLUMN
+        self._sort_order = QtCore.Qt.SortOrder.DescendingOrder
+        # Nodes removed by the last update; kept alive one more update since
+        # indexes handed to Qt only hold a borrowed pointer to them.
+        self._released: List[_Node] = []
+
+    # ------------------------------------------------------------------
+    # Qt model interface
+    # ------------------------------------------------------------------
+    def _node(self, index: QtCore.QModelIndex) -> _Node:
+        return index.internalPointer() if index.isValid() else self._root
+
+    def _index_of(self, node: _Node, column: int = 0) -> QtCore.QModelIndex:
+        if node is self._root:
+            return QtCore.QModelIndex()
+        return self.createIndex(node.position, column, node)
+
+    def index(
+        self, row: int, column: int, parent: QtCore.QModelIndex = QtCore.QModelIndex()
+    ) -> QtCore.QModelIndex:
+        children = self._node(parent).children
+        if children is None or not 0 <= row < len(children) or not 0 <= column < len(self.COLUMNS):
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column, children[row])
+
+    def parent(self, index: QtCore.QModelIndex) -> QtCore.QModelIndex:  # type: ignore[override]
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        parent = index.internalPointer().parent
+        return QtCore.QModelIndex() if parent is None else self._index_of(parent)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        children = self._node(parent).children
+        return 0 if children is None else len(children)
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return len(self.COLUMNS)
+
+    def hasChildren(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+        node = self._node(parent)
+        if node.children is not None:
+            return bool(node.children)
+        return any(self._is_visible(kid) for kid in node.kids.values())
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        node = self._node(parent)
+        return node.children is None and self.hasChildren(parent)
+
+    def fetchMore(self, parent: QtCore.QModelIndex) -> None:
+        node = self._node(parent)
+        if node.children is not None:
+            return
+        children = sorted(
+            (kid for kid in node.kids.values() if self._is_visible(kid)),
+            key=_tree_sort_key(self._sort_column),
+            reverse=self._descending,
+        )
+        if not children:
+            node.children = []
+            return
+        self.beginInsertRows(parent, 0, len(children) - 1)
+        node.children = children
+        for position, child in enumerate(children):
+            child.position = position
+        self.endInsertRows()
+
+    def release(self, index: QtCore.QModelIndex) -> None:
+        """Forget the children of a collapsed ``index`` until it is expanded again."""
+        node = self._node(index)
+        if node is self._root or node.children is None:
+            return
+        if not node.children:
+            node.children = None
+            return
+        self.beginRemoveRows(index, 0, len(node.children) - 1)
+        self._unmaterialize(node)
+        self.endRemoveRows()
+
+    def _unmaterialize(self, node: _Node) -> None:
+        for child in node.children or ():
+            self._unmaterialize(child)
+        node.children = None
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        column = index.column()
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            if column == TREE_CPU_COLUMN:
+                return f"{max(node.cpu_total, 0.0):.1f}"
+            if column == TREE_MEMORY_COLUMN:
+                return f"{max(node.mem_total, 0.0):.1f}"
+            value = node.row[column]
+            if column in (CPU_COLUMN, MEMORY_COLUMN):
+                return f"{value:.1f}"
+            return str(value)
+        if role == QtCore.Qt.ItemDataRole.TextAlignmentRole and column in self._CENTERED:
+            return QtCore.Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(
+        self,
+        section: int,
+        orientation: QtCore.Qt.Orientation,
+        role: int = QtCore.Qt.ItemDataRole.DisplayRole,
+    ):
+        if (
+            role == QtCore.Qt.ItemDataRole.DisplayRole
+            and orientation == QtCore.Qt.Orientation.Horizontal
+        ):
+            return self.COLUMNS[section]
+        return None
+
+    @property
+    def _descending(self) -> bool:
+        return self._sort_order == QtCore.Qt.SortOrder.DescendingOrder
+
+    def sort(
+        self, column: int, order: QtCore.Qt.SortOrder = QtCore.Qt.SortOrder.AscendingOrder
+    ) -> None:
+        if not 0 <= column < len(self.COLUMNS):
+            return
+        self._sort_column = column
+        self._sort_order = order
+        self._resort(self._materialized())
+
+    def _materialized(self) -> List[_Node]:
+        """Nodes whose children are currently exposed to the view."""
+        nodes, stack = [], [self._root]
+        while stack:
+            node = stack.pop()
+            if node.children is not None:
+                nodes.append(node)
+                stack.extend(node.children)
+        return nodes
+
+    def _resort(self, parents: Iterable[_Node]) -> None:
+        """Re-sort the shown children of ``parents``, keeping persistent indexes."""
+        key = _tree_sort_key(self._sort_column)
+        reordered = []
+        for parent in parents:
+            children = parent.children
+            if not children or len(children) < 2:
+                continue
+            ordered = sorted(children, key=key, reverse=self._descending)
+            if any(a is not b for a, b in zip(ordered, children)):
+                reordered.append((parent, ordered))
+        if not reordered:
+            return
+
+        self.layoutAboutToBeChanged.emit([], _SORT_HINT)
+        for parent, ordered in reordered:
+            parent.children = ordered
+            for position, child in enumerate(ordered):
+                child.position = position
+        persistent = self.persistentIndexList()
+        self.changePersistentIndexList(
+            persistent,
+            [self.createIndex(i.internalPointer().position, i.column(), i.internalPointer())
+             for i in persistent],
+        )
+        self.layoutChanged.emit([], _SORT_HINT)
+
+    # ------------------------------------------------------------------
+    # Lookups shared with ProcessTableModel
+    # ------------------------------------------------------------------
+    def pid_for_index(self, index: QtCore.QModelIndex) -> Optional[int]:
+        return index.internalPointer().pid if index.isValid() else None
+
+    def process_row(self, pid: int) -> Optional[ProcessRow]:
+        node = self._nodes.get(pid)
+        return None if node is None else node.row
+
+    def subtree_totals(self, pid: int) -> Optional[Tuple[float, float]]:
+        node = self._nodes.get(pid)
+        return None if node is None else (node.cpu_total, node.mem_total)
+
+    def index_for_pid(self, pid: int, column: int = PID_COLUMN) -> QtCore.QModelIndex:
+        """Return the index of ``pid``, materializing the path down to it."""
+        node = self._nodes.get(pid)
+        if node is None or not self._is_visible(node):
+            return QtCore.QModelIndex()
+        path = []
+        ancestor = node.parent
+        while ancestor is not None:
+            path.append(ancestor)
+            ancestor = ancestor.parent
+        for ancestor in reversed(path):
+            if ancestor.children is None:
+                self.fetchMore(self._index_of(ancestor))
+        return self._index_of(node, column)
+
+    @property
+    def total_count(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def shown_count(self) -> int:
+        return len(self._nodes) if self._visible is None else len(self._visible)
+
+    # ------------------------------------------------------------------
+    # Filtering
+    # ------------------------------------------------------------------
+    def _is_visible(self, node: _Node) -> bool:
+        return self._visible is None or node.pid in self._visible
+
+    def _compute_visible(self) -> Optional[set]:
+        """Accepted PIDs plus their ancestors, so matches keep their place in the tree."""
+        if self._accepted is None:
+            return None
+        visible = set()
+        for pid in self._accepted:
+            node = self._nodes.get(pid)
+            while node is not None and node is not self._root and node.pid not in visible:
+                visible.add(node.pid)
+                node = node.parent
+        return visible
+
+    def set_filter(self, pids: Optional[FrozenSet[int]]) -> None:
+        """Show only ``pids`` and their ancestors; None shows all."""
+        self._accepted = pids
+        visible = self._compute_visible()
+        if visible == self._visible:
+            return
+        # Which parents gain or lose children is not tracked per node, so
+        # the view is rebuilt; the window re-expands what was expanded.
+        self.beginResetModel()
+        self._visible = visible
+        for node in self._nodes.values():
+            node.children = None
+        self._root.children = None
+        self.endResetModel()
+        self.fetchMore(QtCore.QModelIndex())
+
+    # ------------------------------------------------------------------
+    # Snapshot updates
+    # ------------------------------------------------------------------
+    def _add_totals(self, node: Optional[_Node], cpu: float, memory: float, changed: set) -> None:
+        while node is not None:
+            node.cpu_total += cpu
+            node.mem_total += memory
+            changed.add(node)
+            node = node.parent
+
+    def _detach(self, node: _Node, changed: set) -> None:
+        parent = node.parent
+        if parent is None:
+            return
+        self._add_totals(parent, -node.cpu_total, -node.mem_total, changed)
+        del parent.kids[node.pid]
+        children = parent.children
+        if children is not None and node.position < len(children) and children[node.position] is node:
+            position = node.position
+            self.beginRemoveRows(self._index_of(parent), position, position)
+            del children[position]
+            for index in range(position, len(children)):
+                children[index].position = index
+            self._unmaterialize(node)
+            self.endRemoveRows()
+        node.parent = None
+
+    def _attach(self, node: _Node, parent: _Node, changed: set, inserts: Dict[int, list]) -> None:
+        # Guard against a parent inside the node's own subtree (a PID reused
+        # between two reads); such a process is shown at the top level.
+        ancestor = parent
+        while ancestor is not None:
+            if ancestor is node:
+                parent = self._root
+                break
+            ancestor = ancestor.parent
+        node.parent = parent
+        parent.kids[node.pid] = node
+        self._add_totals(parent, node.cpu_total, node.mem_total, changed)
+        if parent.children is not None and self._is_visible(node):
+            inserts.setdefault(id(parent), [parent]).append(node)
+
+    def apply_snapshot(self, snapshot: Optional[ProcessSnapshot]) -> None:
+        """Bring the tree in line with ``snapshot`` using minimal change signals."""
+        rows: Dict[int, ProcessRow] = {}
+        ppids: Dict[int, int] = {}
+        if snapshot is not None:
+            for pid, name, cpu, memory, threads, status, ppid in zip(
+                snapshot.pids, snapshot.names, snapshot.cpu, snapshot.memory,
+                snapshot.threads, snapshot.status, snapshot.ppids,
+            ):
+                rows[pid] = (pid, name, round(cpu, 1), round(memory, 1), threads, status)
+                ppids[pid] = ppid
+
+        nodes = self._nodes
+        changed: set = set()
+        touched: set = set()
+        self._released = []
+
+        # Exited processes: their children are detached here and attached to
+        # their new parent below, like any other reparented process.
+        for pid in [pid for pid in nodes if pid not in rows]:
+            node = nodes.pop(pid)
+            for kid in list(node.kids.values()):
+                self._detach(kid, changed)
+            self._detach(node, changed)
+            self._released.append(node)
+
+        # New processes start detached, like reparented ones, so they can be
+        # the parent of an existing process in the same pass.
+        for pid, row in rows.items():
+            if pid not in nodes:
+                nodes[pid] = _Node(pid, row)
+
+        # Value changes add their delta along the ancestor chain.
+        pending = []
+        for pid, node in nodes.items():
+            row = rows[pid]
+            old = node.row
+            if row != old:
+                node.row = row
+                self._add_totals(
+                    node, row[CPU_COLUMN] - old[CPU_COLUMN],
+                    row[MEMORY_COLUMN] - old[MEMORY_COLUMN], changed,
+                )
+            ppid = ppids[pid]
+            parent = nodes.get(ppid, self._root) if ppid != pid else self._root
+            if node.parent is not parent:
+                self._detach(node, changed)
+                pending.append((node, parent))
+
+        self._finish_update(pending, changed, touched)
+
+    def remove_pids(self, pids: Iterable[int]) -> None:
+        """Drop ``pids`` (processes known to have exited) until the next snapshot.
+
+        Their children move to the top level until the next snapshot tells
+        where they were reparented.
+        """
+        changed: set = set()
+        self._released = []
+        orphans = []
+        for pid in pids:
+            node = self._nodes.pop(pid, None)
+            if node is None:
+                continue
+            if self._visible is not None:
+                self._visible.discard(pid)
+            for kid in list(node.kids.values()):
+                self._detach(kid, changed)
+                orphans.append(kid)
+            self._detach(node, changed)
+            self._released.append(node)
+        pending = [(kid, self._root) for kid in orphans if kid.pid in self._nodes]
+        self._finish_update(pending, changed, set())
+
+    def _finish_update(
+        self, pending: List[Tuple[_Node, _Node]], changed: set, touched: set
+    ) -> None:
+        """Attach ``pending`` (node, parent) pairs, signal ``changed`` nodes and resort."""
+        # New rows are appended to each shown parent in one block and moved
+        # into place by the resort below.
+        inserts: Dict[int, list] = {}
+        for node, parent in pending:
+            self._attach(node, parent, changed, inserts)
+        for parent, *added in inserts.values():
+            children = parent.children
+            first = len(children)
+            self.beginInsertRows(self._index_of(parent), first, first + len(added) - 1)
+            for position, node in enumerate(added, first):
+                node.position = position
+            children.extend(added)
+            self.endInsertRows()
+            touched.add(parent)
+
+        # One dataChanged per parent covering its changed shown children.
+        spans: Dict[int, Tuple[_Node, int, int]] = {}
+        for node in changed:
+            parent = node.parent
+            if parent is None or parent.children is None or node.position >= len(parent.children):
+                continue
+            if parent.children[node.position] is not node:
+                continue
+            first, last = spans.get(id(parent), (parent, node.position, node.position))[1:]
+            spans[id(parent)] = (parent, min(first, node.position), max(last, node.position))
+            touched.add(parent)
+        last_column = len(self.COLUMNS) - 1
+        for parent, first, last in spans.values():
+            parent_index = self._index_of(parent)
+            self.dataChanged.emit(
+                self.index(first, 0, parent_index), self.index(last, last_column, parent_index)
+            )
+
+        self._resort(touched)
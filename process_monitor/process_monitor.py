@@ -1,17 +1,128 @@
 """Process Monitor - Qt6 entry point."""
 
+import argparse
 import sys
 
-from PyQt6 import QtWidgets
+from chart_manager import DEFAULT_RETENTION
 
-from process_monitor_gui import ProcessMonitor
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Real-time system process monitor")
+    parser.add_argument(
+        "--backend",
+        choices=["psutil", "procfs", "auto"],
+        default="psutil",
+        help="process list backend (procfs reads /proc directly on Linux)",
+    )
+    parser.add_argument(
+        "--history",
+        type=int,
+        default=DEFAULT_RETENTION,
+        metavar="SECONDS",
+        help="seconds of 1 Hz chart history to keep in memory (default: one hour)",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="FILE",
+        help="record metrics and process snapshots to FILE without opening a window",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        metavar="SECONDS",
+        help="seconds between recorded process snapshots (default: 1)",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        metavar="SECONDS",
+        help="stop recording after SECONDS (default: until interrupted)",
+    )
+    parser.add_argument(
+        "--alert",
+        action="append",
+        default=[],
+        metavar="RULE",
+        help='alert rule such as "watched.cpu > 80 for 30s" (repeatable)',
+    )
+    parser.add_argument(
+        "--profile-ticks",
+        type=int,
+        default=0,
+        metavar="N",
+        help="profile the first N metrics ticks with cProfile and write the stats to a temp file",
+    )
+    parser.add_argument(
+        "--export",
+        metavar="LOG",
+        help="write a recording to --output (.csv, .csv.gz or .parquet) and exit",
+    )
+    parser.add_argument("--output", metavar="FILE", help="file written by --export")
+    parser.add_argument(
+        "--table",
+        choices=["processes", "samples"],
+        default="processes",
+        help="what --export writes: one row per process and snapshot, or system samples",
+    )
+    parser.add_argument(
+        "--open",
+        metavar="FILE",
+        help="open a recording for playback on startup",
+    )
+    args, qt_args = parser.parse_known_args(argv)
+
+    from alerts import parse_rules
+
+    try:
+        parse_rules(args.alert)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.export and not args.output:
+        parser.error("--export requires --output")
+    return args, qt_args
 
 
 def main() -> int:
     """Main entry point for the Process Monitor application."""
-    app = QtWidgets.QApplication(sys.argv)
-    window = ProcessMonitor()
+    args, qt_args = parse_args(sys.argv[1:])
+    if args.export:
+        from exporter import ExportError, export_recording
+
+        try:
+            rows = export_recording(args.export, args.output, args.table)
+        except (ExportError, OSError) as exc:
+            print(f"Export failed: {exc}", file=sys.stderr)
+            return 1
+        print(f"Exported {rows} rows to {args.output}")
+        return 0
+
+    if args.record:
+        from recorder import run_headless
+
+        return run_headless(
+            args.record,
+            backend=args.backend,
+            interval_ms=int(args.interval * 1000),
+            duration=args.duration,
+            alert_rules=args.alert,
+            argv=sys.argv[:1] + qt_args,
+        )
+
+    from PyQt6 import QtWidgets
+
+    from process_monitor_gui import ProcessMonitor
+
+    app = QtWidgets.QApplication(sys.argv[:1] + qt_args)
+    window = ProcessMonitor(
+        backend=args.backend,
+        retention=args.history,
+        alert_rules=args.alert,
+        profile_ticks=args.profile_ticks,
+    )
     window.show()
+    if args.open:
+        window.open_recording(args.open)
     return app.exec()
 
 
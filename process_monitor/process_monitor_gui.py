@@ -1,15 +1,52 @@
 from __future__ import annotations
 
+import functools
+import re
 import sys
 import time
+from typing import FrozenSet, Optional, Sequence
 
 import psutil
 from PyQt6 import QtCore, QtGui, QtWidgets
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
+from alerts import ALERT_LOG_SIZE, Alert
 from data_collector import DataCollector
-from chart_manager import ChartManager
+from exporter import (
+    FILE_FILTERS,
+    copy_history,
+    export_recording,
+    export_series,
+    export_snapshots,
+)
+from chart_manager import DEFAULT_RETENTION, WINDOWS, ChartManager
+from metric_log import MetricLogError, MetricLogReader
+from metrics_payload import MetricsPayload
+from process_actions import KILL, RENICE, RESUME, SUSPEND, TERMINATE, ActionResult
+from process_info import ProcessInfo
+from process_model import (
+    CPU_COLUMN,
+    MEMORY_COLUMN,
+    NAME_COLUMN,
+    PID_COLUMN,
+    ProcessTableModel,
+    ProcessTreeModel,
+)
+from process_search import SearchIndex, parse_query
+from tick_profiler import TickProfiler
+from top_consumers import WINDOWS as TOP_WINDOWS
+
+# Milliseconds the search box must be idle before a search starts
+SEARCH_DEBOUNCE_MS = 150
+
+# Sort combo entries mapped to (model column, sort order).
+SORT_COLUMNS = {
+    "CPU": (CPU_COLUMN, QtCore.Qt.SortOrder.DescendingOrder),
+    "Memory": (MEMORY_COLUMN, QtCore.Qt.SortOrder.DescendingOrder),
+    "PID": (PID_COLUMN, QtCore.Qt.SortOrder.AscendingOrder),
+    "Name": (NAME_COLUMN, QtCore.Qt.SortOrder.AscendingOrder),
+}
 
 
 class WorkerSignals(QtCore.QObject):
@@ -44,35 +81,53 @@ class ProcessListWorker(QtCore.QRunnable):
 class ProcessMonitor(QtWidgets.QMainWindow):
     """Main GUI class for the process monitoring application using Qt6."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        backend: str = "psutil",
+        retention: int = DEFAULT_RETENTION,
+        alert_rules: Sequence[str] = (),
+        profile_ticks: int = 0,
+    ):
         super().__init__()
         self.setWindowTitle("Process Monitor")
-        self.resize(1000, 600)
+        self.resize(1200, 800)
         self.setMinimumSize(800, 500)
 
         # Core application state
-        self.data_collector = DataCollector()
+        self.data_collector = DataCollector(backend)
         self.chart_manager = None
+        self.retention = retention
+        self.watch_pids = set()
         self.thread_pool = QtCore.QThreadPool(self)
         self.selected_pid = None
         self.running = True
-        self.all_processes = []
-        self.latest_metrics = None
+        self.all_processes = None
+        self.recording = None
         self._process_update_running = False
-
-        # Connect data collector signals
+        self._ignore_selection_changes = False
+        self.search_index = SearchIndex()
+        self._search_query = None
+        self._search_generation = 0
+        # PIDs expanded in tree mode, re-expanded when the filter rebuilds it
+        self._expanded_pids = set()
+
+        # Connect data collector signals; the metrics tick also says when the
+        # process list is due, so there is no separate refresh timer.
         self.data_collector.data_ready.connect(self._handle_data_update)
-
-        self.process_refresh_timer = QtCore.QTimer(self)
-        self.process_refresh_timer.setInterval(5000)
-        self.process_refresh_timer.timeout.connect(self._schedule_process_list_update)
+        self.data_collector.alert_raised.connect(self._handle_alert)
+        self._tray_icon: Optional[QtWidgets.QSystemTrayIcon] = None
+        self.tick_profiler = TickProfiler()
 
         # Build UI
         self._setup_ui()
+        if alert_rules:
+            self.alert_rules_edit.setPlainText("\n".join(alert_rules))
+            self._apply_alert_rules()
+        if profile_ticks:
+            self.profile_ticks(profile_ticks)
 
         # Start background components
         self.data_collector.start()
-        self.process_refresh_timer.start()
 
         # Trigger initial updates
         self._schedule_process_list_update()
@@ -87,12 +142,65 @@ class ProcessMonitor(QtWidgets.QMainWindow):
         main_layout.setContentsMargins(10, 10, 10, 10)
         main_layout.setSpacing(10)
 
+        self._setup_menu()
         self._setup_top_controls(main_layout)
+        self._setup_playback_bar(main_layout)
         self._setup_main_content(main_layout)
 
         # Status bar
         self.status = QtWidgets.QStatusBar()
         self.setStatusBar(self.status)
+        self.schedule_label = QtWidgets.QLabel()
+        self.status.addPermanentWidget(self.schedule_label)
+        # The latest alert stays visible; the message area is rewritten every tick
+        self.alert_label = QtWidgets.QLabel()
+        self.alert_label.setStyleSheet("color: #c0392b;")
+        self.status.addPermanentWidget(self.alert_label)
+
+    def _setup_menu(self) -> None:
+        file_menu = self.menuBar().addMenu("&File")
+
+        open_action = file_menu.addAction("&Open Recording...")
+        open_action.setShortcut(QtGui.QKeySequence.StandardKey.Open)
+        open_action.triggered.connect(self._choose_recording)
+
+        self.live_action = file_menu.addAction("Return to &Live")
+        self.live_action.setEnabled(False)
+        self.live_action.triggered.connect(self.close_recording)
+
+        export_menu = file_menu.addMenu("&Export")
+        export_menu.addAction("Metric &History...", lambda: self._choose_export("history"))
+        export_menu.addAction("&Process Table...", lambda: self._choose_export("processes"))
+        self.export_recording_action = export_menu.addAction(
+            "&Recorded Processes...", lambda: self._choose_export("recording")
+        )
+        self.export_recording_action.setEnabled(False)
+
+        tools_menu = self.menuBar().addMenu("&Tools")
+        profile_action = tools_menu.addAction("&Profile Next Ticks...")
+        profile_action.triggered.connect(self._choose_profile_ticks)
+
+    def _setup_playback_bar(self, parent_layout: QtWidgets.QVBoxLayout) -> None:
+        self.playback_bar = QtWidgets.QWidget()
+        playback_layout = QtWidgets.QHBoxLayout(self.playback_bar)
+        playback_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.playback_label = QtWidgets.QLabel()
+        playback_layout.addWidget(self.playback_label)
+
+        self.playback_slider = QtWidgets.QSlider(QtCore.Qt.Orientation.Horizontal)
+        self.playback_slider.valueChanged.connect(self._scrub_recording)
+        playback_layout.addWidget(self.playback_slider, stretch=1)
+
+        self.playback_time_label = QtWidgets.QLabel()
+        playback_layout.addWidget(self.playback_time_label)
+
+        live_btn = QtWidgets.QPushButton("Live")
+        live_btn.clicked.connect(self.close_recording)
+        playback_layout.addWidget(live_btn)
+
+        self.playback_bar.hide()
+        parent_layout.addWidget(self.playback_bar)
 
     def _setup_top_controls(self, parent_layout: QtWidgets.QVBoxLayout) -> None:
         controls_layout = QtWidgets.QHBoxLayout()
@@ -103,6 +211,7 @@ class ProcessMonitor(QtWidgets.QMainWindow):
         controls_layout.addWidget(self.refresh_btn)
 
         self.end_btn = QtWidgets.QPushButton("End Process")
+        self.end_btn.setToolTip("Terminate the selected processes (Del); right-click for more")
         self.end_btn.clicked.connect(self.end_selected_process)
         controls_layout.addWidget(self.end_btn)
 
@@ -112,11 +221,27 @@ class ProcessMonitor(QtWidgets.QMainWindow):
         controls_layout.addWidget(search_label)
 
         self.search_edit = QtWidgets.QLineEdit()
-        self.search_edit.setPlaceholderText("Process name")
+        self.search_edit.setPlaceholderText("Name, /regex/, pid:1-100, cmd:text")
         self.search_edit.textChanged.connect(self.filter_processes)
-        self.search_edit.setMaximumWidth(200)
+        self.search_edit.setMaximumWidth(240)
         controls_layout.addWidget(self.search_edit)
 
+        self.search_timer = QtCore.QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self._start_search)
+
+        controls_layout.addSpacing(20)
+
+        jump_label = QtWidgets.QLabel("Go to PID:")
+        controls_layout.addWidget(jump_label)
+
+        self.jump_edit = QtWidgets.QLineEdit()
+        self.jump_edit.setValidator(QtGui.QIntValidator(0, 2**31 - 1, self.jump_edit))
+        self.jump_edit.returnPressed.connect(self._on_jump_requested)
+        self.jump_edit.setMaximumWidth(80)
+        controls_layout.addWidget(self.jump_edit)
+
         controls_layout.addSpacing(20)
 
         sort_label = QtWidgets.QLabel("Sort by:")
@@ -125,13 +250,25 @@ class ProcessMonitor(QtWidgets.QMainWindow):
         self.sort_combo = QtWidgets.QComboBox()
         self.sort_combo.addItems(["CPU", "Memory", "PID", "Name"])
         self.sort_combo.setCurrentText("CPU")
-        self.sort_combo.currentTextChanged.connect(self._apply_process_filter)
+        self.sort_combo.currentTextChanged.connect(self._apply_sort)
         controls_layout.addWidget(self.sort_combo)
 
+        self.tree_check = QtWidgets.QCheckBox("Tree")
+        self.tree_check.setToolTip("Show processes under their parents with subtree totals")
+        self.tree_check.toggled.connect(self._set_tree_mode)
+        controls_layout.addWidget(self.tree_check)
+
         controls_layout.addStretch()
 
         parent_layout.addLayout(controls_layout)
 
+    def _configure_process_header(self) -> None:
+        header = self.process_tree.header()
+        header.setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeMode.Stretch)
+        for idx in range(2, len(self.process_model.COLUMNS)):
+            header.setSectionResizeMode(idx, QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
+
     def _setup_main_content(self, parent_layout: QtWidgets.QVBoxLayout) -> None:
         splitter = QtWidgets.QSplitter(QtCore.Qt.Orientation.Horizontal)
         parent_layout.addWidget(splitter, stretch=1)
@@ -142,26 +279,36 @@ class ProcessMonitor(QtWidgets.QMainWindow):
         process_layout.setContentsMargins(0, 0, 0, 0)
         process_layout.setSpacing(5)
 
-        self.tree_columns = ["PID", "Name", "CPU %", "Memory %", "Threads", "Status"]
-        self.process_tree = QtWidgets.QTreeWidget()
-        self.process_tree.setColumnCount(len(self.tree_columns))
-        self.process_tree.setHeaderLabels(self.tree_columns)
+        # The models sort and filter themselves, so the view is attached
+        # directly; the tree checkbox switches between them.
+        self.table_model = ProcessTableModel(self)
+        self.tree_model = ProcessTreeModel(self)
+        self.process_model = self.table_model
+
+        self.process_tree = QtWidgets.QTreeView()
+        self.process_tree.setModel(self.process_model)
         self.process_tree.setRootIsDecorated(False)
+        self.process_tree.setUniformRowHeights(True)
         self.process_tree.setAlternatingRowColors(True)
+        self.process_tree.setSortingEnabled(True)
         self.process_tree.setSelectionMode(
-            QtWidgets.QAbstractItemView.SelectionMode.SingleSelection
+            QtWidgets.QAbstractItemView.SelectionMode.ExtendedSelection
         )
         self.process_tree.setSelectionBehavior(
             QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows
         )
         header = self.process_tree.header()
         header.setStretchLastSection(False)
-        header.setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeMode.Stretch)
-        for idx in range(2, len(self.tree_columns)):
-            header.setSectionResizeMode(idx, QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
+        self._configure_process_header()
         header.sectionClicked.connect(self._on_header_clicked)
-        self.process_tree.itemSelectionChanged.connect(self.on_process_select)
+        self.process_tree.selectionModel().selectionChanged.connect(self.on_process_select)
+        self.process_tree.expanded.connect(self._on_process_expanded)
+        self.process_tree.collapsed.connect(self._on_process_collapsed)
+        self.process_tree.setContextMenuPolicy(QtCore.Qt.ContextMenuPolicy.CustomContextMenu)
+        self.process_tree.customContextMenuRequested.connect(self._show_process_menu)
+        end_shortcut = QtGui.QShortcut(QtGui.QKeySequence.StandardKey.Delete, self.process_tree)
+        end_shortcut.activated.connect(self.end_selected_process)
+        self._apply_sort(self.sort_combo.currentText())
 
         process_layout.addWidget(self.process_tree)
         splitter.addWidget(process_container)
@@ -176,26 +323,30 @@ class ProcessMonitor(QtWidgets.QMainWindow):
         system_group = QtWidgets.QGroupBox("System Resources")
         system_layout = QtWidgets.QVBoxLayout(system_group)
 
+        window_layout = QtWidgets.QHBoxLayout()
+        window_layout.addWidget(QtWidgets.QLabel("History:"))
+        self.window_combo = QtWidgets.QComboBox()
+        self.window_combo.addItems(list(WINDOWS))
+        self.window_combo.currentTextChanged.connect(self._on_window_changed)
+        window_layout.addWidget(self.window_combo)
+        window_layout.addStretch()
+        system_layout.addLayout(window_layout)
+
         self.fig_cpu = Figure(figsize=(5, 2), dpi=100)
         self.ax_cpu = self.fig_cpu.add_subplot(111)
-        self.ax_cpu.set_title("CPU Usage")
-        self.ax_cpu.set_ylim(0, 100)
-        self.ax_cpu.set_xlabel("Time (s)")
-        self.ax_cpu.set_ylabel("Usage (%)")
-        self.ax_cpu.grid(True)
         self.canvas_cpu = FigureCanvas(self.fig_cpu)
         system_layout.addWidget(self.canvas_cpu)
 
         self.fig_mem = Figure(figsize=(5, 2), dpi=100)
         self.ax_mem = self.fig_mem.add_subplot(111)
-        self.ax_mem.set_title("Memory Usage")
-        self.ax_mem.set_ylim(0, 100)
-        self.ax_mem.set_xlabel("Time (s)")
-        self.ax_mem.set_ylabel("Usage (%)")
-        self.ax_mem.grid(True)
         self.canvas_mem = FigureCanvas(self.fig_mem)
         system_layout.addWidget(self.canvas_mem)
 
+        self.fig_cores = Figure(figsize=(5, 2), dpi=100)
+        self.ax_cores = self.fig_cores.add_subplot(111)
+        self.canvas_cores = FigureCanvas(self.fig_cores)
+        system_layout.addWidget(self.canvas_cores)
+
         details_layout.addWidget(system_group, stretch=1)
 
         # Process details
@@ -214,15 +365,98 @@ class ProcessMonitor(QtWidgets.QMainWindow):
             self.detail_labels[key] = label
         process_group_layout.addLayout(form_layout)
 
+        self.chart_tabs = QtWidgets.QTabWidget()
+        process_group_layout.addWidget(self.chart_tabs, stretch=1)
+
         # Process chart
         self.fig_process = Figure(figsize=(5, 2), dpi=100)
         self.ax_process = self.fig_process.add_subplot(111)
-        self.ax_process.set_title("Process Resource Usage")
-        self.ax_process.set_xlabel("Time (s)")
-        self.ax_process.set_ylabel("Usage (%)")
-        self.ax_process.grid(True)
         self.canvas_process = FigureCanvas(self.fig_process)
-        process_group_layout.addWidget(self.canvas_process, stretch=1)
+        self.chart_tabs.addTab(self.canvas_process, "Selected")
+
+        # Watched processes chart
+        watch_container = QtWidgets.QWidget()
+        watch_layout = QtWidgets.QVBoxLayout(watch_container)
+        watch_layout.setContentsMargins(0, 0, 0, 0)
+
+        watch_controls = QtWidgets.QHBoxLayout()
+        self.watch_add_btn = QtWidgets.QPushButton("Watch Selected")
+        self.watch_add_btn.clicked.connect(self.watch_selected_process)
+        watch_controls.addWidget(self.watch_add_btn)
+
+        self.watch_pattern_edit = QtWidgets.QLineEdit()
+        self.watch_pattern_edit.setPlaceholderText("Name or command line regex")
+        self.watch_pattern_edit.editingFinished.connect(self._apply_watch)
+        watch_controls.addWidget(self.watch_pattern_edit)
+
+        self.watch_clear_btn = QtWidgets.QPushButton("Clear")
+        self.watch_clear_btn.clicked.connect(self.clear_watch)
+        watch_controls.addWidget(self.watch_clear_btn)
+        watch_layout.addLayout(watch_controls)
+
+        self.fig_watch = Figure(figsize=(5, 2), dpi=100)
+        self.ax_watch = self.fig_watch.add_subplot(111)
+        self.canvas_watch = FigureCanvas(self.fig_watch)
+        watch_layout.addWidget(self.canvas_watch, stretch=1)
+        self.chart_tabs.addTab(watch_container, "Watched")
+
+        # Top consumers over a time window
+        top_container = QtWidgets.QWidget()
+        top_layout = QtWidgets.QVBoxLayout(top_container)
+        top_layout.setContentsMargins(0, 0, 0, 0)
+
+        top_controls = QtWidgets.QHBoxLayout()
+        top_controls.addWidget(QtWidgets.QLabel("Window:"))
+        self.top_window_combo = QtWidgets.QComboBox()
+        self.top_window_combo.addItems(list(TOP_WINDOWS))
+        self.top_window_combo.currentTextChanged.connect(self._update_top_consumers)
+        top_controls.addWidget(self.top_window_combo)
+        top_controls.addWidget(QtWidgets.QLabel("By:"))
+        self.top_by_combo = QtWidgets.QComboBox()
+        self.top_by_combo.addItems(["CPU", "Memory"])
+        self.top_by_combo.currentTextChanged.connect(self._update_top_consumers)
+        top_controls.addWidget(self.top_by_combo)
+        top_controls.addStretch(1)
+        top_layout.addLayout(top_controls)
+
+        self.top_tree = QtWidgets.QTreeWidget()
+        self.top_tree.setHeaderLabels(["PID", "Name", "Avg CPU %", "Avg Mem %"])
+        self.top_tree.setRootIsDecorated(False)
+        self.top_tree.setUniformRowHeights(True)
+        self.top_tree.itemDoubleClicked.connect(self._on_top_consumer_activated)
+        top_layout.addWidget(self.top_tree, stretch=1)
+        self.chart_tabs.addTab(top_container, "Top")
+
+        # Alert rules and log
+        alerts_container = QtWidgets.QWidget()
+        alerts_layout = QtWidgets.QVBoxLayout(alerts_container)
+        alerts_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.alert_rules_edit = QtWidgets.QPlainTextEdit()
+        self.alert_rules_edit.setPlaceholderText(
+            "One rule per line, for example:\n"
+            "watched.cpu > 80 for 30s\n"
+            "system.mem rate > 1%/min over 5m"
+        )
+        self.alert_rules_edit.setMaximumHeight(80)
+        alerts_layout.addWidget(self.alert_rules_edit)
+
+        alert_controls = QtWidgets.QHBoxLayout()
+        apply_rules_btn = QtWidgets.QPushButton("Apply Rules")
+        apply_rules_btn.clicked.connect(self._apply_alert_rules)
+        alert_controls.addWidget(apply_rules_btn)
+        clear_log_btn = QtWidgets.QPushButton("Clear Log")
+        clear_log_btn.clicked.connect(self.clear_alert_log)
+        alert_controls.addWidget(clear_log_btn)
+        alert_controls.addStretch(1)
+        alerts_layout.addLayout(alert_controls)
+
+        self.alert_log_tree = QtWidgets.QTreeWidget()
+        self.alert_log_tree.setHeaderLabels(["Time", "Subject", "Alert"])
+        self.alert_log_tree.setRootIsDecorated(False)
+        self.alert_log_tree.setUniformRowHeights(True)
+        alerts_layout.addWidget(self.alert_log_tree, stretch=1)
+        self.chart_tabs.addTab(alerts_container, "Alerts")
 
         details_layout.addWidget(process_group, stretch=1)
         splitter.addWidget(details_container)
@@ -230,7 +464,7 @@ class ProcessMonitor(QtWidgets.QMainWindow):
         splitter.setStretchFactor(0, 1)
         splitter.setStretchFactor(1, 1)
 
-        # Initialize chart manager once canvases are ready
+        # Initialize chart manager once canvases are ready; it sets up the axes
         self.chart_manager = ChartManager(
             self.canvas_cpu,
             self.canvas_mem,
@@ -238,41 +472,71 @@ class ProcessMonitor(QtWidgets.QMainWindow):
             self.ax_cpu,
             self.ax_mem,
             self.ax_process,
+            retention=self.retention,
+            canvas_watch=self.canvas_watch,
+            ax_watch=self.ax_watch,
+            canvas_cores=self.canvas_cores,
+            ax_cores=self.ax_cores,
         )
 
     # ------------------------------------------------------------------
     # Data handling
     # ------------------------------------------------------------------
-    def _handle_data_update(self, data: dict) -> None:
+    def _handle_data_update(self, data: MetricsPayload) -> None:
+        # ``data`` is recycled once this returns; everything below copies
+        # the values it keeps.
         if not self.running:
             return
 
         if self.chart_manager is None:
             return
 
-        self.latest_metrics = data
+        if data.refresh_processes:
+            self._schedule_process_list_update()
 
         try:
             self.chart_manager.add_data_point(
-                data["system_cpu"],
-                data["system_mem"],
-                data["process_cpu"],
-                data["process_mem"],
+                data.system_cpu,
+                data.system_mem,
+                data.process_cpu,
+                data.process_mem,
+                data.timestamp,
             )
-            self.chart_manager.update_charts(self.selected_pid)
+            self.chart_manager.add_watch_samples(data.watched, data.timestamp)
+            system = data.system
+            self.chart_manager.add_core_sample(system.per_cpu)
+            if self._is_shown():
+                # Hidden charts keep their dirty flags and catch up on restore
+                self.chart_manager.update_charts(self.selected_pid)
+            self._update_watch_tab()
+            self._update_schedule_label(data)
 
-            mem = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
             status_message = (
-                f"CPU: {data['system_cpu']:.1f}% | "
-                f"Memory: {mem.percent:.1f}% ({self.format_bytes(mem.used)}/"
-                f"{self.format_bytes(mem.total)}) | "
-                f"Disk: {disk.percent:.1f}%"
+                f"CPU: {system.cpu:.1f}% | "
+                f"Memory: {system.memory_percent:.1f}% ({self.format_bytes(system.memory_used)}/"
+                f"{self.format_bytes(system.memory_total)}) | "
+                f"Disk: {system.disk_percent:.1f}% "
+                f"(R {self.format_bytes(system.disk_read)}/s, "
+                f"W {self.format_bytes(system.disk_write)}/s) | "
+                f"Net: in {self.format_bytes(system.net_received)}/s, "
+                f"out {self.format_bytes(system.net_sent)}/s"
             )
             self.status.showMessage(status_message)
         except Exception as exc:  # pragma: no cover - defensive
             self.status.showMessage(f"Error updating charts: {exc}")
 
+        summary = self.tick_profiler.tick()
+        if summary is not None:
+            print(summary, file=sys.stderr, flush=True)
+            self.status.showMessage(f"Profile written to {self.tick_profiler.path}")
+
+    def _update_schedule_label(self, data: MetricsPayload) -> None:
+        self.schedule_label.setText(
+            f"Sampling {data.interval_ms / 1000:g} s ({data.mode}), "
+            f"list {data.process_period_ms / 1000:g} s | "
+            f"overhead {data.overhead:.1f}% of {data.budget:g}% budget"
+        )
+
     def _schedule_process_list_update(self) -> None:
         if not self.running:
             return
@@ -280,18 +544,33 @@ class ProcessMonitor(QtWidgets.QMainWindow):
         if self._process_update_running:
             return
 
-        worker = ProcessListWorker(self.data_collector.collect_process_list)
+        worker = ProcessListWorker(self._collect_process_list)
         worker.signals.result.connect(self._handle_process_list_result)
         worker.signals.error.connect(self._handle_process_list_error)
         worker.signals.finished.connect(self._process_list_finished)
         self._process_update_running = True
         self.thread_pool.start(worker)
 
+    def _collect_process_list(self) -> tuple:
+        """Runs in the thread pool: collect the list and index it for search."""
+        return self.tick_profiler.call(self._collect_and_index)
+
+    def _collect_and_index(self) -> tuple:
+        snapshot, process_cache = self.data_collector.collect_process_list()
+        return snapshot, process_cache, SearchIndex(snapshot)
+
     def _handle_process_list_result(self, result: tuple) -> None:
-        process_list, process_cache = result
-        self.all_processes = process_list
+        snapshot, process_cache, search_index = result
         self.data_collector.update_process_cache(process_cache)
+        self._update_top_consumers()
+        if self.recording is not None:
+            return
+        self.all_processes = snapshot
+        self.search_index = search_index
         self._apply_process_filter()
+        if self._search_query is not None:
+            # New processes are matched against the fresh index
+            self._start_search()
 
     def _handle_process_list_error(self, message: str) -> None:
         self.status.showMessage(f"Error collecting processes: {message}")
@@ -300,67 +579,117 @@ class ProcessMonitor(QtWidgets.QMainWindow):
         self._process_update_running = False
 
     def _apply_process_filter(self) -> None:
-        process_list = list(self.all_processes)
-        if not process_list:
-            self.process_tree.clear()
-            return
+        self._ignore_selection_changes = True
+        try:
+            self.process_model.apply_snapshot(self.all_processes)
+        finally:
+            self._ignore_selection_changes = False
+        self._update_filter_status()
+        self._restore_selection()
+        self._update_live_details()
 
-        sort_key = self.sort_combo.currentText()
-        if sort_key == "CPU":
-            process_list.sort(key=lambda x: x['cpu'], reverse=True)
-        elif sort_key == "Memory":
-            process_list.sort(key=lambda x: x['memory'], reverse=True)
-        elif sort_key == "PID":
-            process_list.sort(key=lambda x: x['pid'])
-        else:  # Name
-            process_list.sort(key=lambda x: x['name'].lower())
-
-        search_text = self.search_edit.text().strip().lower()
-
-        self.process_tree.setUpdatesEnabled(False)
-        self.process_tree.clear()
-        displayed_count = 0
-
-        for proc in process_list:
-            if search_text and search_text not in proc['name'].lower():
-                continue
-
-            item = QtWidgets.QTreeWidgetItem([
-                str(proc['pid']),
-                proc['name'],
-                f"{proc['cpu']:.1f}",
-                f"{proc['memory']:.1f}",
-                str(proc['threads']),
-                proc['status'],
-            ])
-            item.setTextAlignment(0, QtCore.Qt.AlignmentFlag.AlignCenter)
-            for col in range(2, 5):
-                item.setTextAlignment(col, QtCore.Qt.AlignmentFlag.AlignCenter)
-            self.process_tree.addTopLevelItem(item)
-            displayed_count += 1
-
-        self.process_tree.setUpdatesEnabled(True)
-
-        if displayed_count == 0:
+    def _update_filter_status(self) -> None:
+        displayed_count = self.process_model.shown_count
+        total_count = self.process_model.total_count
+        if total_count and displayed_count == 0:
             self.status.showMessage("No processes match the current filter")
-        elif search_text:
-            self.status.showMessage(f"Showing {displayed_count} of {len(process_list)} processes")
+        elif displayed_count != total_count:
+            self.status.showMessage(f"Showing {displayed_count} of {total_count} processes")
 
+    def _apply_sort(self, sort_key: str) -> None:
+        column, order = SORT_COLUMNS.get(sort_key, SORT_COLUMNS["CPU"])
+        self.process_tree.sortByColumn(column, order)
+
+    def _set_tree_mode(self, enabled: bool) -> None:
+        """Switch the process view between the flat table and the process tree."""
+        model = self.tree_model if enabled else self.table_model
+        if model is self.process_model:
+            return
+        # The inactive model is emptied so it does not hold a stale snapshot
+        self.process_model.apply_snapshot(None)
+        self.process_model.set_filter(None)
+        self._expanded_pids.clear()
+
+        self._ignore_selection_changes = True
+        try:
+            self.process_model = model
+            sort_column = self.process_tree.header().sortIndicatorSection()
+            sort_order = self.process_tree.header().sortIndicatorOrder()
+            self.process_tree.setModel(model)
+            self.process_tree.setRootIsDecorated(enabled)
+            self.process_tree.selectionModel().selectionChanged.connect(self.on_process_select)
+            self._configure_process_header()
+            self.process_tree.sortByColumn(sort_column, sort_order)
+            model.apply_snapshot(self.all_processes)
+        finally:
+            self._ignore_selection_changes = False
+        # Re-applies the search to the new model
+        self._start_search()
+        self._update_filter_status()
         self._restore_selection()
 
     # ------------------------------------------------------------------
     # Event handlers
     # ------------------------------------------------------------------
+    def _on_window_changed(self, label: str) -> None:
+        self.chart_manager.set_window(WINDOWS[label])
+        self.chart_manager.update_charts(self.selected_pid)
+
     def _on_header_clicked(self, index: int) -> None:
-        mapping = {0: "PID", 1: "Name", 2: "CPU", 3: "Memory"}
-        if index in mapping:
-            with QtCore.QSignalBlocker(self.sort_combo):
-                self.sort_combo.setCurrentText(mapping[index])
-            self._apply_process_filter()
+        for sort_key, (column, _order) in SORT_COLUMNS.items():
+            if column == index:
+                with QtCore.QSignalBlocker(self.sort_combo):
+                    self.sort_combo.setCurrentText(sort_key)
+                break
+
+    def _on_process_expanded(self, index: QtCore.QModelIndex) -> None:
+        self._expanded_pids.add(self.process_model.pid_for_index(index))
+
+    def _on_process_collapsed(self, index: QtCore.QModelIndex) -> None:
+        self._expanded_pids.discard(self.process_model.pid_for_index(index))
+        # Collapsed subtrees are dropped from the model until expanded again;
+        # a process selected inside one stays the one shown in the details.
+        self._ignore_selection_changes = True
+        try:
+            self.process_model.release(index)
+        finally:
+            self._ignore_selection_changes = False
+
+    def _restore_expanded(self) -> None:
+        """Expand the remembered PIDs again after the tree was rebuilt."""
+        model = self.process_model
+        pending = [QtCore.QModelIndex()]
+        while pending:
+            parent = pending.pop()
+            for row in range(model.rowCount(parent)):
+                index = model.index(row, 0, parent)
+                if model.pid_for_index(index) in self._expanded_pids:
+                    self.process_tree.expand(index)
+                    pending.append(index)
+
+    def _selected_view_pid(self) -> Optional[int]:
+        """PID shown in the details panel: the current row, else the first selected."""
+        selection = self.process_tree.selectionModel()
+        current = self.process_tree.currentIndex()
+        if current.isValid() and selection.isRowSelected(current.row(), current.parent()):
+            return self.process_model.pid_for_index(current)
+        rows = selection.selectedRows()
+        if not rows:
+            return None
+        return self.process_model.pid_for_index(rows[0])
+
+    def _selected_view_pids(self) -> list:
+        return [
+            self.process_model.pid_for_index(index)
+            for index in self.process_tree.selectionModel().selectedRows()
+        ]
 
     def on_process_select(self) -> None:
-        selected_items = self.process_tree.selectedItems()
-        if not selected_items:
+        if self._ignore_selection_changes:
+            return
+
+        pid = self._selected_view_pid()
+        if pid is None:
             self.selected_pid = None
             self.data_collector.set_selected_pid(None)
             self.chart_manager.reset_process_data()
@@ -369,61 +698,460 @@ class ProcessMonitor(QtWidgets.QMainWindow):
                 label.setText("-")
             return
 
-        item = selected_items[0]
-        pid = int(item.text(0))
+        if pid == self.selected_pid:
+            return
         self.selected_pid = pid
         self.data_collector.set_selected_pid(pid)
         self.chart_manager.reset_process_data()
+        self._update_live_details()
 
-        try:
-            proc = self.data_collector.get_process(pid) or psutil.Process(pid)
-            if not proc.is_running():
-                raise psutil.NoSuchProcess(pid)
-
-            self.detail_labels["PID"].setText(str(pid))
-            self.detail_labels["Name"].setText(proc.name())
-            self.detail_labels["CPU %"].setText(f"{proc.cpu_percent(interval=None):.1f}%")
-            self.detail_labels["Memory %"].setText(f"{proc.memory_percent():.1f}%")
-            self.detail_labels["Threads"].setText(str(proc.num_threads()))
-
-            try:
-                created = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(proc.create_time()))
-                self.detail_labels["Created"].setText(created)
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                self.detail_labels["Created"].setText("N/A")
-
-            try:
-                self.detail_labels["Path"].setText(proc.exe())
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                self.detail_labels["Path"].setText("N/A")
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            for key in self.detail_labels:
+        self.detail_labels["Path"].setToolTip("")
+        if self.recording is not None:
+            # The PID may belong to another process by now
+            self.detail_labels["Created"].setText("-")
+            self.detail_labels["Path"].setText("-")
+            return
+
+        # Path and start time never change; read them once per process in
+        # the thread pool instead of blocking on /proc here.
+        info = self.data_collector.cached_process_info(pid)
+        if info is not None and info.complete:
+            self._show_process_info(info)
+            return
+        self.detail_labels["Created"].setText("...")
+        self.detail_labels["Path"].setText("...")
+        worker = ProcessListWorker(self.data_collector.fetch_process_info, pid)
+        worker.signals.result.connect(self._show_process_info)
+        worker.signals.error.connect(self._handle_process_info_error)
+        self.thread_pool.start(worker)
+
+    def _show_process_info(self, info: ProcessInfo) -> None:
+        if info.pid != self.selected_pid or self.recording is not None:
+            return  # the selection moved on while it was read
+        if not info.running:
+            self.detail_labels["Created"].setText("N/A")
+            self.detail_labels["Path"].setText("N/A")
+            return
+        created = "N/A"
+        if info.create_time:
+            created = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(info.create_time))
+        self.detail_labels["Created"].setText(created)
+        self.detail_labels["Path"].setText(info.exe or "N/A")
+        self.detail_labels["Path"].setToolTip(info.cmdline or "")
+
+    def _handle_process_info_error(self, message: str) -> None:
+        self.status.showMessage(f"Error reading process details: {message}")
+
+    def _update_live_details(self) -> None:
+        """Refresh the detail fields that come from the process table."""
+        if self.selected_pid is None:
+            return
+
+        row = self.process_model.process_row(self.selected_pid)
+        if row is None:
+            for key in ("CPU %", "Memory %", "Threads"):
                 self.detail_labels[key].setText("N/A")
+            return
 
-    def end_selected_process(self) -> None:
+        pid, name, cpu, memory, threads, _status = row
+        self.detail_labels["PID"].setText(str(pid))
+        self.detail_labels["Name"].setText(name)
+        self.detail_labels["CPU %"].setText(f"{cpu:.1f}%")
+        self.detail_labels["Memory %"].setText(f"{memory:.1f}%")
+        self.detail_labels["Threads"].setText(str(threads))
+
+    def _on_jump_requested(self) -> None:
+        text = self.jump_edit.text()
+        if text:
+            self.jump_to_pid(int(text))
+
+    def jump_to_pid(self, pid: int) -> None:
+        index = self.process_model.index_for_pid(pid)
+        if not index.isValid() and self._search_query is not None:
+            # Possibly hidden by the current search; show everything again.
+            with QtCore.QSignalBlocker(self.search_edit):
+                self.search_edit.clear()
+            self.search_timer.stop()
+            self._start_search()
+            index = self.process_model.index_for_pid(pid)
+        if not index.isValid():
+            self.status.showMessage(f"PID {pid} not found")
+            return
+
+        self.process_tree.setCurrentIndex(index)
+        self.process_tree.scrollTo(index)
+
+    def watch_selected_process(self) -> None:
         if self.selected_pid is None:
             return
+        self.watch_pids.add(self.selected_pid)
+        self._apply_watch()
 
+    def clear_watch(self) -> None:
+        self.watch_pids.clear()
+        self.watch_pattern_edit.clear()
+        self._apply_watch()
+
+    def _apply_watch(self) -> None:
+        pattern = self.watch_pattern_edit.text().strip()
         try:
-            proc = psutil.Process(self.selected_pid)
-            proc.terminate()
-            self.status.showMessage(f"Process {self.selected_pid} terminated")
+            self.data_collector.set_watch(self.watch_pids, pattern or None)
+        except re.error as exc:
+            self.status.showMessage(f"Invalid watch pattern: {exc}")
+            return
+        if pattern:
+            # Pattern matches are resolved with the process list
             self._schedule_process_list_update()
-        except (psutil.NoSuchProcess, psutil.AccessDenied) as exc:
-            self.status.showMessage(f"Error terminating process: {exc}")
+
+    def _update_watch_tab(self) -> None:
+        count = len(self.chart_manager.watch_history)
+        label = f"Watched ({count})" if count else "Watched"
+        if self.chart_tabs.tabText(1) != label:
+            self.chart_tabs.setTabText(1, label)
+
+    def _update_top_consumers(self, _text: str = "") -> None:
+        """Show the cached ranking; reading it is O(k)."""
+        window = TOP_WINDOWS[self.top_window_combo.currentText()]
+        by = "cpu" if self.top_by_combo.currentText() == "CPU" else "memory"
+        consumers = self.data_collector.top_consumers.top(window, by)
+
+        self.top_tree.clear()
+        for consumer in consumers:
+            item = QtWidgets.QTreeWidgetItem(
+                [
+                    str(consumer.pid),
+                    consumer.name,
+                    f"{consumer.cpu:.1f}",
+                    f"{consumer.memory:.1f}",
+                ]
+            )
+            for column in (0, 2, 3):
+                item.setTextAlignment(column, QtCore.Qt.AlignmentFlag.AlignRight)
+            self.top_tree.addTopLevelItem(item)
+
+    def _on_top_consumer_activated(self, item: QtWidgets.QTreeWidgetItem, _column: int) -> None:
+        self.jump_to_pid(int(item.text(0)))
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+    def _choose_export(self, what: str) -> None:
+        titles = {
+            "history": "Export Metric History",
+            "processes": "Export Process Table",
+            "recording": "Export Recorded Processes",
+        }
+        path, selected_filter = QtWidgets.QFileDialog.getSaveFileName(
+            self, titles[what], f"{what}.csv", FILE_FILTERS
+        )
+        if not path:
+            return
+        if not path.endswith((".csv", ".csv.gz", ".parquet")):
+            if "Parquet" in selected_filter:
+                path += ".parquet"
+            else:
+                path += ".csv.gz" if "Compressed" in selected_filter else ".csv"
+        self.export(what, path)
+
+    def export(self, what: str, path: str) -> None:
+        """Write ``what`` ("history", "processes" or "recording") to ``path`` in the background."""
+        if what == "history":
+            # Copied here, where the samples are appended; written by the worker
+            timestamps, series = copy_history(self.chart_manager.store.raw)
+            job = functools.partial(export_series, path, timestamps, series)
+        elif what == "processes":
+            snapshots = [self.all_processes] if self.all_processes is not None else []
+            job = functools.partial(export_snapshots, path, snapshots)
+        elif what == "recording" and self.recording is not None:
+            # Closing the window cancels the export instead of waiting for it
+            job = functools.partial(
+                export_recording, self.recording.path, path, "processes", lambda: not self.running
+            )
+        else:
+            return
+
+        worker = ProcessListWorker(lambda: (path, job()))
+        worker.signals.result.connect(self._export_finished)
+        worker.signals.error.connect(self._handle_export_error)
+        self.thread_pool.start(worker)
+        self.status.showMessage(f"Exporting to {path}...")
+
+    def _export_finished(self, result: tuple) -> None:
+        path, rows = result
+        self.status.showMessage(f"Exported {rows} rows to {path}")
+
+    def _handle_export_error(self, message: str) -> None:
+        self.status.showMessage(f"Export failed: {message}")
+
+    # ------------------------------------------------------------------
+    # Profiling
+    # ------------------------------------------------------------------
+    def _choose_profile_ticks(self) -> None:
+        ticks, ok = QtWidgets.QInputDialog.getInt(
+            self, "Profile Next Ticks", "Ticks to profile:", 20, 1, 10000
+        )
+        if ok:
+            self.profile_ticks(ticks)
+
+    def profile_ticks(self, ticks: int, path: Optional[str] = None) -> None:
+        """Profile the next ``ticks`` metrics ticks and dump cProfile stats."""
+        path = self.tick_profiler.start(ticks, path)
+        self.status.showMessage(f"Profiling {ticks} ticks to {path}")
+
+    # ------------------------------------------------------------------
+    # Alerts
+    # ------------------------------------------------------------------
+    def _apply_alert_rules(self) -> None:
+        try:
+            rules = self.data_collector.set_alert_rules(
+                self.alert_rules_edit.toPlainText().splitlines()
+            )
+        except ValueError as exc:
+            self.status.showMessage(f"Invalid alert rule: {exc}")
+            return
+        self.status.showMessage(f"{len(rules)} alert rule(s) active")
+
+    def _handle_alert(self, alert: Alert) -> None:
+        item = QtWidgets.QTreeWidgetItem(
+            [
+                time.strftime("%H:%M:%S", time.localtime(alert.timestamp)),
+                alert.subject,
+                alert.message,
+            ]
+        )
+        self.alert_log_tree.insertTopLevelItem(0, item)
+        while self.alert_log_tree.topLevelItemCount() > ALERT_LOG_SIZE:
+            self.alert_log_tree.takeTopLevelItem(ALERT_LOG_SIZE)
+        self.alert_label.setText(f"Alert: {alert}")
+        self._notify(alert)
+
+    def _notify(self, alert: Alert) -> None:
+        """Show a desktop notification, or flash the window without a tray."""
+        if not QtWidgets.QSystemTrayIcon.isSystemTrayAvailable():
+            QtWidgets.QApplication.alert(self)
+            return
+        if self._tray_icon is None:
+            icon = self.style().standardIcon(
+                QtWidgets.QStyle.StandardPixmap.SP_MessageBoxWarning
+            )
+            self._tray_icon = QtWidgets.QSystemTrayIcon(icon, self)
+            self._tray_icon.show()
+        self._tray_icon.showMessage(
+            "Process Monitor alert",
+            alert.message,
+            QtWidgets.QSystemTrayIcon.MessageIcon.Warning,
+        )
+
+    def clear_alert_log(self) -> None:
+        self.data_collector.alert_log.clear()
+        self.alert_log_tree.clear()
+        self.alert_label.clear()
+
+    # ------------------------------------------------------------------
+    # Recording playback
+    # ------------------------------------------------------------------
+    def _choose_recording(self) -> None:
+        path, _filter = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Open Recording", "", "Metric logs (*.pmlog);;All files (*)"
+        )
+        if path:
+            self.open_recording(path)
+
+    def open_recording(self, path: str) -> None:
+        """Show the process table and system charts from a recorded metric log."""
+        try:
+            reader = MetricLogReader(path)
+        except (OSError, MetricLogError) as exc:
+            self.status.showMessage(f"Cannot open recording: {exc}")
+            return
+        if not reader.snapshot_count and not len(reader.sample_times):
+            reader.close()
+            self.status.showMessage(f"{path} contains no data")
+            return
+
+        if self.recording is not None:
+            self.recording.close()
+        self.recording = reader
+        self.end_btn.setEnabled(False)
+        self.live_action.setEnabled(True)
+        self.export_recording_action.setEnabled(True)
+        self.playback_label.setText(f"Recording: {path}")
+        self.playback_bar.show()
+
+        with QtCore.QSignalBlocker(self.playback_slider):
+            self.playback_slider.setRange(0, max(int(reader.end_time - reader.start_time), 0))
+            self.playback_slider.setValue(self.playback_slider.maximum())
+        self._scrub_recording(self.playback_slider.value())
+
+    def _scrub_recording(self, offset: int) -> None:
+        reader = self.recording
+        if reader is None:
+            return
+        timestamp = reader.start_time + offset
+        self.playback_time_label.setText(
+            time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
+        )
+        self.chart_manager.show_recording(
+            reader.sample_times, reader.sample_cpu, reader.sample_mem, timestamp
+        )
+        snapshot = reader.snapshot_at(timestamp)
+        if snapshot is not None:
+            self.all_processes = snapshot
+            self.search_index = SearchIndex(snapshot)
+            self._apply_process_filter()
+            if self._search_query is not None:
+                self._start_search()
+
+    def close_recording(self) -> None:
+        """Leave playback and resume showing live data."""
+        if self.recording is None:
+            return
+        self.recording.close()
+        self.recording = None
+        self.playback_bar.hide()
+        self.end_btn.setEnabled(True)
+        self.live_action.setEnabled(False)
+        self.export_recording_action.setEnabled(False)
+        self.chart_manager.show_live()
+        self.chart_manager.update_charts(self.selected_pid)
+        self._schedule_process_list_update()
+
+    def end_selected_process(self) -> None:
+        self.run_process_action(TERMINATE)
+
+    def _show_process_menu(self, position: QtCore.QPoint) -> None:
+        if self.recording is not None or not self._selected_view_pids():
+            return
+        menu = QtWidgets.QMenu(self)
+        menu.addAction("Terminate", lambda: self.run_process_action(TERMINATE))
+        menu.addAction("Kill", lambda: self.run_process_action(KILL))
+        menu.addSeparator()
+        menu.addAction("Suspend", lambda: self.run_process_action(SUSPEND))
+        menu.addAction("Resume", lambda: self.run_process_action(RESUME))
+        if psutil.POSIX:
+            menu.addAction("Renice...", self._choose_nice)
+        menu.exec(self.process_tree.viewport().mapToGlobal(position))
+
+    def _choose_nice(self) -> None:
+        nice, ok = QtWidgets.QInputDialog.getInt(
+            self, "Renice", "Nice value (-20 is highest priority):", 10, -20, 19
+        )
+        if ok:
+            self.run_process_action(RENICE, nice)
+
+    def run_process_action(self, action: str, nice: Optional[int] = None) -> None:
+        """Apply ``action`` to every selected process in the thread pool."""
+        if self.recording is not None:
+            return
+        pids = self._selected_view_pids()
+        if not pids:
+            return
+        if len(pids) > 1:
+            answer = QtWidgets.QMessageBox.question(
+                self, "Process Monitor", f"{action.capitalize()} {len(pids)} processes?"
+            )
+            if answer != QtWidgets.QMessageBox.StandardButton.Yes:
+                return
+
+        worker = ProcessListWorker(self.data_collector.run_process_action, action, pids, nice)
+        worker.signals.result.connect(self._handle_action_result)
+        worker.signals.error.connect(self._handle_action_error)
+        self.thread_pool.start(worker)
+        self.status.showMessage(f"{action.capitalize()}: {len(pids)} process(es)...")
+
+    def _handle_action_result(self, result: ActionResult) -> None:
+        self.status.showMessage(result.summary())
+        if result.gone and self.recording is None:
+            self._remove_processes(result.gone)
+
+    def _handle_action_error(self, message: str) -> None:
+        self.status.showMessage(f"Error signalling processes: {message}")
+
+    def _remove_processes(self, pids: list) -> None:
+        """Drop exited processes from the view without waiting for the next refresh."""
+        if self.all_processes is not None:
+            # Keeps them from coming back if the filter is re-applied first
+            self.all_processes = self.all_processes.without(pids)
+        self._ignore_selection_changes = True
+        try:
+            self.process_model.remove_pids(pids)
+        finally:
+            self._ignore_selection_changes = False
+        if self.selected_pid in pids and self._selected_view_pids():
+            # The rest of a multi-selection stays selected; show one of them
+            self.on_process_select()
+        else:
+            self._restore_selection()
+        self._update_live_details()
 
     def filter_processes(self, _text: str) -> None:
-        self._apply_process_filter()
+        # Restarted on every keystroke; the search runs once typing pauses
+        self.search_timer.start()
+
+    def _start_search(self) -> None:
+        """Match the search box against the name index in the thread pool."""
+        try:
+            query = parse_query(self.search_edit.text())
+        except (re.error, ValueError) as exc:
+            self.status.showMessage(f"Invalid search: {exc}")
+            return
+
+        self._search_query = query
+        self._search_generation += 1
+        if query is None:
+            self._show_search_result(None)
+            return
+
+        # Command lines of a recording are unknown; don't match live ones
+        cmdline = self.data_collector.cmdline if self.recording is None else None
+        worker = ProcessListWorker(self.search_index.match, query, cmdline)
+        worker.signals.result.connect(
+            functools.partial(self._handle_search_result, self._search_generation)
+        )
+        worker.signals.error.connect(self._handle_search_error)
+        self.thread_pool.start(worker)
+
+    def _handle_search_result(self, generation: int, pids: FrozenSet[int]) -> None:
+        if generation != self._search_generation:
+            return  # superseded by a newer search
+        self._show_search_result(pids)
+
+    def _handle_search_error(self, message: str) -> None:
+        self.status.showMessage(f"Error searching processes: {message}")
+
+    def _show_search_result(self, pids: Optional[FrozenSet[int]]) -> None:
+        self._ignore_selection_changes = True
+        try:
+            self.process_model.set_filter(pids)
+            if self.process_model is self.tree_model:
+                self._restore_expanded()
+        finally:
+            self._ignore_selection_changes = False
+        self._update_filter_status()
+        self._restore_selection()
 
     def _restore_selection(self) -> None:
-        if self.selected_pid is None:
+        """Reselect ``selected_pid`` after rows were removed, filtered or moved.
+
+        Qt moves the selection to a neighbouring row when the selected one
+        disappears; that row is deselected rather than adopted, so the details
+        panel keeps following the process the user picked.
+        """
+        if self.selected_pid is not None and self.selected_pid in self._selected_view_pids():
             return
 
-        for row in range(self.process_tree.topLevelItemCount()):
-            item = self.process_tree.topLevelItem(row)
-            if int(item.text(0)) == self.selected_pid:
-                self.process_tree.setCurrentItem(item)
-                break
+        index = QtCore.QModelIndex()
+        if self.selected_pid is not None:
+            index = self.process_model.index_for_pid(self.selected_pid)
+
+        self._ignore_selection_changes = True
+        try:
+            if index.isValid():
+                self.process_tree.setCurrentIndex(index)
+            else:
+                self.process_tree.selectionModel().clear()
+        finally:
+            self._ignore_selection_changes = False
 
     # ------------------------------------------------------------------
     # Utility helpers
@@ -439,11 +1167,28 @@ class ProcessMonitor(QtWidgets.QMainWindow):
     # ------------------------------------------------------------------
     # Qt event overrides
     # ------------------------------------------------------------------
+    def _is_shown(self) -> bool:
+        return self.isVisible() and not self.isMinimized()
+
+    def showEvent(self, event: QtGui.QShowEvent) -> None:  # type: ignore[name-defined]
+        super().showEvent(event)
+        self.data_collector.set_visible(self._is_shown())
+
+    def hideEvent(self, event: QtGui.QHideEvent) -> None:  # type: ignore[name-defined]
+        super().hideEvent(event)
+        self.data_collector.set_visible(False)
+
+    def changeEvent(self, event: QtCore.QEvent) -> None:
+        super().changeEvent(event)
+        if event.type() == QtCore.QEvent.Type.WindowStateChange:
+            self.data_collector.set_visible(self._is_shown())
+
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:  # type: ignore[name-defined]
         self.running = False
-        self.process_refresh_timer.stop()
         self.data_collector.stop()
         self.thread_pool.waitForDone()
+        if self.recording is not None:
+            self.recording.close()
         super().closeEvent(event)
 
 
@@ -0,0 +1,137 @@
+"""Search box queries matched against a lowercase index of the process list."""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, FrozenSet, List, Optional, Tuple
+
+from data_collector import ProcessSnapshot
+
+NAME, NAME_REGEX, PID_RANGES, CMDLINE, CMDLINE_REGEX = range(5)
+
+
+class SearchQuery:
+    """A parsed search box entry.
+
+    ``text``           name contains ``text``; a bare number also matches the PID
+    ``/regex/``        name matches ``regex``
+    ``pid:1-100,200``  PID within any of the ranges
+    ``cmd:text``       command line contains ``text`` (``cmd:/regex/`` for a regex)
+
+    Matching is case-insensitive throughout.
+    """
+
+    __slots__ = ("kind", "text", "pattern", "ranges")
+
+    def __init__(
+        self,
+        kind: int,
+        text: str = "",
+        pattern: Optional[re.Pattern] = None,
+        ranges: Tuple[Tuple[int, int], ...] = (),
+    ) -> None:
+        self.kind = kind
+        self.text = text
+        self.pattern = pattern
+        self.ranges = ranges
+
+    @property
+    def needs_cmdline(self) -> bool:
+        return self.kind in (CMDLINE, CMDLINE_REGEX)
+
+
+def _parse_ranges(spec: str) -> Tuple[Tuple[int, int], ...]:
+    ranges = []
+    for part in filter(None, (part.strip() for part in spec.split(","))):
+        first, _dash, last = part.partition("-")
+        try:
+            low = int(first)
+            high = int(last) if last else low
+        except ValueError:
+            raise ValueError(f"invalid PID range {part!r}") from None
+        ranges.append((min(low, high), max(low, high)))
+    if not ranges:
+        raise ValueError("no PID given")
+    return tuple(ranges)
+
+
+def parse_query(text: str) -> Optional[SearchQuery]:
+    """Parse search box ``text``; None means show everything.
+
+    Raises ``re.error`` for an invalid regular expression and ``ValueError``
+    for an invalid PID range.
+    """
+    text = text.strip()
+    if not text:
+        return None
+
+    lowered = text.lower()
+    if lowered.startswith("pid:"):
+        return SearchQuery(PID_RANGES, ranges=_parse_ranges(text[4:]))
+    if lowered.startswith("cmd:"):
+        spec = text[4:].strip()
+        if len(spec) > 1 and spec.startswith("/") and spec.endswith("/"):
+            return SearchQuery(CMDLINE_REGEX, pattern=re.compile(spec[1:-1], re.IGNORECASE))
+        return SearchQuery(CMDLINE, text=spec.lower())
+    if len(text) > 1 and text.startswith("/") and text.endswith("/"):
+        return SearchQuery(NAME_REGEX, pattern=re.compile(text[1:-1], re.IGNORECASE))
+    return SearchQuery(NAME, text=lowered)
+
+
+class SearchIndex:
+    """PIDs and lowercase names of one snapshot, built once per refresh.
+
+    Built off the GUI thread together with the snapshot, so a search only
+    scans precomputed strings.
+    """
+
+    __slots__ = ("pids", "names")
+
+    def __init__(self, snapshot: Optional[ProcessSnapshot] = None) -> None:
+        self.pids: List[int] = []
+        self.names: List[str] = []
+        if snapshot is not None:
+            # Many processes share a name; lowercase each distinct one once
+            lowered = {}
+            self.pids = list(snapshot.pids)
+            self.names = [
+                lowered.get(name) or lowered.setdefault(name, name.lower())
+                for name in snapshot.names
+            ]
+
+    def __len__(self) -> int:
+        return len(self.pids)
+
+    def match(
+        self, query: SearchQuery, cmdline: Optional[Callable[[int], str]] = None
+    ) -> FrozenSet[int]:
+        """Return the PIDs matching ``query``.
+
+        ``cmdline`` returns the command line of a PID; without it command
+        line queries match nothing.
+        """
+        pids, names = self.pids, self.names
+        kind = query.kind
+        if kind == NAME:
+            text = query.text
+            matched = {pid for pid, name in zip(pids, names) if text in name}
+            if text.isdigit():
+                pid = int(text)
+                if pid in set(pids):
+                    matched.add(pid)
+            return frozenset(matched)
+        if kind == NAME_REGEX:
+            search = query.pattern.search
+            return frozenset(pid for pid, name in zip(pids, names) if search(name))
+        if kind == PID_RANGES:
+            ranges = query.ranges
+            return frozenset(
+                pid for pid in pids if any(low <= pid <= high for low, high in ranges)
+            )
+        if cmdline is None:
+            return frozenset()
+        if kind == CMDLINE:
+            text = query.text
+            return frozenset(pid for pid in pids if text in cmdline(pid).lower())
+        search = query.pattern.search
+        return frozenset(pid for pid in pids if search(cmdline(pid)))
@@ -0,0 +1,105 @@
+"""Headless recording of system metrics and process snapshots to a metric log."""
+
+from __future__ import annotations
+
+import signal
+import sys
+from typing import Optional, Sequence
+
+from PyQt6 import QtCore
+
+from alerts import Alert
+from data_collector import DataCollector
+from metric_log import MetricLogWriter
+from metrics_payload import MetricsPayload
+
+
+class HeadlessRecorder(QtCore.QObject):
+    """Drives a DataCollector without a GUI and appends everything to a log.
+
+    System samples come from the collector's metrics worker through
+    ``data_ready``; process snapshots are taken every ``interval_ms`` with
+    :meth:`DataCollector.collect_process_list`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        backend: str = "psutil",
+        interval_ms: int = 1000,
+        keyframe_interval: int = 120,
+        alert_rules: Sequence[str] = (),
+        parent: Optional[QtCore.QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.writer = MetricLogWriter(path, keyframe_interval=keyframe_interval)
+        # Recordings keep a steady sample rate; no adaptive back-off
+        self.data_collector = DataCollector(backend, adaptive=False)
+        self.data_collector.data_ready.connect(self._handle_data_update)
+        self.data_collector.alert_raised.connect(self._handle_alert)
+        self.data_collector.set_alert_rules(alert_rules)
+        self.samples = 0
+        self.snapshots = 0
+
+        self.snapshot_timer = QtCore.QTimer(self)
+        self.snapshot_timer.setInterval(interval_ms)
+        self.snapshot_timer.timeout.connect(self._take_snapshot)
+
+    def start(self) -> None:
+        self.data_collector.start()
+        self.snapshot_timer.start()
+        self._take_snapshot()
+
+    def stop(self) -> None:
+        self.snapshot_timer.stop()
+        self.data_collector.stop()
+        self.writer.close()
+
+    def _handle_data_update(self, data: MetricsPayload) -> None:
+        self.writer.write_sample(data.timestamp, data.system_cpu, data.system_mem)
+        self.samples += 1
+
+    def _handle_alert(self, alert: Alert) -> None:
+        print(f"ALERT {alert}", file=sys.stderr, flush=True)
+
+    def _take_snapshot(self) -> None:
+        snapshot, process_cache = self.data_collector.collect_process_list()
+        self.data_collector.update_process_cache(process_cache)
+        self.writer.write_snapshot(snapshot)
+        self.snapshots += 1
+
+
+def run_headless(
+    path: str,
+    backend: str = "psutil",
+    interval_ms: int = 1000,
+    duration: Optional[float] = None,
+    argv: Optional[list] = None,
+    alert_rules: Sequence[str] = (),
+) -> int:
+    """Record to ``path`` until interrupted or ``duration`` seconds elapse."""
+    app = QtCore.QCoreApplication(argv or ["process_monitor"])
+    recorder = HeadlessRecorder(
+        path, backend=backend, interval_ms=interval_ms, alert_rules=alert_rules
+    )
+
+    # Qt does not return to the interpreter while idle; a periodic no-op
+    # timer lets Python run the SIGINT/SIGTERM handlers promptly.
+    signal.signal(signal.SIGINT, lambda *_: app.quit())
+    signal.signal(signal.SIGTERM, lambda *_: app.quit())
+    wakeup = QtCore.QTimer()
+    wakeup.timeout.connect(lambda: None)
+    wakeup.start(250)
+
+    if duration is not None:
+        QtCore.QTimer.singleShot(int(duration * 1000), app.quit)
+
+    recorder.start()
+    try:
+        return app.exec()
+    finally:
+        recorder.stop()
+        print(
+            f"Recorded {recorder.samples} samples and {recorder.snapshots} snapshots to {path}",
+            flush=True,
+        )
@@ -0,0 +1,148 @@
+"""Adaptive sampling schedule shared by the metrics and process list updates."""
+
+from __future__ import annotations
+
+import collections
+import math
+from typing import Deque, Dict, Iterable, Optional, Tuple
+
+# Metrics interval and process list period in milliseconds for each mode
+MODES: Dict[str, Tuple[int, int]] = {
+    "fast": (500, 5000),
+    "normal": (1000, 5000),
+    "idle": (2000, 10000),
+    "hidden": (5000, 30000),
+}
+
+# Longest interval the overhead budget may stretch the metrics tick to
+MAX_INTERVAL_MS = 10000
+
+# System CPU % below which the machine counts as idle, and for how many ticks
+IDLE_CPU = 10.0
+IDLE_TICKS = 10
+
+# Change in a focused process's CPU % between samples that counts as a burst,
+# and the number of ticks fast sampling is kept after the last burst
+BURST_DELTA = 15.0
+BURST_TICKS = 10
+
+# Seconds of history used to compute the sampling overhead
+OVERHEAD_WINDOW = 10.0
+
+
+class AdaptiveScheduler:
+    """Decides when the metrics worker ticks and when the process list refreshes.
+
+    Both updates run off one tick aligned to multiples of the current
+    interval on the wall clock; the process list is refreshed on the first
+    tick of each process list period. The interval depends on a mode:
+
+    ``hidden``  the window is minimized or not shown
+    ``fast``    the selected or a watched process is bursty
+    ``idle``    the system has been nearly idle for a while
+    ``normal``  anything else
+
+    The time spent collecting is tracked as a percentage of one CPU; while
+    it exceeds ``budget`` every interval is stretched.
+    """
+
+    def __init__(self, budget: float = 5.0, adaptive: bool = True) -> None:
+        self.budget = budget
+        self.adaptive = adaptive
+        self.visible = True
+        self.mode = "normal"
+        self.stretch = 1
+        self._stretched_at = -math.inf
+        self._idle_ticks = 0
+        self._burst_ticks = 0
+        self._focus: Dict[int, float] = {}
+        self._last_refresh: Optional[int] = None
+        self._costs: Deque[Tuple[float, float]] = collections.deque()
+        self._cost_total = 0.0
+
+    @property
+    def interval_ms(self) -> int:
+        return min(MODES[self.mode][0] * self.stretch, MAX_INTERVAL_MS)
+
+    @property
+    def process_period_ms(self) -> int:
+        return MODES[self.mode][1] * self.stretch
+
+    def next_delay_ms(self, now: float) -> int:
+        """Milliseconds from ``now`` to the next multiple of the interval."""
+        interval = self.interval_ms
+        return interval - int(now * 1000) % interval or interval
+
+    def process_refresh_due(self, now: float) -> bool:
+        """True once per process list period, on the first tick past its start."""
+        period = self.process_period_ms
+        slot = int(now * 1000) // period
+        elapsed = math.inf if self._last_refresh is None else now * 1000 - self._last_refresh
+        # A mode change can move period boundaries; never refresh twice
+        # within half a period because of that.
+        if self._last_refresh is not None and (
+            slot == self._last_refresh // period or elapsed < period / 2
+        ):
+            return False
+        self._last_refresh = int(now * 1000)
+        return True
+
+    def request_refresh(self) -> None:
+        """Make the next tick refresh the process list."""
+        self._last_refresh = None
+
+    def add_cost(self, now: float, seconds: float) -> None:
+        """Account ``seconds`` of collection work finished at ``now``."""
+        self._costs.append((now, seconds))
+        self._cost_total += seconds
+        self._expire_costs(now)
+
+    def _expire_costs(self, now: float) -> None:
+        costs = self._costs
+        while costs and costs[0][0] < now - OVERHEAD_WINDOW:
+            self._cost_total -= costs.popleft()[1]
+
+    def overhead(self, now: float) -> float:
+        """Collection time over the last OVERHEAD_WINDOW seconds, in % of one CPU."""
+        self._expire_costs(now)
+        return max(self._cost_total, 0.0) / OVERHEAD_WINDOW * 100.0
+
+    def observe(self, now: float, system_cpu: float, focus: Iterable[Tuple[int, float]]) -> None:
+        """Update the mode from the newest samples.
+
+        ``focus`` yields ``(pid, cpu %)`` for the selected and watched
+        processes.
+        """
+        focus = dict(focus)
+        bursty = any(
+            abs(cpu - self._focus[pid]) >= BURST_DELTA
+            for pid, cpu in focus.items()
+            if pid in self._focus
+        )
+        self._focus = focus
+        self._burst_ticks = BURST_TICKS if bursty else max(self._burst_ticks - 1, 0)
+        self._idle_ticks = self._idle_ticks + 1 if system_cpu < IDLE_CPU else 0
+
+        if not self.adaptive:
+            mode = "normal"
+        elif not self.visible:
+            mode = "hidden"
+        elif self._burst_ticks:
+            mode = "fast"
+        elif self._idle_ticks >= IDLE_TICKS and not focus:
+            mode = "idle"
+        else:
+            mode = "normal"
+        self.mode = mode
+
+        # The overhead lags behind the interval by up to OVERHEAD_WINDOW, so
+        # the stretch changes at most once per window.
+        if now - self._stretched_at < OVERHEAD_WINDOW:
+            return
+        overhead = self.overhead(now)
+        if self.adaptive and overhead > self.budget and self.interval_ms < MAX_INTERVAL_MS:
+            self.stretch *= 2
+            self._stretched_at = now
+        elif self.stretch > 1 and overhead < self.budget / 4:
+            self.stretch //= 2
+            self._stretched_at = now
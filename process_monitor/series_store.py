@@ -0,0 +1,294 @@
+"""Preallocated NumPy ring buffers for chart time series."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class RingBuffer:
+    """Fixed-capacity ring buffer with zero-copy access to the newest samples.
+
+    Every sample is written twice, at ``i`` and ``i + capacity`` of a
+    backing array of twice the capacity. Any run of recent samples is then
+    one contiguous slice, so :meth:`latest` returns a read-only view
+    instead of assembling a copy.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float64, fill: float = 0.0) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._data = np.full(capacity * 2, fill, dtype=dtype)
+        self._head = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def append(self, value: float) -> None:
+        head = self._head
+        self._data[head] = value
+        self._data[head + self.capacity] = value
+        self._head = (head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def last(self, default: float = 0.0) -> float:
+        if not self._count:
+            return default
+        return self._data[self._head + self.capacity - 1].item()
+
+    def latest(self, n: int) -> np.ndarray:
+        """Return a read-only view of the newest ``n`` samples, oldest first."""
+        n = min(n, self._count)
+        end = self._head + self.capacity
+        view = self._data[end - n:end]
+        view.flags.writeable = False
+        return view
+
+    def fill(self, value: float) -> None:
+        """Overwrite every stored sample with ``value`` keeping the length."""
+        self._data.fill(value)
+
+    def clear(self) -> None:
+        self._head = 0
+        self._count = 0
+
+
+class SeriesStore:
+    """Named ring buffers that share a timestamp axis and a retention."""
+
+    def __init__(self, names: Iterable[str], retention: int) -> None:
+        self.retention = retention
+        self.timestamps = RingBuffer(retention)
+        self._series: Dict[str, RingBuffer] = {name: RingBuffer(retention) for name in names}
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._series
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(self._series)
+
+    @property
+    def nbytes(self) -> int:
+        return self.timestamps.nbytes + sum(series.nbytes for series in self._series.values())
+
+    def append(self, timestamp: float, values: Dict[str, float]) -> None:
+        """Append one sample per series; series missing from ``values`` get 0."""
+        self.timestamps.append(timestamp)
+        for name, series in self._series.items():
+            series.append(values.get(name, 0.0))
+
+    def series(self, name: str) -> RingBuffer:
+        return self._series[name]
+
+    def latest(self, name: str, n: int) -> np.ndarray:
+        return self._series[name].latest(n)
+
+    def latest_timestamps(self, n: int) -> np.ndarray:
+        return self.timestamps.latest(n)
+
+    def reset(self, names: Iterable[str]) -> None:
+        """Zero the history of ``names`` without touching the other series."""
+        for name in names:
+            self._series[name].fill(0.0)
+
+
+# (bucket width in seconds, seconds of history kept) for each rollup tier
+ROLLUP_TIERS = ((10, 86400), (60, 7 * 86400))
+
+
+def minmax_decimate(
+    timestamps: np.ndarray, lows: np.ndarray, highs: np.ndarray, buckets: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce a series to at most ``buckets`` min/max pairs.
+
+    Every bucket contributes its lowest and highest value, so short spikes
+    survive decimation. Returns interleaved ``(x, y)`` arrays with two
+    points per bucket.
+    """
+    count = len(timestamps)
+    if count > buckets:
+        edges = np.unique(np.linspace(0, count, buckets, endpoint=False).astype(np.intp))
+        timestamps = timestamps[edges]
+        lows = np.minimum.reduceat(lows, edges)
+        highs = np.maximum.reduceat(highs, edges)
+
+    x = np.repeat(timestamps, 2)
+    y = np.empty(len(x))
+    y[0::2] = lows
+    y[1::2] = highs
+    return x, y
+
+
+class RollupTier:
+    """Min/max aggregates of fixed-width time buckets for each series."""
+
+    def __init__(self, names: Iterable[str], bucket_seconds: int, capacity: int) -> None:
+        self.bucket_seconds = bucket_seconds
+        self.timestamps = RingBuffer(capacity)
+        self._lows = {name: RingBuffer(capacity) for name in names}
+        self._highs = {name: RingBuffer(capacity) for name in names}
+        self._bucket_start: Optional[float] = None
+        self._pending_lows: Dict[str, float] = {}
+        self._pending_highs: Dict[str, float] = {}
+
+    @property
+    def span(self) -> int:
+        """Seconds of history the tier can hold."""
+        return self.timestamps.capacity * self.bucket_seconds
+
+    @property
+    def nbytes(self) -> int:
+        return self.timestamps.nbytes + sum(
+            buf.nbytes for buf in (*self._lows.values(), *self._highs.values())
+        )
+
+    def add(self, timestamp: float, values: Dict[str, float]) -> bool:
+        """Fold one sample into the current bucket; True if a bucket was completed."""
+        bucket_start = timestamp - timestamp % self.bucket_seconds
+        if bucket_start == self._bucket_start:
+            for name in self._lows:
+                value = values.get(name, 0.0)
+                if value < self._pending_lows[name]:
+                    self._pending_lows[name] = value
+                if value > self._pending_highs[name]:
+                    self._pending_highs[name] = value
+            return False
+
+        completed = self._bucket_start is not None
+        if completed:
+            self.timestamps.append(self._bucket_start)
+            for name in self._lows:
+                self._lows[name].append(self._pending_lows[name])
+                self._highs[name].append(self._pending_highs[name])
+
+        self._bucket_start = bucket_start
+        self._pending_lows = {name: values.get(name, 0.0) for name in self._lows}
+        self._pending_highs = dict(self._pending_lows)
+        return completed
+
+    def window(self, name: str, start: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return views of completed buckets starting at or after ``start``."""
+        timestamps = self.timestamps.latest(self.timestamps.capacity)
+        first = int(np.searchsorted(timestamps, start))
+        count = len(timestamps)
+        return (
+            timestamps[first:],
+            self._lows[name].latest(count)[first:],
+            self._highs[name].latest(count)[first:],
+        )
+
+    def reset(self, names: Iterable[str]) -> None:
+        for name in names:
+            self._lows[name].fill(0.0)
+            self._highs[name].fill(0.0)
+            if name in self._pending_lows:
+                self._pending_lows[name] = self._pending_highs[name] = 0.0
+
+
+class HistoryStore:
+    """Raw series plus coarser min/max rollup tiers for long windows.
+
+    Tier 0 is the raw :class:`SeriesStore`; higher tiers are
+    :class:`RollupTier` instances. :meth:`select_tier` picks the finest tier
+    that covers a time window within a point budget, so a chart never
+    plots many more points than it has pixels.
+    """
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        retention: int,
+        tiers: Iterable[Tuple[int, int]] = ROLLUP_TIERS,
+    ) -> None:
+        names = tuple(names)
+        self.raw = SeriesStore(names, retention)
+        self.tiers = [RollupTier(names, bucket, max(span // bucket, 1)) for bucket, span in tiers]
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    @property
+    def nbytes(self) -> int:
+        return self.raw.nbytes + sum(tier.nbytes for tier in self.tiers)
+
+    @property
+    def latest_timestamp(self) -> float:
+        return self.raw.timestamps.last()
+
+    def append(self, timestamp: float, values: Dict[str, float]) -> List[int]:
+        """Append a sample; returns the indexes of tiers that completed a bucket."""
+        self.raw.append(timestamp, values)
+        return [
+            index
+            for index, tier in enumerate(self.tiers, 1)
+            if tier.add(timestamp, values)
+        ]
+
+    def reset(self, names: Iterable[str]) -> None:
+        names = tuple(names)
+        self.raw.reset(names)
+        for tier in self.tiers:
+            tier.reset(names)
+
+    def select_tier(self, seconds: float, max_points: int) -> int:
+        """Return the index of the tier best suited to plot ``seconds``."""
+        # The raw samples were taken at whatever interval the scheduler ran
+        # at, so their coverage and count come from the stored timestamps.
+        count = len(self.raw)
+        timestamps = self.raw.latest_timestamps(count)
+        if count < self.raw.retention:
+            raw_span = np.inf  # nothing has been dropped yet
+        else:
+            # Each sample stands for the interval before it
+            elapsed = timestamps[-1] - timestamps[0]
+            raw_span = elapsed + elapsed / max(count - 1, 1)
+        raw_points = count - int(np.searchsorted(timestamps, self.latest_timestamp - seconds))
+        spans = [(raw_span, raw_points)] + [
+            (tier.span, seconds / tier.bucket_seconds * 2) for tier in self.tiers
+        ]
+        covering = [index for index, (span, _) in enumerate(spans) if span >= seconds]
+        for index in covering:
+            if spans[index][1] <= max_points:
+                return index
+        # Nothing fits the budget as is; decimate the coarsest covering tier,
+        # whose min/max buckets already preserve the spikes.
+        return covering[-1] if covering else len(spans) - 1
+
+    def window(
+        self, name: str, seconds: float, max_points: int, tier: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(timestamps, values)`` for the last ``seconds`` of ``name``.
+
+        At most ``max_points`` points are returned. Raw data within budget
+        is returned as zero-copy views.
+        """
+        if tier is None:
+            tier = self.select_tier(seconds, max_points)
+        start = self.latest_timestamp - seconds
+
+        if tier == 0:
+            # The sample rate varies with the scheduler, so the window is
+            # found by timestamp rather than by sample count.
+            count = len(self.raw)
+            timestamps = self.raw.latest_timestamps(count)
+            values = self.raw.latest(name, count)
+            first = int(np.searchsorted(timestamps, start))
+            timestamps, values = timestamps[first:], values[first:]
+            if len(timestamps) <= max_points:
+                return timestamps, values
+            return minmax_decimate(timestamps, values, values, max(max_points // 2, 1))
+
+        timestamps, lows, highs = self.tiers[tier - 1].window(name, start)
+        return minmax_decimate(timestamps, lows, highs, max(max_points // 2, 1))
@@ -0,0 +1,170 @@
+"""System-wide CPU, memory, disk and network sampling for the metrics worker."""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+import psutil
+
+# Block devices that are not real disks
+_IGNORED_DISKS = ("loop", "ram", "zram")
+
+
+class SystemSample:
+    """Everything the metrics worker reads about the system in one tick.
+
+    ``disks`` maps a disk to its ``(read, write)`` and ``nics`` a network
+    interface to its ``(sent, received)`` rate in bytes per second.
+    """
+
+    __slots__ = (
+        "timestamp",
+        "cpu",
+        "per_cpu",
+        "memory_percent",
+        "memory_used",
+        "memory_total",
+        "disk_percent",
+        "disks",
+        "nics",
+    )
+
+    def __init__(self, timestamp: float = 0.0) -> None:
+        self.timestamp = timestamp
+        self.cpu = 0.0
+        self.per_cpu: List[float] = []
+        self.memory_percent = 0.0
+        self.memory_used = 0
+        self.memory_total = 0
+        self.disk_percent = 0.0
+        self.disks: Dict[str, Tuple[float, float]] = {}
+        self.nics: Dict[str, Tuple[float, float]] = {}
+
+    @property
+    def disk_read(self) -> float:
+        return sum(read for read, _write in self.disks.values())
+
+    @property
+    def disk_write(self) -> float:
+        return sum(write for _read, write in self.disks.values())
+
+    @property
+    def net_sent(self) -> float:
+        return sum(sent for sent, _received in self.nics.values())
+
+    @property
+    def net_received(self) -> float:
+        return sum(received for _sent, received in self.nics.values())
+
+
+def _cpu_split(times) -> Tuple[float, float]:
+    """Return ``(total, idle)`` seconds the way psutil.cpu_percent counts them."""
+    total = sum(times)
+    # Guest time is already included in user and nice on Linux
+    total -= getattr(times, "guest", 0.0) + getattr(times, "guest_nice", 0.0)
+    return total, times.idle + getattr(times, "iowait", 0.0)
+
+
+def _rates(
+    rates: Dict[str, Tuple[float, float]],
+    current: Dict[str, Tuple[int, int]],
+    previous: Dict[str, Tuple[int, int]],
+    elapsed: float,
+) -> None:
+    """Fill ``rates`` with the per-second change from ``previous`` to ``current``."""
+    rates.clear()
+    for name, (first, second) in current.items():
+        last = previous.get(name)
+        if last is None or elapsed <= 0:
+            rates[name] = (0.0, 0.0)
+        else:
+            # Counters can go backwards when a device is re-added
+            rates[name] = (
+                max(first - last[0], 0) / elapsed,
+                max(second - last[1], 0) / elapsed,
+            )
+
+
+class SystemSampler:
+    """Reads per-core CPU, memory, root disk usage and disk/NIC counters once per call.
+
+    CPU percentages and I/O rates are deltas against the previous call, so
+    the first sample reports zeros for them. Nothing here needs to be read
+    again on the GUI thread. :meth:`sample` can refill an existing
+    :class:`SystemSample` so that a recycled payload allocates no new
+    containers.
+    """
+
+    def __init__(self, disk_path: str = "/") -> None:
+        self.disk_path = disk_path
+        self._cpu_times: Optional[List[Tuple[float, float]]] = None
+        self._disks: Dict[str, Tuple[int, int]] = {}
+        self._nics: Dict[str, Tuple[int, int]] = {}
+        self._last_io: Optional[float] = None
+
+    def _sample_cpu(self, sample: SystemSample) -> None:
+        current = [_cpu_split(times) for times in psutil.cpu_times(percpu=True)]
+        previous = self._cpu_times
+        self._cpu_times = current
+        per_cpu = sample.per_cpu
+        per_cpu.clear()
+        if previous is None or len(previous) != len(current):
+            per_cpu.extend([0.0] * len(current))
+            sample.cpu = 0.0
+            return
+
+        busy_sum = total_sum = 0.0
+        for (total, idle), (last_total, last_idle) in zip(current, previous):
+            delta = total - last_total
+            busy = max(delta - (idle - last_idle), 0.0)
+            per_cpu.append(min(busy / delta * 100.0, 100.0) if delta > 0 else 0.0)
+            busy_sum += busy
+            total_sum += max(delta, 0.0)
+        sample.cpu = min(busy_sum / total_sum * 100.0, 100.0) if total_sum > 0 else 0.0
+
+    def _sample_io(self, sample: SystemSample) -> None:
+        now = time.monotonic()
+        elapsed = 0.0 if self._last_io is None else now - self._last_io
+        self._last_io = now
+
+        try:
+            counters = psutil.disk_io_counters(perdisk=True) or {}
+        except (OSError, RuntimeError):
+            counters = {}
+        disks = {
+            name: (io.read_bytes, io.write_bytes)
+            for name, io in counters.items()
+            if not name.startswith(_IGNORED_DISKS)
+        }
+        _rates(sample.disks, disks, self._disks, elapsed)
+        self._disks = disks
+
+        try:
+            counters = psutil.net_io_counters(pernic=True) or {}
+        except (OSError, RuntimeError):
+            counters = {}
+        nics = {name: (io.bytes_sent, io.bytes_recv) for name, io in counters.items()}
+        _rates(sample.nics, nics, self._nics, elapsed)
+        self._nics = nics
+
+    def sample(
+        self, timestamp: Optional[float] = None, sample: Optional[SystemSample] = None
+    ) -> SystemSample:
+        if sample is None:
+            sample = SystemSample()
+        sample.timestamp = time.time() if timestamp is None else timestamp
+        self._sample_cpu(sample)
+
+        memory = psutil.virtual_memory()
+        sample.memory_percent = memory.percent
+        sample.memory_used = memory.used
+        sample.memory_total = memory.total
+
+        try:
+            sample.disk_percent = psutil.disk_usage(self.disk_path).percent
+        except OSError:
+            sample.disk_percent = 0.0
+
+        self._sample_io(sample)
+        return sample
@@ -0,0 +1,41 @@
+"""Tests for the /proc reader against a fake proc root."""
+
+import os
+
+from proc_reader import ProcfsSnapshotEngine
+
+BOOT_TIME = 1700000000
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def _fake_proc(root, stat_padding=0):
+    intr = "intr " + " ".join(["0"] * stat_padding)
+    _write(os.path.join(root, "stat"), f"cpu  1 2 3 4\n{intr}\nbtime {BOOT_TIME}\n")
+    _write(os.path.join(root, "meminfo"), "MemTotal:        1024000 kB\n")
+    fields = ["S", "1"] + ["0"] * 9 + ["100", "50"] + ["0"] * 4 + ["3", "0", "500"]
+    _write(os.path.join(root, "self", "stat"), "1 (self) " + " ".join(fields) + "\n")
+    _write(os.path.join(root, "42", "stat"), "42 (some (odd) name) " + " ".join(fields) + "\n")
+    _write(os.path.join(root, "42", "statm"), "1000 250 0 0 0 0 0\n")
+
+
+def test_boot_time_after_long_intr_line(tmp_path):
+    # The intr line of a many-core host is longer than the initial buffer
+    _fake_proc(str(tmp_path), stat_padding=3500)
+    assert os.path.getsize(tmp_path / "stat") > 4096
+    engine = ProcfsSnapshotEngine(str(tmp_path))
+    assert engine._read_boot_time() == BOOT_TIME
+
+
+def test_collect_create_time(tmp_path):
+    _fake_proc(str(tmp_path), stat_padding=3500)
+    engine = ProcfsSnapshotEngine(str(tmp_path))
+    snapshot, _ = engine.collect()
+    row = snapshot.pids.index(42)
+    assert snapshot.names[row] == "some (odd) name"
+    assert snapshot.threads[row] == 3
+    assert snapshot.create_times[row] == BOOT_TIME + 500 / engine._clock_ticks
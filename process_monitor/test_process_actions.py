@@ -0,0 +1,38 @@
+"""Tests for applying process actions to targets that cannot be touched."""
+
+import psutil
+
+from process_actions import KILL, TERMINATE, run_action
+
+
+class _Unreadable:
+    """Process handle whose start time raises ``error``."""
+
+    def __init__(self, pid, error):
+        self.pid = pid
+        self._error = error
+
+    def create_time(self):
+        raise self._error(self.pid)
+
+    def terminate(self):
+        raise AssertionError("an unreadable process must not be signalled")
+
+
+def test_access_denied_is_reported_as_failed():
+    result = run_action(TERMINATE, [(42, 0.0, _Unreadable(42, psutil.AccessDenied))])
+    assert result.gone == []
+    assert result.failed == {42: "access denied"}
+    assert result.summary().startswith("Terminated 0 process(es); 1 failed")
+
+
+def test_zombie_is_reported_as_failed():
+    result = run_action(KILL, [(42, 0.0, _Unreadable(42, psutil.ZombieProcess))])
+    assert result.gone == []
+    assert result.failed == {42: "ZombieProcess"}
+
+
+def test_vanished_process_counts_as_gone():
+    result = run_action(TERMINATE, [(42, 0.0, _Unreadable(42, psutil.NoSuchProcess))])
+    assert result.gone == [42]
+    assert result.failed == {}
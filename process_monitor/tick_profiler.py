@@ -0,0 +1,91 @@
+"""On-demand cProfile capture of a number of metrics ticks."""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import os
+import pstats
+import tempfile
+import threading
+import time
+from typing import Callable, List, Optional, TypeVar
+
+_T = TypeVar("_T")
+
+# Functions listed in the summary returned by TickProfiler.tick
+SUMMARY_LINES = 25
+
+
+def default_profile_path() -> str:
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(tempfile.gettempdir(), f"process_monitor-{stamp}.prof")
+
+
+class TickProfiler:
+    """Profiles the GUI thread and worker jobs for the next N ticks.
+
+    :meth:`start` enables a profiler on the calling (GUI) thread and
+    :meth:`tick` counts the ticks down; after the last one the stats of
+    the GUI thread and of every job run through :meth:`call` are merged
+    and written to ``path`` for ``python -m pstats`` or snakeviz. Jobs
+    outside a profiling run are called directly, without overhead.
+    """
+
+    def __init__(self) -> None:
+        self.remaining = 0
+        self.path: Optional[str] = None
+        self._profile: Optional[cProfile.Profile] = None
+        self._jobs: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self._profile is not None
+
+    def start(self, ticks: int, path: Optional[str] = None) -> str:
+        """Profile the next ``ticks`` ticks and return where the stats will go."""
+        if self._profile is not None:
+            self._profile.disable()
+        self.remaining = max(ticks, 1)
+        self.path = path or default_profile_path()
+        with self._lock:
+            self._jobs = []
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        return self.path
+
+    def call(self, fn: Callable[..., _T], *args) -> _T:
+        """Run ``fn`` in a worker thread, profiled while a run is active."""
+        if self._profile is None:
+            return fn(*args)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ profiles every thread from the one enabled profiler
+            return fn(*args)
+        try:
+            return fn(*args)
+        finally:
+            profile.disable()
+            with self._lock:
+                self._jobs.append(profile)
+
+    def tick(self) -> Optional[str]:
+        """Count one tick; after the last returns a summary of the hottest functions."""
+        if self._profile is None:
+            return None
+        self.remaining -= 1
+        if self.remaining > 0:
+            return None
+
+        profile, self._profile = self._profile, None
+        profile.disable()
+        with self._lock:
+            jobs, self._jobs = self._jobs, []
+        summary = io.StringIO()
+        stats = pstats.Stats(profile, *jobs, stream=summary)
+        stats.dump_stats(self.path)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(SUMMARY_LINES)
+        return summary.getvalue()
@@ -0,0 +1,183 @@
+"""Streaming top-K of the heaviest processes over sliding time windows."""
+
+from __future__ import annotations
+
+import collections
+import heapq
+from typing import TYPE_CHECKING, Deque, Dict, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:  # data_collector imports this module
+    from data_collector import ProcessSnapshot
+
+# Window lengths in seconds and their labels
+WINDOWS = {"1 min": 60, "5 min": 300, "15 min": 900}
+
+# Snapshots are integrated into buckets of this many seconds; the windows
+# move one bucket at a time.
+BUCKET_SECONDS = 10
+
+# Entries kept per closed bucket and per metric
+BUCKET_CAPACITY = 200
+
+# Entries reported per window and metric
+TOP_K = 10
+
+# A longer gap between two snapshots (suspend, stopped collector) is not
+# attributed to either of them.
+MAX_GAP = 60.0
+
+# (pid, create_time) identifies a process across PID reuse
+_Key = Tuple[int, float]
+
+
+class Consumer:
+    """A process's average CPU and memory % over one window."""
+
+    __slots__ = ("pid", "name", "cpu", "memory")
+
+    def __init__(self, pid: int, name: str, cpu: float, memory: float) -> None:
+        self.pid = pid
+        self.name = name
+        self.cpu = cpu
+        self.memory = memory
+
+
+class _Window:
+    __slots__ = ("seconds", "buckets", "totals", "by_cpu", "by_memory")
+
+    def __init__(self, seconds: int) -> None:
+        self.seconds = seconds
+        # (bucket index, entries) of the closed buckets inside the window
+        self.buckets: Deque[Tuple[int, list]] = collections.deque()
+        # key -> [cpu % seconds, memory % seconds, bucket count, name]
+        self.totals: Dict[_Key, list] = {}
+        self.by_cpu: Tuple[Consumer, ...] = ()
+        self.by_memory: Tuple[Consumer, ...] = ()
+
+
+class TopConsumers:
+    """Heaviest processes by CPU and memory over several sliding windows.
+
+    Each snapshot adds ``value x seconds since the previous snapshot`` of
+    its ``capacity`` largest processes per metric to the open time bucket.
+    When a bucket closes it is cut down to ``capacity`` entries per metric
+    the same way, added to the running totals of every window, and the
+    buckets that slid out are subtracted again, so no history is ever
+    rescanned. The truncation can only miss a process that stays just
+    below the ``capacity``-th largest every time; the error per bucket is
+    bounded by that entry.
+
+    The top ``k`` per window are selected with a heap when a bucket closes,
+    and :meth:`top` returns the cached result, so readers pay O(k). Results
+    lag the present by up to one bucket.
+
+    :meth:`add_snapshot` must be called from one thread at a time;
+    :meth:`top` may be called from any thread.
+    """
+
+    def __init__(
+        self,
+        windows: Sequence[int] = tuple(WINDOWS.values()),
+        k: int = TOP_K,
+        bucket_seconds: int = BUCKET_SECONDS,
+        capacity: int = BUCKET_CAPACITY,
+    ) -> None:
+        self.k = k
+        self.bucket_seconds = bucket_seconds
+        self.capacity = capacity
+        self._windows = {seconds: _Window(seconds) for seconds in windows}
+        self._bucket_index: Optional[int] = None
+        self._bucket: Dict[_Key, list] = {}
+        self._first_index: Optional[int] = None
+        self._last_timestamp: Optional[float] = None
+
+    def top(self, window: int, by: str = "cpu") -> Tuple[Consumer, ...]:
+        """Return the heaviest processes of ``window`` seconds by "cpu" or "memory"."""
+        entry = self._windows[window]
+        return entry.by_cpu if by == "cpu" else entry.by_memory
+
+    def add_snapshot(self, snapshot: ProcessSnapshot) -> None:
+        timestamp = snapshot.timestamp
+        last = self._last_timestamp
+        self._last_timestamp = timestamp
+        index = int(timestamp // self.bucket_seconds)
+        if self._bucket_index is None:
+            self._bucket_index = self._first_index = index
+        elif index > self._bucket_index:
+            self._close_bucket()
+            self._bucket_index = index
+        if last is None or not 0 < timestamp - last <= MAX_GAP:
+            return
+
+        elapsed = timestamp - last
+        cpu, memory = snapshot.cpu, snapshot.memory
+        rows = range(len(snapshot))
+        if len(rows) > self.capacity:
+            # Only the heaviest rows can matter; select them with a heap
+            # instead of touching the bucket for every process.
+            selected = set(heapq.nlargest(self.capacity, rows, key=cpu.__getitem__))
+            selected.update(heapq.nlargest(self.capacity, rows, key=memory.__getitem__))
+            rows = selected
+
+        bucket = self._bucket
+        pids, create_times, names = snapshot.pids, snapshot.create_times, snapshot.names
+        for row in rows:
+            key = (pids[row], create_times[row])
+            entry = bucket.get(key)
+            if entry is None:
+                bucket[key] = [cpu[row] * elapsed, memory[row] * elapsed, names[row]]
+            else:
+                entry[0] += cpu[row] * elapsed
+                entry[1] += memory[row] * elapsed
+
+    def _close_bucket(self) -> None:
+        index = self._bucket_index
+        bucket, self._bucket = self._bucket, {}
+        capacity = self.capacity
+        if len(bucket) > capacity:
+            items = bucket.items()
+            kept = dict(heapq.nlargest(capacity, items, key=lambda item: item[1][0]))
+            kept.update(heapq.nlargest(capacity, items, key=lambda item: item[1][1]))
+            bucket = kept
+        entries = list(bucket.items())
+
+        for window in self._windows.values():
+            totals = window.totals
+            window.buckets.append((index, entries))
+            for key, (cpu, memory, name) in entries:
+                total = totals.get(key)
+                if total is None:
+                    totals[key] = [cpu, memory, 1, name]
+                else:
+                    total[0] += cpu
+                    total[1] += memory
+                    total[2] += 1
+
+            oldest = index - window.seconds // self.bucket_seconds
+            while window.buckets and window.buckets[0][0] <= oldest:
+                _index, expired = window.buckets.popleft()
+                for key, (cpu, memory, _name) in expired:
+                    total = totals[key]
+                    total[2] -= 1
+                    if total[2]:
+                        total[0] -= cpu
+                        total[1] -= memory
+                    else:
+                        del totals[key]
+            self._rank(window, index)
+
+    def _rank(self, window: _Window, index: int) -> None:
+        covered = min(window.seconds, (index + 1 - self._first_index) * self.bucket_seconds)
+        items = window.totals.items()
+
+        def consumers(metric: int) -> Tuple[Consumer, ...]:
+            best = heapq.nlargest(self.k, items, key=lambda item: item[1][metric])
+            return tuple(
+                Consumer(pid, name, cpu / covered, memory / covered)
+                for (pid, _create_time), (cpu, memory, _count, name) in best
+            )
+
+        # Each tuple is replaced in one assignment, so readers never see a
+        # half-built ranking.
+        window.by_cpu = consumers(0)
+        window.by_memory = consumers(1)